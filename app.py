@@ -10,18 +10,28 @@ from utils import (get_all_classes, get_images_in_class, delete_image, create_cl
                    get_grouped_classes, get_grouped_classes_with_manual_assignments,
                    add_folder_to_tab, remove_folder_from_tab, get_folder_tab_info,
                    delete_folder, get_folder_info)
-from scraper import GoogleImageScraper
+from scraper import GoogleImageScraper, get_driver_pool
+from bulk_runner import resolve_worker_count, run_bulk_parallel
+from jobs import JobManager, JOB_STATES
+from checkpoints import CheckpointStore
+from image_index import get_url_index, get_content_index
+from near_duplicates import get_near_duplicate_index
+from catalog import get_image_catalog
+from folder_watcher import get_folder_watcher, start_folder_watcher
+from cancellation import JobCancelled
+from circuit_breaker import host_circuit_breakers
+from http_client import connection_metrics
+from driver_cache import invalidate_driver_cache
 from logger import scraping_logger
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
-# Global variable to track scraping progress
-scraping_status = {
-    'is_running': False,
-    'progress': '',
-    'current_task': None
-}
+# Scraping jobs run in the background, at most MAX_CONCURRENT_JOBS at a time
+job_manager = JobManager(Config.MAX_CONCURRENT_JOBS, default_deadline=Config.JOB_DEADLINE_SECONDS)
+
+# Bulk job checkpoints survive restarts; jobs a previous process left running can be resumed
+checkpoint_store = CheckpointStore(Config.CHECKPOINT_DB)
 
 @app.route('/')
 def index():
@@ -46,29 +56,287 @@ def view_images(class_name):
     images = get_images_in_class(app.config['UPLOAD_FOLDER'], class_name)
     return render_template('view_images.html', class_name=class_name, images=images)
 
+def run_scrape_job(job):
+    """Job target for a single keyword search."""
+    params = job.params
+    scraper = None
+    try:
+        # Only clear the log view when nothing else is writing to it
+        if job_manager.running_count() == 1:
+            scraping_logger.clear_logs()
+        scraping_logger.info(f"🎬 Starting new scraping session (job {job.id})")
+
+        job.set_progress('Initializing scraper...')
+
+        scraper = GoogleImageScraper(headless=True, driver_pool=get_driver_pool())
+        downloaded_count, class_folder = scraper.scrape_images(
+            params['keywords'], params['destination_folder'], params['class_name'], params['max_images'],
+            job.set_progress, full_resolution=params['full_resolution'],
+            cancel_token=job.token, cleanup_on_cancel=params.get('cleanup_on_cancel', False)
+        )
+        if class_folder is None:
+            raise RuntimeError('Scraping did not complete, see logs for details')
+
+        job.result = {
+            'downloaded': downloaded_count,
+            'class_folder': class_folder,
+            'skipped_known': scraper.last_stats.get('skipped_known', 0),
+            'duplicates': scraper.last_stats.get('duplicates', 0)
+        }
+        job.set_progress(f'Completed! Downloaded {downloaded_count} images.')
+        scraping_logger.info("🎉 Scraping session completed")
+
+    except JobCancelled as e:
+        job.set_progress(f'Cancelled: {str(e)}')
+        raise
+    except Exception as e:
+        job.set_progress(f'Error: {str(e)}')
+        scraping_logger.error(f"💥 Scraping session failed: {str(e)}")
+        raise
+    finally:
+        if scraper:
+            scraper.close()
+
+def load_bulk_checkpoint(job_id, entry_count, images_per_class):
+    """Per-entry resume options from the checkpoint store (empty for a new job)."""
+    saved_entries = checkpoint_store.get_entries(job_id)
+    options = {}
+
+    for index in range(entry_count):
+        saved = saved_entries.get(index)
+        downloaded = checkpoint_store.downloaded_count(job_id, index)
+
+        if saved and saved['status'] == 'done':
+            options[index] = {'done': True, 'downloaded': max(saved['downloaded'], downloaded)}
+        elif downloaded >= images_per_class:
+            options[index] = {'done': True, 'downloaded': downloaded}
+        elif saved:
+            options[index] = {
+                'downloaded': downloaded,
+                'max_images': images_per_class - downloaded,
+                'skip_urls': checkpoint_store.attempted_urls(job_id, index)
+            }
+
+    return options
+
+def run_bulk_job(job):
+    """Job target for a bulk search over several keyword/class entries.
+
+    Progress is checkpointed per entry and per image URL, so running the same
+    job ID again (see /api/jobs/<id>/resume) skips work that is already done.
+    """
+    params = job.params
+    search_entries = params['search_entries']
+    images_per_class = params['images_per_class']
+    destination_folder = params['destination_folder']
+    full_resolution = params['full_resolution']
+    worker_count = params['worker_processes']
+    scraper = None
+    total_downloaded = 0
+
+    def record_url(index, url, status, filename):
+        checkpoint_store.record_url(job.id, index, url, status, filename)
+
+    try:
+        if job_manager.running_count() == 1:
+            scraping_logger.clear_logs()
+        scraping_logger.info(f"🎬 Starting bulk scraping session (job {job.id})")
+        scraping_logger.info(f"📝 Processing {len(search_entries)} search entries, {images_per_class} images each")
+
+        job.set_progress('Initializing bulk scraper...')
+        resume_options = load_bulk_checkpoint(job.id, len(search_entries), images_per_class)
+        job.entries = [{
+            'keyword': entry['keyword'],
+            'className': entry['className'],
+            'status': 'done' if resume_options.get(i, {}).get('done') else 'queued',
+            'downloaded': resume_options.get(i, {}).get('downloaded', 0)
+        } for i, entry in enumerate(search_entries)]
+
+        if resume_options:
+            already_done = sum(1 for options in resume_options.values() if options.get('done'))
+            scraping_logger.info(f"♻️ Resuming from checkpoint: {already_done}/{len(search_entries)} entries already complete")
+
+        if worker_count > 1:
+            def entry_callback(result):
+                job.entries[result['index']] = {
+                    key: result[key] for key in ('keyword', 'className', 'status', 'downloaded', 'worker', 'error')
+                }
+                checkpoint_store.record_entry(job.id, result['index'], result['status'], result['downloaded'],
+                                              result['class_folder'], result['error'])
+
+            results = run_bulk_parallel(
+                search_entries, images_per_class, destination_folder, worker_count,
+                full_resolution=full_resolution,
+                progress_callback=job.set_progress,
+                entry_callback=entry_callback,
+                entry_options=resume_options,
+                url_callback=record_url,
+                cancel_token=job.token,
+                cleanup_on_cancel=params.get('cleanup_on_cancel', False)
+            )
+            job.token.raise_if_cancelled()
+            total_downloaded = sum(result['downloaded'] for result in results)
+            failed = sum(1 for result in results if result['status'] != 'done')
+
+            job.result = {'downloaded': total_downloaded, 'failed_entries': failed}
+            job.set_progress(f'Bulk scraping completed! Downloaded {total_downloaded} images total.')
+            scraping_logger.info(f"🎉 Bulk scraping session completed - {total_downloaded} images total "
+                                 f"across {worker_count} workers ({failed} entries failed)")
+            return
+
+        scraper = GoogleImageScraper(headless=True, driver_pool=get_driver_pool())
+
+        for i, entry in enumerate(search_entries, 1):
+            job.token.raise_if_cancelled()
+
+            keyword = entry['keyword']
+            class_name = entry['className']
+            entry_destination = entry.get('destinationFolder')
+            options = resume_options.get(i - 1, {})
+            already_downloaded = options.get('downloaded', 0)
+
+            if options.get('done'):
+                total_downloaded += already_downloaded
+                scraping_logger.info(f"⏭️ [{i}/{len(search_entries)}] Already completed: {already_downloaded} images for '{class_name}'")
+                continue
+
+            # Use per-row destination folder if specified, otherwise use global setting
+            current_destination = entry_destination if entry_destination else destination_folder
+
+            job.set_progress(f'Processing {i}/{len(search_entries)}: {keyword} -> {class_name}')
+            if entry_destination:
+                scraping_logger.info(f"🔍 [{i}/{len(search_entries)}] Processing: '{keyword}' -> '{class_name}' (destination: {current_destination})")
+            else:
+                scraping_logger.info(f"🔍 [{i}/{len(search_entries)}] Processing: '{keyword}' -> '{class_name}'")
+
+            def progress_callback(message):
+                job.set_progress(f'[{i}/{len(search_entries)}] {message}')
+
+            job.entries[i - 1]['status'] = 'running'
+            checkpoint_store.record_entry(job.id, i - 1, 'running', already_downloaded)
+
+            try:
+                downloaded_count, class_folder = scraper.scrape_images(
+                    keyword, current_destination, class_name, options.get('max_images', images_per_class),
+                    progress_callback, full_resolution=full_resolution, skip_urls=options.get('skip_urls'),
+                    url_callback=lambda url, status, filename: record_url(i - 1, url, status, filename),
+                    cancel_token=job.token, cleanup_on_cancel=params.get('cleanup_on_cancel', False)
+                )
+                entry_downloaded = already_downloaded + downloaded_count
+                total_downloaded += entry_downloaded
+                status = 'done' if class_folder else 'failed'
+                job.entries[i - 1].update(status=status, downloaded=entry_downloaded,
+                                          skipped_known=scraper.last_stats.get('skipped_known', 0),
+                                          duplicates=scraper.last_stats.get('duplicates', 0))
+                checkpoint_store.record_entry(job.id, i - 1, status, entry_downloaded, class_folder)
+                if entry_destination:
+                    scraping_logger.success(f"✅ [{i}/{len(search_entries)}] Completed: {downloaded_count} images for '{class_name}' in '{current_destination}'")
+                else:
+                    scraping_logger.success(f"✅ [{i}/{len(search_entries)}] Completed: {downloaded_count} images for '{class_name}'")
+
+            except JobCancelled as e:
+                job.entries[i - 1].update(status='cancelled', error=str(e))
+                checkpoint_store.record_entry(job.id, i - 1, 'cancelled', already_downloaded, error=str(e))
+                scraping_logger.warning(f"🛑 Bulk job {job.id} cancelled during entry {i}/{len(search_entries)}")
+                raise
+            except Exception as e:
+                job.entries[i - 1].update(status='failed', error=str(e))
+                checkpoint_store.record_entry(job.id, i - 1, 'failed', already_downloaded, error=str(e))
+                scraping_logger.error(f"❌ [{i}/{len(search_entries)}] Failed '{keyword}' -> '{class_name}': {str(e)}")
+                continue
+
+        job.result = {
+            'downloaded': total_downloaded,
+            'failed_entries': sum(1 for entry in job.entries if entry['status'] == 'failed')
+        }
+        job.set_progress(f'Bulk scraping completed! Downloaded {total_downloaded} images total.')
+        scraping_logger.info(f"🎉 Bulk scraping session completed - {total_downloaded} images total")
+
+    except JobCancelled as e:
+        job.set_progress(f'Bulk scraping cancelled: {str(e)}')
+        raise
+    except Exception as e:
+        job.set_progress(f'Bulk scraping error: {str(e)}')
+        scraping_logger.error(f"💥 Bulk scraping session failed: {str(e)}")
+        raise
+    finally:
+        if scraper:
+            scraper.close()
+
+def record_job_checkpoint(job):
+    """Job listener: keep the checkpointed state of bulk jobs in sync."""
+    if job.kind == 'bulk':
+        checkpoint_store.save_job(job.id, job.kind, job.title, job.params, job.state)
+
+job_manager.add_listener(record_job_checkpoint)
+
+def cancellation_params(deadline_seconds=None, cleanup_on_cancel=None):
+    """Job parameters controlling deadlines and cleanup after cancellation."""
+    return {
+        'deadline_seconds': app.config['JOB_DEADLINE_SECONDS'] if deadline_seconds is None else float(deadline_seconds),
+        'cleanup_on_cancel': app.config['CANCEL_CLEANUP_PARTIAL'] if cleanup_on_cancel is None else bool(cleanup_on_cancel)
+    }
+
+def submit_scrape_job(keywords, destination_folder, class_name, max_images, full_resolution,
+                      deadline_seconds=None, cleanup_on_cancel=None):
+    """Queue a single keyword search and return its job."""
+    params = {
+        'keywords': keywords,
+        'destination_folder': destination_folder or app.config['UPLOAD_FOLDER'],
+        'class_name': class_name,
+        'max_images': max_images,
+        'full_resolution': full_resolution,
+        **cancellation_params(deadline_seconds, cleanup_on_cancel)
+    }
+    return job_manager.submit('scrape', f"'{keywords}' -> '{class_name}'", run_scrape_job, params,
+                              deadline_seconds=params['deadline_seconds'])
+
+def submit_bulk_job(search_entries, images_per_class, destination_folder, full_resolution, worker_processes=None,
+                    deadline_seconds=None, cleanup_on_cancel=None):
+    """Queue a bulk search and return its job."""
+    params = {
+        'search_entries': search_entries,
+        'images_per_class': images_per_class,
+        'destination_folder': destination_folder or app.config['UPLOAD_FOLDER'],
+        'full_resolution': full_resolution,
+        'worker_processes': resolve_worker_count(worker_processes, len(search_entries)),
+        **cancellation_params(deadline_seconds, cleanup_on_cancel)
+    }
+    job = job_manager.submit('bulk', f'Bulk search ({len(search_entries)} entries)', run_bulk_job, params,
+                             deadline_seconds=params['deadline_seconds'])
+    record_job_checkpoint(job)
+    return job
+
+def job_started_message(job, what):
+    """User-facing message for a newly submitted job."""
+    if job.state == 'queued':
+        return f'{what} queued as job {job.id}. It will start when a worker is free.'
+    return f'{what} started as job {job.id}! You can monitor progress below.'
+
+def get_scraping_status():
+    """Legacy single-job status view, derived from the job manager."""
+    latest = job_manager.latest_job()
+    return {
+        'is_running': job_manager.running_count() > 0 or job_manager.queued_count() > 0,
+        'progress': latest.progress if latest else '',
+        'current_task': latest.id if latest else None,
+        'entries': latest.entries if latest else [],
+        'running_jobs': job_manager.running_count(),
+        'queued_jobs': job_manager.queued_count()
+    }
+
 @app.route('/scrape', methods=['POST'])
 def scrape_images():
-    """Start image scraping process."""
-    global scraping_status
-
+    """Queue an image scraping job."""
     # Check if this is an AJAX request
     is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-    if scraping_status['is_running']:
-        if is_ajax:
-            return jsonify({
-                'status': 'error',
-                'message': 'Scraping is already in progress. Please wait for it to complete.'
-            })
-        else:
-            flash('Scraping is already in progress. Please wait for it to complete.', 'warning')
-            return redirect(url_for('index'))
-
     # Get form data
     keywords = request.form.get('keywords', '').strip()
     destination_folder = request.form.get('destination_folder', '').strip()
     class_name = request.form.get('class_name', '').strip()
     max_images = int(request.form.get('max_images', 20))
+    full_resolution = request.form.get('full_resolution', str(app.config['FULL_RESOLUTION'])).lower() in ('true', 'on', '1')
 
     # Validation
     if not keywords:
@@ -91,86 +359,41 @@ def scrape_images():
             flash('Please enter a class/category name.', 'error')
             return redirect(url_for('index'))
 
-    # Use default folder if not specified
-    if not destination_folder:
-        destination_folder = app.config['UPLOAD_FOLDER']
-
     # Validate max_images
     if max_images < 1 or max_images > 100:
         max_images = 20
 
-    # Start scraping in background thread
-    def scrape_worker():
-        global scraping_status
-        scraper = None
-        try:
-            # Clear previous logs
-            scraping_logger.clear_logs()
-            scraping_logger.info("🎬 Starting new scraping session")
-
-            scraping_status['is_running'] = True
-            scraping_status['progress'] = 'Initializing scraper...'
-
-            def progress_callback(message):
-                scraping_status['progress'] = message
-
-            scraper = GoogleImageScraper(headless=True)
-            downloaded_count, class_folder = scraper.scrape_images(
-                keywords, destination_folder, class_name, max_images, progress_callback
-            )
-
-            scraping_status['progress'] = f'Completed! Downloaded {downloaded_count} images.'
-            scraping_logger.info("🎉 Scraping session completed")
-            time.sleep(2)  # Keep message visible for a moment
-
-        except Exception as e:
-            error_msg = f'Error: {str(e)}'
-            scraping_status['progress'] = error_msg
-            scraping_logger.error(f"💥 Scraping session failed: {str(e)}")
-        finally:
-            if scraper:
-                scraper.close()
-            scraping_status['is_running'] = False
-
-    # Start background thread
-    thread = threading.Thread(target=scrape_worker)
-    thread.daemon = True
-    thread.start()
+    job = submit_scrape_job(keywords, destination_folder, class_name, max_images, full_resolution)
+    message = job_started_message(job, 'Image scraping')
 
     if is_ajax:
         return jsonify({
             'status': 'success',
-            'message': 'Image scraping started! You can monitor progress below.'
+            'message': message,
+            'job_id': job.id,
+            'job_state': job.state
         })
     else:
-        flash('Image scraping started! You can monitor progress below.', 'success')
+        flash(message, 'success')
         return redirect(url_for('scraping_progress'))
 
 @app.route('/perform-bulk-search', methods=['POST'])
 def perform_bulk_search():
     """Handle bulk image search requests."""
-    global scraping_status
-
     # Check if this is an AJAX request
     is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-    if scraping_status['is_running']:
-        if is_ajax:
-            return jsonify({
-                'status': 'error',
-                'message': 'Scraping is already in progress. Please wait for it to complete.'
-            })
-        else:
-            flash('Scraping is already in progress. Please wait for it to complete.', 'warning')
-            return redirect(url_for('bulk_search'))
-
     try:
         # Get form data
         if is_ajax:
             data = request.get_json()
             search_entries = data.get('search_entries', [])
             images_per_class = int(data.get('images_per_class', 100))
-            destination_folder = data.get('destination_folder', '').strip() or app.config['UPLOAD_FOLDER']
+            destination_folder = data.get('destination_folder', '').strip()
+            full_resolution = bool(data.get('full_resolution', app.config['FULL_RESOLUTION']))
+            worker_processes = data.get('worker_processes')
+            deadline_seconds = data.get('deadline_seconds')
+            cleanup_on_cancel = data.get('cleanup_on_cancel')
         else:
             # Handle form submission (fallback)
             search_entries = []
@@ -185,7 +408,11 @@ def perform_bulk_search():
                     })
 
             images_per_class = int(request.form.get('images_per_class', 100))
-            destination_folder = request.form.get('destination_folder', '').strip() or app.config['UPLOAD_FOLDER']
+            destination_folder = request.form.get('destination_folder', '').strip()
+            full_resolution = request.form.get('full_resolution', str(app.config['FULL_RESOLUTION'])).lower() in ('true', 'on', '1')
+            worker_processes = request.form.get('worker_processes')
+            deadline_seconds = None
+            cleanup_on_cancel = None
 
         # Validate input
         if not search_entries:
@@ -204,81 +431,25 @@ def perform_bulk_search():
                 flash(error_msg, 'error')
                 return redirect(url_for('bulk_search'))
 
-        # Start bulk scraping in background thread
-        def bulk_scrape_worker():
-            global scraping_status
-            scraper = None
-            total_downloaded = 0
-
-            try:
-                # Clear previous logs
-                scraping_logger.clear_logs()
-                scraping_logger.info("🎬 Starting bulk scraping session")
-                scraping_logger.info(f"📝 Processing {len(search_entries)} search entries, {images_per_class} images each")
-
-                scraping_status['is_running'] = True
-                scraping_status['progress'] = 'Initializing bulk scraper...'
-
-                scraper = GoogleImageScraper(headless=True)
-
-                for i, entry in enumerate(search_entries, 1):
-                    keyword = entry['keyword']
-                    class_name = entry['className']
-                    entry_destination = entry.get('destinationFolder')
-
-                    # Use per-row destination folder if specified, otherwise use global setting
-                    current_destination = entry_destination if entry_destination else destination_folder
-
-                    scraping_status['progress'] = f'Processing {i}/{len(search_entries)}: {keyword} -> {class_name}'
-                    if entry_destination:
-                        scraping_logger.info(f"🔍 [{i}/{len(search_entries)}] Processing: '{keyword}' -> '{class_name}' (destination: {current_destination})")
-                    else:
-                        scraping_logger.info(f"🔍 [{i}/{len(search_entries)}] Processing: '{keyword}' -> '{class_name}'")
-
-                    def progress_callback(message):
-                        scraping_status['progress'] = f'[{i}/{len(search_entries)}] {message}'
-
-                    try:
-                        downloaded_count, class_folder = scraper.scrape_images(
-                            keyword, current_destination, class_name, images_per_class, progress_callback
-                        )
-                        total_downloaded += downloaded_count
-                        if entry_destination:
-                            scraping_logger.success(f"✅ [{i}/{len(search_entries)}] Completed: {downloaded_count} images for '{class_name}' in '{current_destination}'")
-                        else:
-                            scraping_logger.success(f"✅ [{i}/{len(search_entries)}] Completed: {downloaded_count} images for '{class_name}'")
-
-                    except Exception as e:
-                        scraping_logger.error(f"❌ [{i}/{len(search_entries)}] Failed '{keyword}' -> '{class_name}': {str(e)}")
-                        continue
-
-                scraping_status['progress'] = f'Bulk scraping completed! Downloaded {total_downloaded} images total.'
-                scraping_logger.info(f"🎉 Bulk scraping session completed - {total_downloaded} images total")
-                time.sleep(2)  # Keep message visible for a moment
-
-            except Exception as e:
-                error_msg = f'Bulk scraping error: {str(e)}'
-                scraping_status['progress'] = error_msg
-                scraping_logger.error(f"💥 Bulk scraping session failed: {str(e)}")
-            finally:
-                if scraper:
-                    scraper.close()
-                scraping_status['is_running'] = False
-
-        # Start background thread
-        thread = threading.Thread(target=bulk_scrape_worker)
-        thread.daemon = True
-        thread.start()
+        job = submit_bulk_job(
+            search_entries, images_per_class, destination_folder, full_resolution,
+            int(worker_processes) if worker_processes not in (None, '') else None,
+            deadline_seconds, cleanup_on_cancel
+        )
+        message = job_started_message(job, f'Bulk image scraping for {len(search_entries)} entries')
 
         if is_ajax:
             return jsonify({
                 'status': 'success',
-                'message': f'Bulk image scraping started for {len(search_entries)} entries! You can monitor progress below.',
+                'message': message,
                 'entries_count': len(search_entries),
-                'images_per_class': images_per_class
+                'images_per_class': images_per_class,
+                'worker_processes': job.params['worker_processes'],
+                'job_id': job.id,
+                'job_state': job.state
             })
         else:
-            flash(f'Bulk image scraping started for {len(search_entries)} entries! You can monitor progress below.', 'success')
+            flash(message, 'success')
             return redirect(url_for('scraping_progress'))
 
     except Exception as e:
@@ -297,7 +468,7 @@ def scraping_progress():
 @app.route('/api/scraping_status')
 def api_scraping_status():
     """API endpoint to get current scraping status."""
-    return jsonify(scraping_status)
+    return jsonify(get_scraping_status())
 
 @app.route('/api/scraping_logs')
 def api_scraping_logs():
@@ -347,12 +518,12 @@ def api_scraping_logs_stream():
                         'type': 'heartbeat',
                         'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
                         'log_count': len(all_logs),
-                        'scraping_running': scraping_status['is_running']
+                        'scraping_running': get_scraping_status()['is_running']
                     }
                     yield f"data: {json.dumps(heartbeat_data)}\n\n"
 
                 # Check if scraping is still running
-                if not scraping_status['is_running'] and last_log_count > 0 and iteration_count > 5:
+                if not get_scraping_status()['is_running'] and last_log_count > 0 and iteration_count > 5:
                     # Send completion signal
                     completion_data = {
                         'type': 'complete',
@@ -411,12 +582,235 @@ def api_scraping_logs_clear():
 @app.route('/api/scraping_reset', methods=['POST'])
 def api_scraping_reset():
     """Reset scraping status (for testing purposes)."""
-    global scraping_status
-    scraping_status['is_running'] = False
-    scraping_status['progress'] = ''
-    scraping_status['current_task'] = None
+    cancelled = job_manager.cancel_all()
     scraping_logger.clear_logs()
-    return jsonify({'status': 'success', 'message': 'Scraping status reset'})
+    return jsonify({'status': 'success', 'message': 'Scraping status reset', 'cancelled_jobs': cancelled})
+
+@app.route('/api/jobs', methods=['GET'])
+def api_list_jobs():
+    """List scraping jobs, optionally filtered by ?state=queued|running|done|failed|cancelled."""
+    state = request.args.get('state')
+    if state and state not in JOB_STATES:
+        return jsonify({'status': 'error', 'message': f'Unknown job state: {state}'}), 400
+
+    jobs = job_manager.list_jobs(state)
+    return jsonify({
+        'status': 'success',
+        'jobs': [job.to_dict(include_entries=False) for job in jobs],
+        'stats': job_manager.get_stats()
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """Submit a scraping job. Body: {"type": "scrape"|"bulk", ...same fields as the forms}."""
+    try:
+        data = request.get_json() or {}
+        job_type = data.get('type', 'scrape')
+        full_resolution = bool(data.get('full_resolution', app.config['FULL_RESOLUTION']))
+        destination_folder = (data.get('destination_folder') or '').strip()
+
+        if job_type == 'scrape':
+            keywords = (data.get('keywords') or '').strip()
+            class_name = (data.get('class_name') or '').strip()
+            max_images = int(data.get('max_images', 20))
+
+            if not keywords or not class_name:
+                return jsonify({'status': 'error', 'message': 'keywords and class_name are required'}), 400
+            if max_images < 1 or max_images > 100:
+                return jsonify({'status': 'error', 'message': 'max_images must be between 1 and 100'}), 400
+
+            job = submit_scrape_job(keywords, destination_folder, class_name, max_images, full_resolution,
+                                    data.get('deadline_seconds'), data.get('cleanup_on_cancel'))
+
+        elif job_type == 'bulk':
+            search_entries = [
+                entry for entry in data.get('search_entries', [])
+                if (entry.get('keyword') or '').strip() and (entry.get('className') or '').strip()
+            ]
+            images_per_class = int(data.get('images_per_class', 100))
+            worker_processes = data.get('worker_processes')
+
+            if not search_entries:
+                return jsonify({'status': 'error', 'message': 'No valid search entries provided'}), 400
+            if images_per_class < 1 or images_per_class > 500:
+                return jsonify({'status': 'error', 'message': 'Images per class must be between 1 and 500'}), 400
+
+            job = submit_bulk_job(
+                search_entries, images_per_class, destination_folder, full_resolution,
+                int(worker_processes) if worker_processes is not None else None,
+                data.get('deadline_seconds'), data.get('cleanup_on_cancel')
+            )
+
+        else:
+            return jsonify({'status': 'error', 'message': f'Unknown job type: {job_type}'}), 400
+
+        return jsonify({'status': 'success', 'job': job.to_dict()}), 202
+
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': f'Invalid job parameters: {str(e)}'}), 400
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """Get a job's state, progress, per-entry results and final result."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'job': job.to_dict()})
+
+@app.route('/api/jobs/<job_id>/resume', methods=['POST'])
+def api_resume_job(job_id):
+    """Re-run a checkpointed bulk job, skipping completed entries and already fetched URLs."""
+    saved = checkpoint_store.get_job(job_id)
+    if saved is None:
+        return jsonify({'status': 'error', 'message': 'No checkpoint found for this job'}), 404
+    if saved['kind'] != 'bulk':
+        return jsonify({'status': 'error', 'message': 'Only bulk jobs can be resumed'}), 400
+
+    try:
+        job = job_manager.submit(saved['kind'], saved['title'], run_bulk_job, saved['params'], job_id=job_id,
+                                 deadline_seconds=saved['params'].get('deadline_seconds'))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+
+    record_job_checkpoint(job)
+    return jsonify({'status': 'success', 'job': job.to_dict()}), 202
+
+@app.route('/api/checkpoints')
+def api_checkpoints():
+    """List checkpointed bulk jobs, optionally filtered by ?state= (e.g. interrupted)."""
+    states = request.args.getlist('state')
+    return jsonify({'status': 'success', 'jobs': checkpoint_store.list_jobs(states or None)})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    """Cancel a queued job or ask a running one to stop."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'job': job.to_dict(include_entries=False)})
+
+@app.route('/api/circuit_breakers')
+def api_circuit_breakers():
+    """Get the circuit breaker state of every download host."""
+    return jsonify({
+        'status': 'success',
+        'enabled': host_circuit_breakers.enabled,
+        'failure_threshold': host_circuit_breakers.failure_threshold,
+        'cooldown_seconds': host_circuit_breakers.cooldown,
+        'hosts': host_circuit_breakers.get_stats()
+    })
+
+@app.route('/api/circuit_breakers/reset', methods=['POST'])
+def api_circuit_breakers_reset():
+    """Close the circuit of one host (JSON {"host": ...}) or of all hosts."""
+    data = request.get_json(silent=True) or {}
+    reset = host_circuit_breakers.reset(data.get('host'))
+    return jsonify({'status': 'success', 'message': f'Reset {reset} circuit breaker(s)', 'reset': reset})
+
+@app.route('/api/http_metrics')
+def api_http_metrics():
+    """Get connection reuse statistics of the scrapers' HTTP sessions."""
+    return jsonify({
+        'status': 'success',
+        'client': Config.HTTP_CLIENT,
+        'pool_connections': Config.HTTP_POOL_CONNECTIONS,
+        'pool_maxsize': Config.HTTP_POOL_MAXSIZE,
+        **connection_metrics.get_stats()
+    })
+
+@app.route('/api/url_index')
+def api_url_index():
+    """Get statistics of the downloaded-URL index."""
+    url_index = get_url_index()
+    if url_index is None:
+        return jsonify({'status': 'success', 'enabled': False})
+    return jsonify({'status': 'success', 'enabled': True, **url_index.get_stats()})
+
+@app.route('/api/catalog/rebuild', methods=['POST'])
+def api_catalog_rebuild():
+    """Reconcile the image catalog with the class folders on disk (after changes made outside the app)."""
+    catalog = get_image_catalog()
+    if catalog is None:
+        return jsonify({'status': 'success', 'enabled': False})
+    counts = catalog.rebuild(app.config['UPLOAD_FOLDER'])
+    return jsonify({'status': 'success', 'enabled': True, **counts})
+
+@app.route('/api/folder_watcher')
+def api_folder_watcher():
+    """Get the state of the folder watcher that keeps the catalog current."""
+    watcher = get_folder_watcher()
+    if watcher is None:
+        return jsonify({'status': 'success', 'enabled': False})
+    return jsonify({'status': 'success', 'enabled': True, **watcher.get_stats()})
+
+@app.route('/api/dedup_report')
+def api_dedup_report():
+    """Get per-class and global duplicate statistics from the content-hash index.
+
+    With ?rescan=1, images saved before deduplication was enabled are hashed first.
+    """
+    content_index = get_content_index()
+    if content_index is None:
+        return jsonify({'status': 'success', 'enabled': False})
+
+    indexed = 0
+    if request.args.get('rescan', '').lower() in ('1', 'true'):
+        for class_info in get_all_classes(Config.UPLOAD_FOLDER):
+            indexed += content_index.index_folder(class_info['path'], class_info['name'])
+
+    return jsonify({'status': 'success', 'enabled': True, 'indexed': indexed, **content_index.get_report()})
+
+@app.route('/api/duplicates/<class_name>')
+def api_duplicates(class_name):
+    """List clusters of near-duplicate images in a class folder.
+
+    ?max_distance= sets how many of the 64 hash bits may differ (defaults to NEAR_DUP_MAX_DISTANCE).
+    """
+    near_dup_index = get_near_duplicate_index()
+    if near_dup_index is None:
+        return jsonify({'status': 'success', 'enabled': False})
+
+    class_folder = os.path.join(app.config['UPLOAD_FOLDER'], class_name)
+    if not os.path.isdir(class_folder):
+        return jsonify({'status': 'error', 'message': 'Class not found'}), 404
+
+    try:
+        max_distance = int(request.args.get('max_distance', Config.NEAR_DUP_MAX_DISTANCE))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'max_distance must be an integer'}), 400
+
+    indexed = near_dup_index.index_folder(class_folder)
+    clusters = near_dup_index.clusters(class_folder, max_distance)
+    return jsonify({
+        'status': 'success',
+        'enabled': True,
+        'class_name': class_name,
+        'max_distance': max_distance,
+        'indexed': indexed,
+        'duplicate_images': sum(cluster['size'] - 1 for cluster in clusters),
+        'clusters': clusters
+    })
+
+@app.route('/api/driver_pool')
+def api_driver_pool():
+    """Get WebDriver pool statistics."""
+    pool = get_driver_pool()
+    return jsonify({
+        'status': 'success',
+        'enabled': pool is not None,
+        'data': pool.get_stats() if pool else None
+    })
+
+@app.route('/api/driver_cache/invalidate', methods=['POST'])
+def api_driver_cache_invalidate():
+    """Forget cached ChromeDriver paths so the next browser start resolves them again."""
+    data = request.get_json(silent=True) or {}
+    removed = invalidate_driver_cache(data.get('chrome_version'))
+    return jsonify({
+        'status': 'success',
+        'message': f'Invalidated {removed} cached ChromeDriver path(s)',
+        'removed': removed
+    })
 
 @app.route('/api/scraping_logs/new')
 def api_scraping_logs_new():
@@ -542,6 +936,9 @@ def api_move_images():
                 if os.path.exists(source_path):
                     shutil.move(source_path, dest_path)
                     moved_count += 1
+                    catalog = get_image_catalog()
+                    if catalog:
+                        catalog.move_image(os.path.dirname(source_path), dest_dir, filename)
                 else:
                     failed_images.append(filename)
 
@@ -601,6 +998,9 @@ def api_delete_images():
                 if os.path.exists(file_path):
                     os.remove(file_path)
                     deleted_count += 1
+                    catalog = get_image_catalog()
+                    if catalog:
+                        catalog.remove_image(os.path.dirname(file_path), filename)
                 else:
                     failed_images.append(filename)
 
@@ -865,5 +1265,44 @@ def not_found_error(error):
 def internal_error(error):
     return render_template('500.html'), 500
 
+def prewarm_driver_pool():
+    """Start the pooled browsers in the background so the first job does not wait for Chrome."""
+    pool = get_driver_pool()
+    if not pool or not app.config['DRIVER_POOL_PREWARM'] or app.config['SEARCH_BACKEND'] != 'selenium':
+        return
+
+    def warm_up_worker():
+        try:
+            pool.warm_up()
+            scraping_logger.info(f"🔥 WebDriver pool warmed up ({pool.size} browsers)")
+        except Exception as e:
+            scraping_logger.warning(f"⚠️ WebDriver pool warm-up failed: {str(e)}")
+
+    thread = threading.Thread(target=warm_up_worker)
+    thread.daemon = True
+    thread.start()
+
+def start_background_services():
+    """
+    Flag bulk jobs a previous process left running and start the folder watcher.
+
+    Called by the process that serves requests (the __main__ block below or
+    create_app), never on import: bulk worker processes and tests import
+    this module too.
+    """
+    interrupted = checkpoint_store.mark_interrupted()
+    if interrupted:
+        scraping_logger.info(f"⏸️ {interrupted} bulk job(s) left running by a previous process can be resumed")
+    start_folder_watcher(app.config['UPLOAD_FOLDER'])
+
+def create_app():
+    """Entry point for WSGI servers and flask run, e.g. gunicorn 'app:create_app()'."""
+    start_background_services()
+    return app
+
 if __name__ == '__main__':
+    # With the debug reloader only the child process serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        prewarm_driver_pool()
+        start_background_services()
     app.run(debug=True, host='0.0.0.0', port=5000)
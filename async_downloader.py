@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import weakref
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from config import Config
+from logger import scraping_logger
+from cancellation import check_cancelled
+from circuit_breaker import host_circuit_breakers
+from http_client import DEFAULT_HEADERS, IMAGE_HEADERS, httpx, record_httpx_response
+from image_sniff import DownloadBuffer, response_problem
+from rate_limiter import host_rate_limiter
+from retry import RETRYABLE_STATUS_CODES, download_retry_policy, parse_retry_after
+
+# How often coroutines waiting for a slot, the rate limiter or a retry look at their cancel token
+CANCEL_POLL_SECONDS = 0.2
+
+
+class AsyncDownloader:
+    """
+    Image downloads as coroutines on one event loop, for the asyncio download engine.
+
+    The loop runs in a background thread with a single httpx.AsyncClient, so a
+    job can keep hundreds of downloads in flight without a thread each.
+    submit() is called from ordinary threads and returns a
+    concurrent.futures.Future, which lets GoogleImageScraper.scrape_images
+    treat both engines alike.
+
+    Each download follows the same rules as the thread engine: at most
+    max_concurrency downloads in flight and max_per_host per host, the host's
+    rate limit, circuit breaker and retry policy, and early aborts on the
+    headers and first chunks. The finished body is handed to
+    accept(url, body, folder_path, filename_prefix) in a worker thread, since
+    validating, hashing and writing the file would block the loop.
+    """
+
+    def __init__(self, accept: Callable, max_concurrency: int, max_per_host: int, http2: bool = True):
+        if httpx is None:
+            raise RuntimeError("The asyncio download engine needs httpx (pip install httpx[http2])")
+        self.accept = accept
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_per_host = max(int(max_per_host), 1)
+        self.http2 = http2
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._streams = weakref.WeakSet()
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='async-downloader', daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    async def _start(self):
+        # Loop-bound objects are created on the loop's own thread
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=Config.HTTP_POOL_CONNECTIONS)
+        try:
+            self.client = httpx.AsyncClient(http2=self.http2, headers=DEFAULT_HEADERS, limits=limits,
+                                            follow_redirects=True)
+        except ImportError:
+            scraping_logger.warning("⚠️ HTTP/2 needs the 'h2' package (pip install httpx[http2]), using HTTP/1.1")
+            self.client = httpx.AsyncClient(headers=DEFAULT_HEADERS, limits=limits, follow_redirects=True)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    def submit(self, url, folder_path, filename_prefix="image", cancel_token=None):
+        """Schedule a download; the Future resolves to the saved filename or None."""
+        return asyncio.run_coroutine_threadsafe(
+            self.download_image(url, folder_path, filename_prefix, cancel_token), self.loop)
+
+    async def download_image(self, url, folder_path, filename_prefix="image", cancel_token=None):
+        """Download a single image; the coroutine counterpart of GoogleImageScraper.download_image.
+
+        Raises JobCancelled if cancel_token is cancelled while the download waits
+        or streams its body.
+        """
+        host_slot = self._host_slot(url)
+        await self._acquire(self._slots, cancel_token)
+        try:
+            await self._acquire(host_slot, cancel_token)
+            try:
+                return await self._download(url, folder_path, filename_prefix, cancel_token)
+            finally:
+                host_slot.release()
+        finally:
+            self._slots.release()
+
+    async def _download(self, url, folder_path, filename_prefix, cancel_token):
+        try:
+            check_cancelled(cancel_token)
+            scraping_logger.debug(f"📥 Downloading: {url[:80]}...")
+
+            response = await self._get_with_retries(url, cancel_token)
+            if response is None:
+                return None
+
+            try:
+                problem = response_problem(response.headers)
+                if problem:
+                    scraping_logger.warning(f"🚫 URL {problem}, skipping: {url[:80]}...")
+                    return None
+
+                body = DownloadBuffer()
+                async for chunk in response.aiter_bytes(8192):
+                    check_cancelled(cancel_token)
+                    problem = body.feed(chunk)
+                    if problem:
+                        scraping_logger.warning(f"🚫 Image {problem}, aborted after {body.size} bytes: {url[:80]}...")
+                        return None
+            finally:
+                await response.aclose()
+
+            return await self.loop.run_in_executor(None, self.accept, url, body, folder_path, filename_prefix)
+
+        except httpx.HTTPError as e:
+            scraping_logger.error(f"🌐 Network error downloading image: {str(e)}")
+            return None
+        except Exception as e:
+            scraping_logger.error(f"❌ Error downloading image: {str(e)}")
+            return None
+
+    async def _get_with_retries(self, url, cancel_token):
+        """Coroutine version of GoogleImageScraper._get_with_retries, for httpx responses."""
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            if not host_circuit_breakers.allow(url):
+                scraping_logger.warning(f"⛔ Circuit open for {host}, skipping: {url[:80]}...")
+                return None
+
+            waited = host_rate_limiter.bucket_for_host(host).reserve()
+            if waited > 0:
+                await self._sleep(waited, cancel_token)
+                scraping_logger.debug(f"⏱️ Rate limited for {waited:.2f}s: {host}")
+
+            try:
+                request = self.client.build_request('GET', url, headers=IMAGE_HEADERS, timeout=15)
+                response = await self.client.send(request, stream=True)
+            except httpx.TransportError as e:
+                host_circuit_breakers.record_failure(url)
+                delay = download_retry_policy.delay(attempt)
+                if delay is None:
+                    raise
+                reason = type(e).__name__
+            else:
+                record_httpx_response(urlparse(url).hostname, response, self._streams)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # The host answered; a 404 or 403 is about this URL, not the host
+                    host_circuit_breakers.record_success(url)
+                    if response.status_code >= 400:
+                        await response.aclose()
+                    response.raise_for_status()
+                    return response
+
+                host_circuit_breakers.record_failure(url)
+                retry_after = response.headers.get('Retry-After')
+                await response.aclose()
+                delay = download_retry_policy.delay(attempt, retry_after)
+                if delay is None:
+                    wait = parse_retry_after(retry_after)
+                    if wait is not None and wait > download_retry_policy.max_delay:
+                        # The host asked for a long break: give it one for all downloads
+                        host_circuit_breakers.trip(url, wait)
+                    response.raise_for_status()
+                reason = f"HTTP {response.status_code}"
+
+            attempt += 1
+            scraping_logger.info(f"🔁 {reason} from {host}, retry {attempt} in {delay:.1f}s: {url[:80]}...")
+            await self._sleep(delay, cancel_token)
+
+    def _host_slot(self, url) -> asyncio.Semaphore:
+        """Get the semaphore that caps concurrent downloads for the URL's host (loop thread only)."""
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    @staticmethod
+    async def _acquire(semaphore: asyncio.Semaphore, cancel_token=None):
+        """Acquire a semaphore, raising JobCancelled if cancel_token is cancelled meanwhile."""
+        if cancel_token is None:
+            await semaphore.acquire()
+            return
+        while True:
+            check_cancelled(cancel_token)
+            try:
+                await asyncio.wait_for(semaphore.acquire(), CANCEL_POLL_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    @staticmethod
+    async def _sleep(seconds: float, cancel_token=None):
+        """asyncio.sleep that ends early with JobCancelled once cancel_token is cancelled."""
+        loop = asyncio.get_running_loop()
+        until = loop.time() + seconds
+        while True:
+            check_cancelled(cancel_token)
+            remaining = until - loop.time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, CANCEL_POLL_SECONDS))
+
+    def close(self):
+        """Close the HTTP client and stop the event loop."""
+        if self.loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result(timeout=5)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
+            self.loop.close()
+
+
+def create_async_downloader(accept: Callable, max_per_host: int) -> Optional[AsyncDownloader]:
+    """AsyncDownloader for DOWNLOAD_ENGINE=asyncio, or None (thread engine) if httpx is not installed."""
+    if httpx is None:
+        scraping_logger.warning("⚠️ DOWNLOAD_ENGINE=asyncio but httpx is not installed, using threads")
+        return None
+    return AsyncDownloader(accept, Config.ASYNC_DOWNLOAD_CONCURRENCY, max_per_host, Config.HTTP2_ENABLED)
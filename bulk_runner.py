@@ -0,0 +1,275 @@
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from cancellation import CancellationToken, JobCancelled
+from config import Config
+from logger import scraping_logger
+
+
+def resolve_worker_count(requested: Optional[int], entry_count: int) -> int:
+    """Number of worker processes for a bulk job (0 or None means one per CPU core)."""
+    if requested is None:
+        requested = Config.BULK_WORKER_PROCESSES
+    if requested <= 0:
+        requested = os.cpu_count() or 1
+    return max(1, min(requested, entry_count))
+
+
+def _worker_main(worker_id: int, task_queue, event_queue, settings: Dict[str, Any], stop_event):
+    """
+    Worker process: owns one GoogleImageScraper (and browser) and processes entries until a sentinel.
+
+    settings holds images_per_class, full_resolution and cleanup_on_cancel. stop_event is a
+    multiprocessing Event the parent sets to cancel the job; the current entry stops at its
+    next cancellation check and the worker exits.
+    """
+    from scraper import GoogleImageScraper
+
+    cancel_token = CancellationToken(event=stop_event)
+
+    # Forward this process' log lines to the parent so they show up in the web log view
+    scraping_logger.add_listener(lambda entry: event_queue.put({
+        'type': 'log', 'worker': worker_id, 'level': entry['level'], 'message': entry['message']
+    }))
+
+    try:
+        scraper = GoogleImageScraper(headless=True)
+    except Exception as e:
+        event_queue.put({'type': 'worker_failed', 'worker': worker_id, 'error': str(e)})
+        return
+
+    try:
+        while not cancel_token.cancelled:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            index, entry = task['index'], task['entry']
+            event_queue.put({'type': 'started', 'worker': worker_id, 'index': index})
+
+            def progress_callback(message):
+                event_queue.put({'type': 'progress', 'worker': worker_id, 'index': index, 'message': message})
+
+            def url_callback(url, status, filename):
+                event_queue.put({'type': 'url', 'worker': worker_id, 'index': index,
+                                 'url': url, 'status': status, 'filename': filename})
+
+            try:
+                downloaded_count, class_folder = scraper.scrape_images(
+                    entry['keyword'], task['destination'], entry['className'],
+                    task.get('max_images', settings['images_per_class']), progress_callback,
+                    full_resolution=settings['full_resolution'], skip_urls=task.get('skip_urls'),
+                    url_callback=url_callback, cancel_token=cancel_token,
+                    cleanup_on_cancel=settings.get('cleanup_on_cancel', False)
+                )
+                event_queue.put({
+                    'type': 'result', 'worker': worker_id, 'index': index,
+                    'status': 'done' if class_folder else 'failed',
+                    'downloaded': downloaded_count, 'class_folder': class_folder, 'error': None
+                })
+            except JobCancelled as e:
+                event_queue.put({
+                    'type': 'result', 'worker': worker_id, 'index': index,
+                    'status': 'cancelled', 'downloaded': 0, 'class_folder': None, 'error': str(e)
+                })
+                break
+            except Exception as e:
+                event_queue.put({
+                    'type': 'result', 'worker': worker_id, 'index': index,
+                    'status': 'failed', 'downloaded': 0, 'class_folder': None, 'error': str(e)
+                })
+    finally:
+        scraper.close()
+        event_queue.put({'type': 'worker_done', 'worker': worker_id})
+
+
+def run_bulk_parallel(search_entries: List[Dict[str, Any]], images_per_class: int, destination_folder: str,
+                      worker_count: int, full_resolution: bool = False,
+                      progress_callback: Optional[Callable[[str], None]] = None,
+                      entry_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      entry_options: Optional[Dict[int, Dict[str, Any]]] = None,
+                      url_callback: Optional[Callable[[int, str, str, Optional[str]], None]] = None,
+                      cancel_token: Optional[CancellationToken] = None, cleanup_on_cancel: bool = False,
+                      worker_target: Callable = _worker_main) -> List[Dict[str, Any]]:
+    """
+    Spread bulk search entries across worker processes, each with its own browser.
+
+    Args:
+        search_entries: List of {'keyword', 'className', optional 'destinationFolder'}
+        images_per_class: Images to download per entry
+        destination_folder: Default destination for entries without their own folder
+        worker_count: Number of worker processes to start
+        full_resolution: Save original images instead of thumbnails
+        progress_callback: Called with a merged progress message
+        entry_callback: Called with an entry's result dict whenever its state changes
+        entry_options: Per-entry overrides by index, used when resuming a job:
+            'done' (skip the entry), 'downloaded' (images already saved),
+            'max_images' and 'skip_urls' (passed to scrape_images)
+        url_callback: Called as url_callback(index, url, status, filename) for each image URL
+        cancel_token: Cancelling it (or its deadline passing) stops all workers; unfinished
+            entries are then reported as 'cancelled'
+        cleanup_on_cancel: Delete images saved by entries that get cancelled
+
+    Returns:
+        One result dict per entry, in input order
+    """
+    total = len(search_entries)
+    results = [{
+        'index': i,
+        'keyword': entry['keyword'],
+        'className': entry['className'],
+        'destination': entry.get('destinationFolder') or destination_folder,
+        'status': 'queued',
+        'worker': None,
+        'downloaded': 0,
+        'class_folder': None,
+        'error': None,
+        'progress': ''
+    } for i, entry in enumerate(search_entries)]
+
+    entry_options = entry_options or {}
+    for result in results:
+        options = entry_options.get(result['index'], {})
+        result['downloaded'] = options.get('downloaded', 0)
+        if options.get('done'):
+            result['status'] = 'done'
+    pending = [result for result in results if result['status'] == 'queued']
+    if not pending:
+        return results
+    worker_count = min(worker_count, len(pending))
+
+    # 'spawn' keeps workers clear of the parent's Flask threads and pooled drivers
+    context = multiprocessing.get_context('spawn')
+    task_queue = context.Queue()
+    event_queue = context.Queue()
+    stop_event = context.Event()
+    settings = {
+        'images_per_class': images_per_class,
+        'full_resolution': full_resolution,
+        'cleanup_on_cancel': cleanup_on_cancel
+    }
+
+    for result in pending:
+        options = entry_options.get(result['index'], {})
+        task = {
+            'index': result['index'],
+            'entry': search_entries[result['index']],
+            'destination': result['destination']
+        }
+        if 'max_images' in options:
+            task['max_images'] = options['max_images']
+        if options.get('skip_urls'):
+            task['skip_urls'] = list(options['skip_urls'])
+        task_queue.put(task)
+    for _ in range(worker_count):
+        task_queue.put(None)
+
+    processes = []
+    for worker_id in range(1, worker_count + 1):
+        process = context.Process(
+            target=worker_target,
+            args=(worker_id, task_queue, event_queue, settings, stop_event),
+            name=f'bulk-worker-{worker_id}',
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    scraping_logger.info(f"🧵 Started {worker_count} bulk worker processes for {len(pending)} entries")
+
+    finished_workers = set()
+    completed = total - len(pending)
+
+    def report(message):
+        if progress_callback:
+            progress_callback(f'[{completed}/{total} done] {message}')
+
+    def handle(event):
+        nonlocal completed
+        event_type = event['type']
+        worker_id = event['worker']
+
+        if event_type == 'log':
+            scraping_logger.log(event['level'], f"[worker {worker_id}] {event['message']}")
+        elif event_type == 'url':
+            if url_callback:
+                url_callback(event['index'], event['url'], event['status'], event['filename'])
+        elif event_type in ('worker_done', 'worker_failed'):
+            finished_workers.add(worker_id)
+            if event_type == 'worker_failed':
+                scraping_logger.error(f"❌ Bulk worker {worker_id} could not start: {event['error']}")
+        else:
+            result = results[event['index']]
+            result['worker'] = worker_id
+            label = f"'{result['keyword']}' -> '{result['className']}'"
+
+            if event_type == 'started':
+                result['status'] = 'running'
+                report(f'Worker {worker_id} processing {label}')
+            elif event_type == 'progress':
+                result['progress'] = event['message']
+                report(f"{result['className']}: {event['message']}")
+            elif event_type == 'result':
+                result.update(status=event['status'], downloaded=result['downloaded'] + event['downloaded'],
+                              class_folder=event['class_folder'], error=event['error'])
+                completed += 1
+                if result['status'] == 'done':
+                    scraping_logger.success(f"✅ [{completed}/{total}] Completed: {result['downloaded']} images for '{result['className']}'")
+                elif result['status'] == 'cancelled':
+                    scraping_logger.warning(f"🛑 [{completed}/{total}] Cancelled {label}")
+                else:
+                    scraping_logger.error(f"❌ [{completed}/{total}] Failed {label}: {result['error'] or 'scrape returned no folder'}")
+                report(f'Finished {label}')
+
+            if entry_callback:
+                entry_callback(result)
+
+    try:
+        while completed < total and len(finished_workers) < worker_count:
+            if cancel_token is not None and cancel_token.cancelled and not stop_event.is_set():
+                scraping_logger.warning(f"🛑 Stopping bulk workers: {cancel_token.reason}")
+                stop_event.set()
+
+            try:
+                handle(event_queue.get(timeout=0.5))
+            except queue.Empty:
+                # A worker that crashed (e.g. killed Chrome took the process down) never reports back
+                for worker_id, process in enumerate(processes, 1):
+                    if not process.is_alive() and worker_id not in finished_workers:
+                        scraping_logger.error(f"💥 Bulk worker {worker_id} exited unexpectedly (code {process.exitcode})")
+                        finished_workers.add(worker_id)
+
+        # Collect anything still in flight from workers that have already finished
+        drain_deadline = time.time() + 5
+        while time.time() < drain_deadline and any(p.is_alive() for p in processes):
+            try:
+                handle(event_queue.get(timeout=0.5))
+            except queue.Empty:
+                continue
+        while True:
+            try:
+                handle(event_queue.get_nowait())
+            except queue.Empty:
+                break
+    finally:
+        task_queue.cancel_join_thread()
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    for result in results:
+        if result['status'] in ('queued', 'running'):
+            if stop_event.is_set():
+                result['status'] = 'cancelled'
+                result['error'] = cancel_token.reason
+            else:
+                result['status'] = 'failed'
+                result['error'] = result['error'] or 'Worker exited before finishing this entry'
+            if entry_callback:
+                entry_callback(result)
+
+    return results
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Optional
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when its CancellationToken is cancelled or its deadline passes.
+
+    Like asyncio.CancelledError it derives from BaseException, so the scraper's
+    generic `except Exception` error handling does not swallow it.
+    """
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation signal with an optional wall-clock deadline.
+
+    Long-running code calls raise_if_cancelled() at safe points and uses wait()
+    instead of time.sleep(), so a cancelled job stops within moments. event may
+    be a multiprocessing Event to share the signal with worker processes.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, event=None):
+        self.deadline = deadline  # time.time() timestamp
+        self.event = event if event is not None else threading.Event()
+        self.reason = None
+
+    @classmethod
+    def with_timeout(cls, seconds: Optional[float], event=None) -> 'CancellationToken':
+        """Token that expires after the given number of seconds (None or <= 0 means no deadline)."""
+        return cls(time.time() + seconds if seconds and seconds > 0 else None, event=event)
+
+    def cancel(self, reason: str = 'Cancelled by user'):
+        if not self.event.is_set():
+            self.reason = reason
+            self.event.set()
+
+    def set_deadline(self, seconds: Optional[float]):
+        """Start (or clear) the wall-clock deadline, counted from now."""
+        self.deadline = time.time() + seconds if seconds and seconds > 0 else None
+
+    @property
+    def cancelled(self) -> bool:
+        if self.event.is_set():
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.cancel('Deadline exceeded')
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline, or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.time(), 0)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(self.reason or 'Cancelled')
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, waking early on cancellation. Returns True if cancelled."""
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        self.event.wait(max(timeout, 0))
+        return self.cancelled
+
+
+def check_cancelled(token: Optional[CancellationToken]):
+    """raise_if_cancelled() for optional tokens."""
+    if token is not None:
+        token.raise_if_cancelled()
@@ -0,0 +1,320 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from config import Config
+from sqlite_store import SQLiteStore
+
+
+def is_image_file(filename: str) -> bool:
+    """Whether a file name has one of the ALLOWED_EXTENSIONS (partial downloads end in .part)."""
+    return os.path.splitext(filename)[1].lower().lstrip('.') in Config.ALLOWED_EXTENSIONS
+
+
+def read_dimensions(file_path: str) -> Tuple[Optional[int], Optional[int]]:
+    """Width and height from the image header, or (None, None) if it cannot be read."""
+    try:
+        with Image.open(file_path) as image:
+            return image.size
+    except Exception:
+        return None, None
+
+
+def _split(class_folder: str) -> Tuple[str, str]:
+    class_folder = os.path.abspath(class_folder)
+    return os.path.dirname(class_folder), os.path.basename(class_folder)
+
+
+class ImageCatalog(SQLiteStore):
+    """
+    Catalog of the class folders and the images in them, so listings never scan the disk.
+
+    Images are keyed by (root, class, filename), where root is the absolute
+    UPLOAD_FOLDER. Each class row keeps its image count and byte total up to
+    date as images are added, moved or removed. A root that was never seen
+    is scanned once on first use (rebuild), and scan_class() reconciles a
+    single folder with what is on disk after changes made outside the app.
+    Hashes and source URLs are only known for images saved by the scraper.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS catalog_roots (
+        root TEXT PRIMARY KEY,
+        scanned_at REAL
+    );
+    CREATE TABLE IF NOT EXISTS catalog_classes (
+        root TEXT NOT NULL,
+        name TEXT NOT NULL,
+        image_count INTEGER NOT NULL DEFAULT 0,
+        total_bytes INTEGER NOT NULL DEFAULT 0,
+        created_at REAL,
+        dir_mtime REAL,
+        PRIMARY KEY (root, name)
+    );
+    CREATE TABLE IF NOT EXISTS catalog_images (
+        root TEXT NOT NULL,
+        class_name TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        size INTEGER NOT NULL DEFAULT 0,
+        width INTEGER,
+        height INTEGER,
+        sha256 TEXT,
+        phash TEXT,
+        source_url TEXT,
+        mtime REAL,
+        added_at REAL,
+        PRIMARY KEY (root, class_name, filename)
+    );
+    CREATE INDEX IF NOT EXISTS catalog_images_sha256 ON catalog_images (sha256);
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        # Scans read the disk without holding the database lock; this keeps two rebuilds apart
+        self.rebuild_lock = threading.RLock()
+        with self.lock, self.conn:
+            columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(catalog_classes)')}
+            if 'dir_mtime' not in columns:
+                # Catalogs created before the folder watcher
+                self.conn.execute('ALTER TABLE catalog_classes ADD COLUMN dir_mtime REAL')
+
+    def _ensure_class(self, root: str, name: str):
+        self.conn.execute('INSERT OR IGNORE INTO catalog_classes (root, name, created_at) VALUES (?, ?, ?)',
+                          (root, name, time.time()))
+
+    def _adjust_class(self, root: str, name: str, count: int, size: int):
+        self._ensure_class(root, name)
+        self.conn.execute(
+            """UPDATE catalog_classes SET image_count = image_count + ?, total_bytes = total_bytes + ?
+               WHERE root = ? AND name = ?""",
+            (count, size, root, name)
+        )
+
+    def add_class(self, class_folder: str):
+        """Register an (empty) class folder."""
+        root, name = _split(class_folder)
+        with self.lock, self.conn:
+            self._ensure_class(root, name)
+
+    def remove_class(self, class_folder: str) -> int:
+        """Drop a class folder and its images. Returns how many images were dropped."""
+        root, name = _split(class_folder)
+        with self.lock, self.conn:
+            removed = self.conn.execute('DELETE FROM catalog_images WHERE root = ? AND class_name = ?',
+                                        (root, name)).rowcount
+            self.conn.execute('DELETE FROM catalog_classes WHERE root = ? AND name = ?', (root, name))
+        return removed
+
+    def add_image(self, class_folder: str, filename: str, size: Optional[int] = None,
+                  width: Optional[int] = None, height: Optional[int] = None, sha256: Optional[str] = None,
+                  phash: Optional[int] = None, source_url: Optional[str] = None):
+        """Record an image saved in class_folder (replacing an older record of the same file).
+
+        phash (a 64-bit dHash) is stored as 16 hex digits, since SQLite integers are signed.
+        """
+        root, name = _split(class_folder)
+        file_path = os.path.join(root, name, filename)
+        try:
+            stat = os.stat(file_path)
+            size, mtime = stat.st_size if size is None else size, stat.st_mtime
+        except OSError:
+            size, mtime = size or 0, None
+        if width is None or height is None:
+            width, height = read_dimensions(file_path)
+        if isinstance(phash, int):
+            phash = f'{phash:016x}'
+
+        with self.lock, self.conn:
+            old = self.conn.execute(
+                'SELECT size FROM catalog_images WHERE root = ? AND class_name = ? AND filename = ?',
+                (root, name, filename)).fetchone()
+            self.conn.execute(
+                """INSERT OR REPLACE INTO catalog_images
+                   (root, class_name, filename, size, width, height, sha256, phash, source_url, mtime, added_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (root, name, filename, size, width, height, sha256, phash, source_url, mtime, time.time())
+            )
+            self._adjust_class(root, name, 0 if old else 1, size - (old['size'] if old else 0))
+
+    def remove_image(self, class_folder: str, filename: str) -> bool:
+        """Forget an image. Returns whether it was catalogued."""
+        root, name = _split(class_folder)
+        with self.lock, self.conn:
+            old = self.conn.execute(
+                'SELECT size FROM catalog_images WHERE root = ? AND class_name = ? AND filename = ?',
+                (root, name, filename)).fetchone()
+            if old is None:
+                return False
+            self.conn.execute('DELETE FROM catalog_images WHERE root = ? AND class_name = ? AND filename = ?',
+                              (root, name, filename))
+            self._adjust_class(root, name, -1, -old['size'])
+        return True
+
+    def move_image(self, source_folder: str, dest_folder: str, filename: str):
+        """Move an image's record to another class folder, keeping its hashes and source URL."""
+        with self.lock:
+            row = self.get_image(source_folder, filename)
+            self.remove_image(source_folder, filename)
+            keep = ('width', 'height', 'sha256', 'phash', 'source_url')
+            self.add_image(dest_folder, filename, **({key: row[key] for key in keep} if row else {}))
+
+    def sync_image(self, class_folder: str, filename: str) -> bool:
+        """Bring one file's record in line with the disk (new, changed or gone). Returns whether it changed."""
+        try:
+            stat = os.stat(os.path.join(class_folder, filename))
+        except OSError:
+            return self.remove_image(class_folder, filename)
+        row = self.get_image(class_folder, filename)
+        if row is not None and (row['size'], row['mtime']) == (stat.st_size, stat.st_mtime):
+            return False
+        self.add_image(class_folder, filename)
+        return True
+
+    def get_image(self, class_folder: str, filename: str) -> Optional[Dict[str, Any]]:
+        root, name = _split(class_folder)
+        row = self.query_one('SELECT * FROM catalog_images WHERE root = ? AND class_name = ? AND filename = ?',
+                             (root, name, filename))
+        return dict(row) if row else None
+
+    def get_classes(self, base_path: str) -> List[Dict[str, Any]]:
+        """All class folders under base_path with their image count and size, scanning the root on first use."""
+        root = os.path.abspath(base_path)
+        self.ensure_root(root)
+        rows = self.query('SELECT name, image_count, total_bytes FROM catalog_classes WHERE root = ? ORDER BY name',
+                          (root,))
+        return [dict(row) for row in rows]
+
+    def get_class(self, class_folder: str) -> Optional[Dict[str, Any]]:
+        """Image count and size of one class folder, or None if it does not exist."""
+        root, name = _split(class_folder)
+        row = self.query_one('SELECT name, image_count, total_bytes FROM catalog_classes WHERE root = ? AND name = ?',
+                             (root, name))
+        if row is None:
+            if not os.path.isdir(class_folder):
+                return None
+            # Created outside the app: catalog it now
+            self.scan_class(class_folder)
+            row = self.query_one(
+                'SELECT name, image_count, total_bytes FROM catalog_classes WHERE root = ? AND name = ?', (root, name))
+        return dict(row) if row else None
+
+    def get_images(self, class_folder: str) -> List[Dict[str, Any]]:
+        """Records of the images in a class folder, ordered by file name."""
+        if self.get_class(class_folder) is None:
+            return []
+        root, name = _split(class_folder)
+        rows = self.query(
+            """SELECT filename, size, width, height, sha256, source_url, added_at FROM catalog_images
+               WHERE root = ? AND class_name = ? ORDER BY filename""",
+            (root, name))
+        return [dict(row) for row in rows]
+
+    def get_folder_mtimes(self, base_path: str) -> Dict[str, Optional[float]]:
+        """Modification time of each class folder under base_path as of its last scan (None if never scanned)."""
+        rows = self.query('SELECT name, dir_mtime FROM catalog_classes WHERE root = ?', (os.path.abspath(base_path),))
+        return {row['name']: row['dir_mtime'] for row in rows}
+
+    def scan_class(self, class_folder: str) -> Dict[str, int]:
+        """
+        Reconcile one class folder with the disk.
+
+        Files whose size or modification time changed are re-read (their hashes
+        are cleared), missing ones are dropped and the class totals recounted.
+        Returns the number of added, updated and removed images.
+        """
+        root, name = _split(class_folder)
+        class_folder = os.path.join(root, name)
+        if not os.path.isdir(class_folder):
+            return {'added': 0, 'updated': 0, 'removed': self.remove_class(class_folder)}
+        # Taken before listing, so changes made during the scan still look new to the folder watcher
+        dir_mtime = os.stat(class_folder).st_mtime
+
+        on_disk = {}
+        with os.scandir(class_folder) as entries:
+            for entry in entries:
+                if is_image_file(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    on_disk[entry.name] = (stat.st_size, stat.st_mtime)
+
+        known = {row['filename']: (row['size'], row['mtime']) for row in self.query(
+            'SELECT filename, size, mtime FROM catalog_images WHERE root = ? AND class_name = ?', (root, name))}
+        changed = [filename for filename, info in on_disk.items() if known.get(filename) != info]
+        removed = [filename for filename in known if filename not in on_disk]
+
+        now = time.time()
+        rows = []
+        for filename in changed:
+            size, mtime = on_disk[filename]
+            width, height = read_dimensions(os.path.join(class_folder, filename))
+            rows.append((root, name, filename, size, width, height, mtime, now))
+
+        with self.lock, self.conn:
+            # Images saved while the folder was being listed are not gone
+            removed = [filename for filename in removed if not os.path.exists(os.path.join(class_folder, filename))]
+            self._ensure_class(root, name)
+            self.conn.executemany('DELETE FROM catalog_images WHERE root = ? AND class_name = ? AND filename = ?',
+                                  [(root, name, filename) for filename in removed])
+            self.conn.executemany(
+                """INSERT INTO catalog_images (root, class_name, filename, size, width, height, mtime, added_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(root, class_name, filename) DO UPDATE SET size = excluded.size,
+                       width = excluded.width, height = excluded.height, mtime = excluded.mtime,
+                       sha256 = NULL, phash = NULL""",
+                rows)
+            self.conn.execute(
+                """UPDATE catalog_classes SET
+                       image_count = (SELECT COUNT(*) FROM catalog_images WHERE root = ? AND class_name = ?),
+                       total_bytes = (SELECT COALESCE(SUM(size), 0) FROM catalog_images
+                                      WHERE root = ? AND class_name = ?),
+                       dir_mtime = ?
+                   WHERE root = ? AND name = ?""",
+                (root, name, root, name, dir_mtime, root, name))
+
+        updated = sum(1 for filename in changed if filename in known)
+        return {'added': len(changed) - updated, 'updated': updated, 'removed': len(removed)}
+
+    def ensure_root(self, base_path: str):
+        """Scan base_path once if it has never been catalogued."""
+        root = os.path.abspath(base_path)
+        if self.query_one('SELECT 1 FROM catalog_roots WHERE root = ?', (root,)) is None:
+            with self.rebuild_lock:
+                # Another request may have finished the scan while this one waited
+                if self.query_one('SELECT 1 FROM catalog_roots WHERE root = ?', (root,)) is None:
+                    self.rebuild(root)
+
+    def rebuild(self, base_path: str) -> Dict[str, int]:
+        """Reconcile every class folder under base_path with the disk. Returns the summed scan counts."""
+        root = os.path.abspath(base_path)
+        totals = {'classes': 0, 'added': 0, 'updated': 0, 'removed': 0}
+        with self.rebuild_lock:
+            on_disk = set()
+            if os.path.isdir(root):
+                with os.scandir(root) as entries:
+                    on_disk = {entry.name for entry in entries if entry.is_dir()}
+            known = {row['name'] for row in self.query('SELECT name FROM catalog_classes WHERE root = ?', (root,))}
+
+            for name in sorted(on_disk | known):
+                counts = self.scan_class(os.path.join(root, name))
+                for key, value in counts.items():
+                    totals[key] += value
+            totals['classes'] = len(on_disk)
+            self.execute('INSERT OR REPLACE INTO catalog_roots (root, scanned_at) VALUES (?, ?)', (root, time.time()))
+        return totals
+
+
+_image_catalog = None
+_image_catalog_lock = threading.Lock()
+
+
+def get_image_catalog() -> Optional[ImageCatalog]:
+    """Get the process-wide image catalog, or None when CATALOG_ENABLED is off."""
+    global _image_catalog
+    if not Config.CATALOG_ENABLED:
+        return None
+    with _image_catalog_lock:
+        if _image_catalog is None:
+            _image_catalog = ImageCatalog(Config.IMAGE_INDEX_DB)
+        return _image_catalog
@@ -0,0 +1,184 @@
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from sqlite_store import SQLiteStore
+
+# Terminal URL states; URLs in these states are not fetched again on resume
+ATTEMPTED_URL_STATES = ('downloaded', 'duplicate', 'failed')
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this pid is running on this host."""
+    if os.name == 'nt':
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+class CheckpointStore(SQLiteStore):
+    """
+    Durable record of bulk job progress, used to resume after a crash or restart.
+
+    Three tables are tracked:
+    - jobs: parameters, last known state and the process (pid, host) running it
+    - entries: status of each search entry
+    - urls: every image URL discovered for an entry, and its download outcome
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        title TEXT,
+        params TEXT NOT NULL,
+        state TEXT NOT NULL,
+        created_at REAL,
+        updated_at REAL,
+        owner_pid INTEGER,
+        owner_host TEXT
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        job_id TEXT NOT NULL,
+        entry_index INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        downloaded INTEGER NOT NULL DEFAULT 0,
+        class_folder TEXT,
+        error TEXT,
+        updated_at REAL,
+        PRIMARY KEY (job_id, entry_index)
+    );
+    CREATE TABLE IF NOT EXISTS urls (
+        job_id TEXT NOT NULL,
+        entry_index INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        status TEXT NOT NULL,
+        filename TEXT,
+        updated_at REAL,
+        PRIMARY KEY (job_id, entry_index, url)
+    );
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        with self.lock, self.conn:
+            columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+            if 'owner_pid' not in columns:
+                # Checkpoints created before jobs recorded their owner
+                self.conn.execute('ALTER TABLE jobs ADD COLUMN owner_pid INTEGER')
+                self.conn.execute('ALTER TABLE jobs ADD COLUMN owner_host TEXT')
+
+    def save_job(self, job_id: str, kind: str, title: str, params: Dict[str, Any], state: str):
+        """Create the job record, or update its state if it already exists. The calling process becomes its owner."""
+        now = time.time()
+        self.execute(
+            """INSERT INTO jobs (job_id, kind, title, params, state, created_at, updated_at, owner_pid, owner_host)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(job_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at,
+                   owner_pid = excluded.owner_pid, owner_host = excluded.owner_host""",
+            (job_id, kind, title, json.dumps(params), state, now, now, os.getpid(), socket.gethostname())
+        )
+
+    def set_job_state(self, job_id: str, state: str):
+        self.execute('UPDATE jobs SET state = ?, updated_at = ? WHERE job_id = ?', (state, time.time(), job_id))
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.query_one('SELECT * FROM jobs WHERE job_id = ?', (job_id,))
+        return self._job_dict(row) if row else None
+
+    def list_jobs(self, states: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """List jobs (newest first) with per-job entry and download counts."""
+        sql = """SELECT jobs.*,
+                        (SELECT COUNT(*) FROM entries e WHERE e.job_id = jobs.job_id AND e.status = 'done') AS entries_done,
+                        (SELECT COUNT(*) FROM urls u WHERE u.job_id = jobs.job_id AND u.status = 'downloaded') AS urls_downloaded
+                 FROM jobs"""
+        params: List[Any] = []
+        if states:
+            sql += f" WHERE state IN ({','.join('?' for _ in states)})"
+            params.extend(states)
+        sql += ' ORDER BY created_at DESC'
+
+        jobs = []
+        for row in self.query(sql, params):
+            job = self._job_dict(row)
+            job['entries_done'] = row['entries_done']
+            job['urls_downloaded'] = row['urls_downloaded']
+            jobs.append(job)
+        return jobs
+
+    def mark_interrupted(self) -> int:
+        """
+        Flag jobs left queued/running by a process that is gone as interrupted.
+
+        Jobs whose owner is still running (another WSGI worker, or this
+        process) are left alone, as are jobs owned by another host, since
+        there is no telling whether that process is alive. Jobs saved before
+        owners were recorded count as left behind.
+        """
+        host = socket.gethostname()
+        with self.lock:
+            rows = self.query("SELECT job_id, owner_pid, owner_host FROM jobs WHERE state IN ('queued', 'running')")
+            orphaned = [row['job_id'] for row in rows if row['owner_pid'] is None
+                        or (row['owner_host'] == host and not _process_alive(row['owner_pid']))]
+            now = time.time()
+            return self.executemany(
+                "UPDATE jobs SET state = 'interrupted', updated_at = ? WHERE job_id = ? AND state IN ('queued', 'running')",
+                [(now, job_id) for job_id in orphaned]
+            )
+
+    def delete_job(self, job_id: str):
+        with self.lock, self.conn:
+            for table in ('urls', 'entries', 'jobs'):
+                self.conn.execute(f'DELETE FROM {table} WHERE job_id = ?', (job_id,))
+
+    def record_entry(self, job_id: str, entry_index: int, status: str, downloaded: int = 0,
+                     class_folder: Optional[str] = None, error: Optional[str] = None):
+        self.execute(
+            """INSERT OR REPLACE INTO entries (job_id, entry_index, status, downloaded, class_folder, error, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (job_id, entry_index, status, downloaded, class_folder, error, time.time())
+        )
+
+    def get_entries(self, job_id: str) -> Dict[int, Dict[str, Any]]:
+        rows = self.query('SELECT * FROM entries WHERE job_id = ?', (job_id,))
+        return {row['entry_index']: dict(row) for row in rows}
+
+    def record_url(self, job_id: str, entry_index: int, url: str, status: str, filename: Optional[str] = None):
+        self.execute(
+            """INSERT OR REPLACE INTO urls (job_id, entry_index, url, status, filename, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (job_id, entry_index, url, status, filename, time.time())
+        )
+
+    def attempted_urls(self, job_id: str, entry_index: int) -> Set[str]:
+        """URLs already downloaded or found broken for this entry."""
+        rows = self.query(
+            f"SELECT url FROM urls WHERE job_id = ? AND entry_index = ? AND status IN ({','.join('?' for _ in ATTEMPTED_URL_STATES)})",
+            (job_id, entry_index, *ATTEMPTED_URL_STATES)
+        )
+        return {row['url'] for row in rows}
+
+    def downloaded_count(self, job_id: str, entry_index: int) -> int:
+        row = self.query_one(
+            "SELECT COUNT(*) AS n FROM urls WHERE job_id = ? AND entry_index = ? AND status = 'downloaded'",
+            (job_id, entry_index)
+        )
+        return row['n']
+
+    @staticmethod
+    def _job_dict(row) -> Dict[str, Any]:
+        job = {key: row[key] for key in ('job_id', 'kind', 'title', 'state', 'created_at', 'updated_at')}
+        job['params'] = json.loads(row['params'])
+        return job
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Failure counter for one host that stops requests while the host is down.
+
+    After failure_threshold consecutive failures the circuit opens and allow()
+    refuses requests for cooldown seconds. Then one trial request is let
+    through (half open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.cooldown = float(cooldown)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.open_until = None
+        self.trial_in_flight = False
+        self.trial_started = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self.lock:
+            now = time.monotonic()
+            if self.state == OPEN and now >= self.open_until:
+                self.state = HALF_OPEN
+                self.trial_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            # A trial that never reported back (e.g. its job was cancelled) expires after a cool-down
+            if self.state == HALF_OPEN and (not self.trial_in_flight or now - self.trial_started >= self.cooldown):
+                self.trial_in_flight = True
+                self.trial_started = now
+                return True
+            self.total_rejected += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.total_failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(self.cooldown)
+
+    def trip(self, seconds: float):
+        """Open the circuit for at least the given time (e.g. a long Retry-After)."""
+        with self.lock:
+            self._open(max(seconds, self.cooldown))
+
+    def _open(self, seconds: float):
+        now = time.monotonic()
+        self.state = OPEN
+        self.opened_at = now
+        self.open_until = max(now + seconds, self.open_until or 0)
+        self.trial_in_flight = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(self.open_until - time.monotonic(), 0), 1)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'total_failures': self.total_failures,
+                'rejected_requests': self.total_rejected,
+                'retry_in': retry_in
+            }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide registry of circuit breakers, one per download host."""
+
+    def __init__(self, failure_threshold: int, cooldown: float, enabled: bool = True):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+    def breaker_for_host(self, host: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a host."""
+        host = host.lower()
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.cooldown)
+                self.breakers[host] = breaker
+            return breaker
+
+    def allow(self, url: str) -> bool:
+        if not self.enabled:
+            return True
+        return self.breaker_for_host(urlparse(url).netloc).allow()
+
+    def record_success(self, url: str):
+        if self.enabled:
+            self.breaker_for_host(urlparse(url).netloc).record_success()
+
+    def record_failure(self, url: str):
+        if self.enabled:
+            self.breaker_for_host(urlparse(url).netloc).record_failure()
+
+    def trip(self, url: str, seconds: float):
+        if self.enabled:
+            self.breaker_for_host(urlparse(url).netloc).trip(seconds)
+
+    def reset(self, host: Optional[str] = None) -> int:
+        """Forget the state of one host (or of all hosts). Returns how many breakers were reset."""
+        with self.lock:
+            if host is None:
+                count = len(self.breakers)
+                self.breakers.clear()
+                return count
+            return 1 if self.breakers.pop(host.lower(), None) else 0
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every known host's circuit breaker."""
+        with self.lock:
+            breakers = dict(self.breakers)
+        return {host: breaker.to_dict() for host, breaker in breakers.items()}
+
+
+# Global circuit breakers shared by all downloads in the process
+host_circuit_breakers = CircuitBreakerRegistry(
+    Config.CIRCUIT_FAILURE_THRESHOLD,
+    Config.CIRCUIT_COOLDOWN_SECONDS,
+    Config.CIRCUIT_BREAKER_ENABLED
+)
@@ -7,7 +7,114 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'scraped_images'
     MAX_IMAGES_PER_SEARCH = int(os.environ.get('MAX_IMAGES_PER_SEARCH', 20))
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'bmp'}
+
+    # Download engine
+    DOWNLOAD_WORKERS = int(os.environ.get('DOWNLOAD_WORKERS', 8))
+    DOWNLOAD_MAX_PER_HOST = int(os.environ.get('DOWNLOAD_MAX_PER_HOST', 4))
+    # 'threads' (a worker thread per download) or 'asyncio' (one event loop, needs httpx)
+    DOWNLOAD_ENGINE = os.environ.get('DOWNLOAD_ENGINE', 'threads').lower()
+    # Downloads in flight at once per job with the asyncio engine
+    ASYNC_DOWNLOAD_CONCURRENCY = int(os.environ.get('ASYNC_DOWNLOAD_CONCURRENCY', 64))
+    # HTTP client for searches and downloads: 'requests', or 'httpx' (optional package) for HTTP/2
+    HTTP_CLIENT = os.environ.get('HTTP_CLIENT', 'requests').lower()
+    HTTP2_ENABLED = os.environ.get('HTTP2_ENABLED', 'true').lower() == 'true'
+    # Connection pools: hosts kept alive, and connections per host (default: DOWNLOAD_WORKERS, at least 10)
+    HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 100))
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 0)) or max(DOWNLOAD_WORKERS, 10)
+    # Downloads are buffered in memory and abandoned once they exceed this size
+    MAX_IMAGE_BYTES = int(os.environ.get('MAX_IMAGE_BYTES', 20 * 1024 * 1024))
+    # Smaller images are rejected, from Content-Length or the image header when possible
+    MIN_IMAGE_BYTES = int(os.environ.get('MIN_IMAGE_BYTES', 1024))
+    MIN_IMAGE_WIDTH = int(os.environ.get('MIN_IMAGE_WIDTH', 32))
+    MIN_IMAGE_HEIGHT = int(os.environ.get('MIN_IMAGE_HEIGHT', 32))
+
+    # Per-host rate limiting (requests per second, 0 disables)
+    DOWNLOAD_RATE_PER_HOST = float(os.environ.get('DOWNLOAD_RATE_PER_HOST', 2.0))
+    DOWNLOAD_BURST_PER_HOST = float(os.environ.get('DOWNLOAD_BURST_PER_HOST', 4))
+    HOST_RATE_LIMITS = os.environ.get('HOST_RATE_LIMITS', '')  # e.g. "gstatic.com=8,wikimedia.org=1"
+
+    # Download retries on connection errors, 429 and 5xx (jittered exponential backoff, seconds)
+    DOWNLOAD_MAX_ATTEMPTS = int(os.environ.get('DOWNLOAD_MAX_ATTEMPTS', 3))
+    RETRY_BACKOFF_BASE = float(os.environ.get('RETRY_BACKOFF_BASE', 0.5))
+    RETRY_BACKOFF_MAX = float(os.environ.get('RETRY_BACKOFF_MAX', 10))
+
+    # Per-host circuit breaker: stop downloading from a host after this many consecutive
+    # failures, for the cool-down period in seconds
+    CIRCUIT_BREAKER_ENABLED = os.environ.get('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+    CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get('CIRCUIT_COOLDOWN_SECONDS', 60))
+
+    # Scraping jobs that may run at the same time (others wait in the queue)
+    MAX_CONCURRENT_JOBS = int(os.environ.get('MAX_CONCURRENT_JOBS', 2))
+
+    # Wall-clock limit per job in seconds (0 disables); overdue jobs are cancelled
+    JOB_DEADLINE_SECONDS = float(os.environ.get('JOB_DEADLINE_SECONDS', 0))
+    # Delete the images a job already saved when it is cancelled
+    CANCEL_CLEANUP_PARTIAL = os.environ.get('CANCEL_CLEANUP_PARTIAL', 'false').lower() == 'true'
+
+    # SQLite file with bulk job checkpoints (completed entries, discovered and downloaded URLs)
+    CHECKPOINT_DB = os.environ.get('CHECKPOINT_DB') or os.path.join('instance', 'checkpoints.sqlite3')
+
+    # Persistent index of downloaded image URLs, so repeat runs skip images already on disk
+    URL_INDEX_ENABLED = os.environ.get('URL_INDEX_ENABLED', 'true').lower() == 'true'
+    IMAGE_INDEX_DB = os.environ.get('IMAGE_INDEX_DB') or os.path.join('instance', 'image_index.sqlite3')
+    # Drop downloads whose bytes (SHA-256) match an image already saved in the class
+    # ('class') or anywhere in the image store ('global')
+    CONTENT_DEDUP_ENABLED = os.environ.get('CONTENT_DEDUP_ENABLED', 'true').lower() == 'true'
+    DEDUP_SCOPE = os.environ.get('DEDUP_SCOPE', 'class').lower()
+    # Drop downloads whose perceptual hash (dHash) is within this many bits of an image
+    # already saved in the class (resized or re-encoded copies)
+    NEAR_DUP_ENABLED = os.environ.get('NEAR_DUP_ENABLED', 'true').lower() == 'true'
+    NEAR_DUP_MAX_DISTANCE = int(os.environ.get('NEAR_DUP_MAX_DISTANCE', 4))
+
+    # Catalog of class folders and images (in IMAGE_INDEX_DB) that serves the dashboard and gallery
+    CATALOG_ENABLED = os.environ.get('CATALOG_ENABLED', 'true').lower() == 'true'
+    # Keep the catalog current when files change outside the app: 'watchdog' (inotify, optional
+    # package), 'poll' (class folder mtimes every FOLDER_POLL_INTERVAL seconds) or 'auto'
+    FOLDER_WATCH_ENABLED = os.environ.get('FOLDER_WATCH_ENABLED', 'true').lower() == 'true'
+    FOLDER_WATCH_MODE = os.environ.get('FOLDER_WATCH_MODE', 'auto').lower()
+    FOLDER_POLL_INTERVAL = float(os.environ.get('FOLDER_POLL_INTERVAL', 5))
+
+    # Bulk search: entries are spread across this many worker processes, each with its
+    # own browser (1 keeps the sequential single-browser mode, 0 uses one per CPU core)
+    BULK_WORKER_PROCESSES = int(os.environ.get('BULK_WORKER_PROCESSES', 1))
+
+    # Shared pool of warm headless Chrome instances (0 disables pooling)
+    DRIVER_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+    DRIVER_MAX_AGE = int(os.environ.get('DRIVER_MAX_AGE', 1800))  # seconds
+    DRIVER_MAX_USES = int(os.environ.get('DRIVER_MAX_USES', 50))
+    DRIVER_CHECKOUT_TIMEOUT = int(os.environ.get('DRIVER_CHECKOUT_TIMEOUT', 120))  # seconds
+    DRIVER_POOL_PREWARM = os.environ.get('DRIVER_POOL_PREWARM', 'true').lower() == 'true'
+
+    # Search page waits (seconds); the scroll loop moves on as soon as new thumbnails appear
+    PAGE_LOAD_WAIT_TIMEOUT = float(os.environ.get('PAGE_LOAD_WAIT_TIMEOUT', 10))
+    SCROLL_WAIT_TIMEOUT = float(os.environ.get('SCROLL_WAIT_TIMEOUT', 3))
+
+    # Search backend: 'selenium' drives Chrome, 'http' fetches result pages without a browser
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'selenium').lower()
+    HTTP_SEARCH_URL = os.environ.get('HTTP_SEARCH_URL', 'https://www.google.com/search')
+    HTTP_SEARCH_PAGE_SIZE = int(os.environ.get('HTTP_SEARCH_PAGE_SIZE', 20))
+    HTTP_SEARCH_MAX_PAGES = int(os.environ.get('HTTP_SEARCH_MAX_PAGES', 25))
+
+    # Save original images parsed from the results page instead of thumbnails
+    FULL_RESOLUTION = os.environ.get('FULL_RESOLUTION', 'false').lower() == 'true'
+
+    # Adaptive scroll termination
+    SEARCH_TIME_BUDGET = float(os.environ.get('SEARCH_TIME_BUDGET', 180))  # seconds per query
+    SEARCH_PLATEAU_PASSES = int(os.environ.get('SEARCH_PLATEAU_PASSES', 3))
+    SEARCH_MAX_SCROLL_PASSES = int(os.environ.get('SEARCH_MAX_SCROLL_PASSES', 200))
+
+    # Browser request blocking via the DevTools Protocol
+    BLOCK_BROWSER_RESOURCES = os.environ.get('BLOCK_BROWSER_RESOURCES', 'true').lower() == 'true'
+    BLOCKED_RESOURCE_TYPES = os.environ.get('BLOCKED_RESOURCE_TYPES', 'image,font,media,tracking')
+    BLOCKED_URL_PATTERNS = os.environ.get('BLOCKED_URL_PATTERNS', '')  # comma-separated
+    ALLOWED_URL_PATTERNS = os.environ.get('ALLOWED_URL_PATTERNS', '')  # comma-separated, never blocked
+
+    # ChromeDriver resolution
+    CHROME_DRIVER_PATH = os.environ.get('CHROME_DRIVER_PATH')
+    DRIVER_CACHE_FILE = os.environ.get('DRIVER_CACHE_FILE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'scrapper', 'chromedriver_cache.json')
     
     # Create upload folder if it doesn't exist
     if not os.path.exists(UPLOAD_FOLDER):
@@ -0,0 +1,3 @@
+# Loaded by pytest before any test module: move the index and checkpoint
+# databases into a temporary folder before app or the scraper is imported.
+import testing_helpers  # noqa: F401
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+from webdriver_manager.chrome import ChromeDriverManager
+from config import Config
+from logger import scraping_logger
+
+_cache_lock = threading.Lock()
+
+
+def get_chrome_version() -> Optional[str]:
+    """Detect the installed Chrome version without touching the network."""
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        scraping_logger.debug(f"⚠️ Could not detect Chrome version: {str(e)}")
+        return None
+
+    if not version:
+        return None
+
+    # ChromeDriver releases match Chrome on MAJOR.MINOR.BUILD
+    return '.'.join(version.split('.')[:3])
+
+
+def _load_cache() -> dict:
+    try:
+        with open(Config.DRIVER_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            cache.setdefault('versions', {})
+            return cache
+    except (IOError, ValueError):
+        pass
+    return {'versions': {}, 'last_version': None}
+
+
+def _save_cache(cache: dict):
+    cache_file = Config.DRIVER_CACHE_FILE
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_file, cache_file)
+    except IOError as e:
+        scraping_logger.warning(f"⚠️ Could not write ChromeDriver cache: {str(e)}")
+
+
+def _cached_path(cache: dict, version: Optional[str]) -> Optional[str]:
+    entry = cache['versions'].get(version) if version else None
+    if entry and os.path.exists(entry.get('path', '')):
+        return entry['path']
+    return None
+
+
+def resolve_chromedriver_path(refresh: bool = False) -> str:
+    """Get the ChromeDriver binary path, calling ChromeDriverManager only on a cache miss.
+
+    Resolution order:
+    1. CHROME_DRIVER_PATH from the environment, if it exists
+    2. The cached driver for the detected Chrome version
+    3. The most recently cached driver, when the Chrome version cannot be detected
+    4. ChromeDriverManager().install(), whose result is cached under the Chrome version
+    5. Any cached driver, if the install fails (e.g. no network)
+    """
+    if Config.CHROME_DRIVER_PATH and os.path.exists(Config.CHROME_DRIVER_PATH):
+        scraping_logger.debug(f"✓ Using configured ChromeDriver: {Config.CHROME_DRIVER_PATH}")
+        return Config.CHROME_DRIVER_PATH
+
+    version = get_chrome_version()
+
+    with _cache_lock:
+        cache = _load_cache()
+
+        if not refresh:
+            path = _cached_path(cache, version) or (None if version else _cached_path(cache, cache.get('last_version')))
+            if path:
+                scraping_logger.debug(f"✓ ChromeDriver cache hit (Chrome {version or 'unknown'}): {path}")
+                return path
+
+        scraping_logger.info("📥 Installing/updating ChromeDriver...")
+        try:
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            fallback = _cached_path(cache, cache.get('last_version'))
+            if fallback:
+                scraping_logger.warning(f"⚠️ ChromeDriverManager failed ({str(e)}), using cached driver: {fallback}")
+                return fallback
+            raise
+
+        key = version or 'unknown'
+        cache['versions'][key] = {'path': path, 'resolved_at': time.time()}
+        cache['last_version'] = key
+        _save_cache(cache)
+        scraping_logger.debug(f"✓ Cached ChromeDriver for Chrome {key}: {path}")
+        return path
+
+
+def invalidate_driver_cache(version: Optional[str] = None) -> int:
+    """Drop cached driver paths for one Chrome version, or all of them. Returns the number removed."""
+    with _cache_lock:
+        cache = _load_cache()
+        if version:
+            removed = 1 if cache['versions'].pop(version, None) else 0
+            if cache.get('last_version') == version:
+                cache['last_version'] = None
+        else:
+            removed = len(cache['versions'])
+            cache = {'versions': {}, 'last_version': None}
+        _save_cache(cache)
+
+    scraping_logger.info(f"🗑️ Invalidated {removed} cached ChromeDriver path(s)")
+    return removed
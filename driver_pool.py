@@ -0,0 +1,174 @@
+import threading
+import time
+from typing import Callable, Dict, Any
+from logger import scraping_logger
+
+
+class PooledDriver:
+    """Bookkeeping for a WebDriver instance owned by a DriverPool."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class DriverPool:
+    """Process-level pool of warm WebDriver instances with checkout/return.
+
+    Drivers are created lazily by `factory` up to `size` instances, health
+    checked on checkout and recycled once they exceed `max_age` seconds or
+    `max_uses` checkouts.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_age: float = 1800,
+                 max_uses: int = 50, checkout_timeout: float = 120):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = []
+        self._entries: Dict[int, PooledDriver] = {}
+        self._creating = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'discarded': 0, 'checkouts': 0}
+
+    def _is_expired(self, entry: PooledDriver) -> bool:
+        return ((self.max_age and entry.age > self.max_age) or
+                (self.max_uses and entry.uses >= self.max_uses))
+
+    def _is_healthy(self, entry: PooledDriver) -> bool:
+        """Check that the browser behind a driver still responds."""
+        try:
+            return entry.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _quit(self, entry: PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            scraping_logger.debug(f"⚠️ Error quitting pooled WebDriver: {str(e)}")
+
+    def _retire(self, entry: PooledDriver, reason: str):
+        """Remove a driver from the pool and quit it. Caller must hold the condition."""
+        self._entries.pop(id(entry.driver), None)
+        self._stats[reason] += 1
+        self._condition.notify()
+
+    def checkout(self, timeout: float = None):
+        """Take a healthy driver from the pool, creating one if there is room."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            entry = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise Exception("❌ WebDriver pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if len(self._entries) + self._creating < self.size:
+                        self._creating += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Exception(f"❌ No WebDriver available after {timeout:.0f}s (pool size {self.size})")
+                    self._condition.wait(remaining)
+
+            if entry is None:
+                try:
+                    scraping_logger.info("🌐 Starting new pooled Chrome browser...")
+                    driver = self.factory()
+                except Exception:
+                    with self._condition:
+                        self._creating -= 1
+                        self._condition.notify()
+                    raise
+                entry = PooledDriver(driver)
+                with self._condition:
+                    self._creating -= 1
+                    self._entries[id(driver)] = entry
+                    self._stats['created'] += 1
+            elif self._is_expired(entry) or not self._is_healthy(entry):
+                reason = 'recycled' if self._is_expired(entry) else 'unhealthy'
+                scraping_logger.debug(f"♻️ Replacing {reason} pooled WebDriver")
+                with self._condition:
+                    self._retire(entry, reason)
+                self._quit(entry)
+                continue
+
+            with self._condition:
+                entry.uses += 1
+                self._stats['checkouts'] += 1
+            scraping_logger.debug(f"✓ Checked out pooled WebDriver (use {entry.uses}, age {entry.age:.0f}s)")
+            return entry.driver
+
+    def checkin(self, driver, discard: bool = False):
+        """Return a driver to the pool, or quit it if discarded, expired or the pool is closed."""
+        with self._condition:
+            entry = self._entries.get(id(driver))
+        if entry is None:
+            return
+
+        if not discard and not self._is_expired(entry):
+            # Leave the previous job's page so the browser idles cheaply
+            try:
+                driver.get("about:blank")
+            except Exception:
+                discard = True
+
+        with self._condition:
+            if discard:
+                self._retire(entry, 'discarded')
+            elif self._closed or self._is_expired(entry):
+                self._retire(entry, 'recycled')
+            else:
+                self._idle.append(entry)
+                self._condition.notify()
+                return
+
+        self._quit(entry)
+
+    def warm_up(self, count: int = None):
+        """Start up to `count` drivers ahead of time so the first jobs do not wait."""
+        count = min(count or self.size, self.size)
+        drivers = []
+        try:
+            for _ in range(count):
+                drivers.append(self.checkout())
+        finally:
+            for driver in drivers:
+                self.checkin(driver)
+
+    def close_all(self):
+        """Quit all idle drivers and refuse new checkouts."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for entry in idle:
+                self._entries.pop(id(entry.driver), None)
+            self._condition.notify_all()
+
+        for entry in idle:
+            self._quit(entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and lifecycle counters."""
+        with self._condition:
+            return {
+                'size': self.size,
+                'total': len(self._entries),
+                'idle': len(self._idle),
+                'in_use': len(self._entries) - len(self._idle),
+                **self._stats
+            }
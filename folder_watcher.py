@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import Config
+from logger import scraping_logger
+from catalog import ImageCatalog, get_image_catalog, is_image_file
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process that starts a watcher watches
+    fcntl = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional, the watcher falls back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _CatalogEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events to FolderWatcher.handle_event."""
+
+    def __init__(self, watcher: 'FolderWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        self.watcher.handle_event(event.event_type, event.src_path, getattr(event, 'dest_path', None),
+                                  event.is_directory)
+
+
+class FolderWatcher:
+    """
+    Keeps the image catalog in step with files added or removed outside the app.
+
+    With the optional watchdog package (inotify on Linux) every file event
+    under UPLOAD_FOLDER updates that one image's record, and class folders
+    created, renamed or deleted are scanned or dropped. Without it, the
+    upload folder is polled every interval seconds: a class folder whose
+    modification time differs from the one recorded at its last scan is
+    rescanned, and only that one. Both modes do one such poll on start to
+    pick up changes made while the app was not running.
+    """
+
+    def __init__(self, catalog: ImageCatalog, root: str, interval: float = 5.0, mode: str = 'auto'):
+        self.catalog = catalog
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        if mode == 'auto':
+            mode = 'watchdog' if Observer is not None else 'poll'
+        elif mode == 'watchdog' and Observer is None:
+            scraping_logger.warning("⚠️ FOLDER_WATCH_MODE=watchdog but watchdog is not installed, polling instead")
+            mode = 'poll'
+        elif mode not in ('watchdog', 'poll'):
+            raise ValueError(f"Unknown folder watch mode: {mode}")
+        self.mode = mode
+
+        self.observer = None
+        self.thread = None
+        self._stop = threading.Event()
+        self.stats = {'events': 0, 'polls': 0, 'classes_scanned': 0, 'last_poll': None}
+        self.stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def start(self):
+        """Catch up with the disk, then watch it from a background thread."""
+        os.makedirs(self.root, exist_ok=True)
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name='folder-watcher', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            self.catalog.ensure_root(self.root)
+            if self.mode == 'watchdog':
+                # Watch before catching up, so nothing changed in between is missed
+                self.observer = Observer()
+                self.observer.schedule(_CatalogEventHandler(self), self.root, recursive=True)
+                self.observer.start()
+                self.poll_once()
+                scraping_logger.info(f"👀 Watching {self.root} for changes")
+                return
+
+            self.poll_once()
+            scraping_logger.info(f"👀 Polling {self.root} for changes every {self.interval}s")
+            while not self._stop.wait(self.interval):
+                self.poll_once()
+        except Exception as e:
+            scraping_logger.error(f"❌ Folder watcher stopped: {str(e)}")
+
+    def stop(self):
+        self._stop.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+            self.observer = None
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def poll_once(self) -> int:
+        """Rescan the class folders changed since their last scan. Returns how many were scanned."""
+        known = self.catalog.get_folder_mtimes(self.root)
+        on_disk = {}
+        if os.path.isdir(self.root):
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            on_disk[entry.name] = entry.stat().st_mtime
+                    except OSError:
+                        continue  # deleted while listing
+
+        changed = [name for name, mtime in on_disk.items() if known.get(name) != mtime]
+        for name in changed:
+            counts = self.catalog.scan_class(os.path.join(self.root, name))
+            if any(counts.values()):
+                scraping_logger.info(f"🔄 Catalog updated for '{name}': {counts['added']} added, "
+                                     f"{counts['updated']} changed, {counts['removed']} removed")
+        for name in set(known) - set(on_disk):
+            self.catalog.remove_class(os.path.join(self.root, name))
+            scraping_logger.info(f"🗑️ Class folder '{name}' is gone, removed from the catalog")
+
+        with self.stats_lock:
+            self.stats['polls'] += 1
+            self.stats['classes_scanned'] += len(changed)
+            self.stats['last_poll'] = time.time()
+        return len(changed)
+
+    def _locate(self, path: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        """(class folder, filename) for a path in the upload folder; filename is None for a class folder itself."""
+        if not path:
+            return None
+        relative = os.path.relpath(os.path.abspath(os.fsdecode(path)), self.root)
+        parts = relative.split(os.sep)
+        if relative == '.' or parts[0] == '..' or len(parts) > 2:
+            return None  # the upload folder itself, outside it or nested deeper than class folders
+        return os.path.join(self.root, parts[0]), (parts[1] if len(parts) == 2 else None)
+
+    def handle_event(self, event_type: str, src_path: str, dest_path: Optional[str] = None,
+                     is_directory: bool = False):
+        """Apply one filesystem event to the catalog."""
+        if event_type in ('opened', 'closed_no_write'):
+            return
+        self._count('events')
+        try:
+            for path in (src_path, dest_path):
+                location = self._locate(path)
+                if location is None:
+                    continue
+                class_folder, filename = location
+                if filename is None:
+                    if is_directory and event_type != 'modified':
+                        # Class folder created, deleted or renamed
+                        self.catalog.scan_class(class_folder)
+                elif not is_directory and is_image_file(filename):
+                    self.catalog.sync_image(class_folder, filename)
+        except Exception as e:
+            scraping_logger.error(f"❌ Could not apply {event_type} event for {src_path}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            stats = dict(self.stats)
+        watching = self.observer if self.observer is not None else self.thread
+        return {
+            'mode': self.mode,
+            'root': self.root,
+            'running': watching is not None and watching.is_alive(),
+            'interval': self.interval,
+            **stats
+        }
+
+
+_folder_watcher = None
+_folder_watcher_lock = threading.Lock()
+_watch_lock_file = None  # held open while this process is the server's watcher
+
+
+def get_folder_watcher() -> Optional[FolderWatcher]:
+    """Get the running folder watcher, if one was started."""
+    return _folder_watcher
+
+
+def _claim_watch(catalog: ImageCatalog) -> bool:
+    """Take the lock file next to the catalog, so one process per server (e.g. per WSGI worker pool) watches."""
+    global _watch_lock_file
+    if fcntl is None:
+        return True
+    lock_file = open(catalog.path + '.watcher.lock', 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _watch_lock_file = lock_file
+    return True
+
+
+def start_folder_watcher(root: Optional[str] = None) -> Optional[FolderWatcher]:
+    """
+    Start the folder watcher, unless FOLDER_WATCH_ENABLED or the catalog is off.
+
+    Only one process using the same catalog watches; in the others this
+    returns None.
+    """
+    global _folder_watcher
+    catalog = get_image_catalog()
+    if not Config.FOLDER_WATCH_ENABLED or catalog is None:
+        return None
+    with _folder_watcher_lock:
+        if _folder_watcher is None:
+            if _watch_lock_file is None and not _claim_watch(catalog):
+                scraping_logger.info("👀 Another process is watching the upload folder")
+                return None
+            _folder_watcher = FolderWatcher(catalog, root or Config.UPLOAD_FOLDER,
+                                            Config.FOLDER_POLL_INTERVAL, Config.FOLDER_WATCH_MODE)
+            _folder_watcher.start()
+        return _folder_watcher
@@ -0,0 +1,210 @@
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import Config
+from logger import scraping_logger
+
+try:
+    import httpx
+except ImportError:  # optional, only needed for HTTP_CLIENT=httpx
+    httpx = None
+
+# Sent with every request of a scraper session
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+}
+
+# Extra headers for image downloads
+IMAGE_HEADERS = {
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+}
+
+
+class ConnectionMetrics:
+    """Counts requests and newly opened connections, to show how well connections are reused."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.hosts: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        return self.hosts.setdefault((host or '').lower(), {'requests': 0, 'connections': 0})
+
+    def record_request(self, host: str):
+        with self.lock:
+            self._host(host)['requests'] += 1
+
+    def record_connection(self, host: str):
+        with self.lock:
+            self._host(host)['connections'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals and per-host counts; reuse_ratio is the share of requests that needed no new connection."""
+        with self.lock:
+            hosts = {host: dict(counts) for host, counts in self.hosts.items()}
+        requests_sent = sum(counts['requests'] for counts in hosts.values())
+        connections = sum(counts['connections'] for counts in hosts.values())
+        for counts in hosts.values():
+            counts['reuse_ratio'] = _reuse_ratio(counts['requests'], counts['connections'])
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections,
+            'reuse_ratio': _reuse_ratio(requests_sent, connections),
+            'hosts': hosts
+        }
+
+
+def _reuse_ratio(requests_sent: int, connections: int) -> Optional[float]:
+    if not requests_sent:
+        return None
+    return round(max(requests_sent - connections, 0) / requests_sent, 3)
+
+
+# Global metrics for all scraper sessions in the process
+connection_metrics = ConnectionMetrics()
+
+
+class _MeteredHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        connection_metrics.record_connection(self.host)
+        return super()._new_conn()
+
+
+class _MeteredHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        connection_metrics.record_connection(self.host)
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that reports requests and new connections to connection_metrics."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _MeteredHTTPConnectionPool,
+            'https': _MeteredHTTPSConnectionPool
+        }
+
+    def send(self, request, **kwargs):
+        connection_metrics.record_request(urlparse(request.url).hostname)
+        return super().send(request, **kwargs)
+
+
+def record_httpx_response(host: str, response, streams: weakref.WeakSet):
+    """Report an httpx response to connection_metrics; streams holds the connections already counted."""
+    connection_metrics.record_request(host)
+    network_stream = response.extensions.get('network_stream')
+    if network_stream is not None and network_stream not in streams:
+        streams.add(network_stream)
+        connection_metrics.record_connection(host)
+
+
+class HttpxResponse:
+    """The parts of requests.Response the scraper uses, on top of an httpx response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    def iter_content(self, chunk_size: int = 8192):
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._response.close()
+
+
+class HttpxSession:
+    """
+    requests.Session stand-in backed by httpx.Client, which can speak HTTP/2.
+
+    Only get() is provided, with the arguments the scraper passes. httpx errors
+    are re-raised as the matching requests exceptions so the download error
+    handling and retries work unchanged.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int, http2: bool = True):
+        limits = httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                              max_keepalive_connections=pool_connections)
+        try:
+            self.client = httpx.Client(http2=http2, headers=DEFAULT_HEADERS, limits=limits, follow_redirects=True)
+        except ImportError:
+            scraping_logger.warning("⚠️ HTTP/2 needs the 'h2' package (pip install httpx[http2]), using HTTP/1.1")
+            self.client = httpx.Client(headers=DEFAULT_HEADERS, limits=limits, follow_redirects=True)
+        self.headers = self.client.headers
+        self._streams = weakref.WeakSet()
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        host = urlparse(url).hostname
+        try:
+            request = self.client.build_request('GET', url, params=params, headers=headers, timeout=timeout)
+            response = self.client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        record_httpx_response(host, response, self._streams)
+        return HttpxResponse(response)
+
+    def close(self):
+        self.client.close()
+
+
+def create_session(client: Optional[str] = None):
+    """
+    Create the HTTP session for a scraper.
+
+    client is 'requests' (default, see HTTP_CLIENT) for a requests.Session with
+    pools sized by HTTP_POOL_CONNECTIONS (hosts kept) and HTTP_POOL_MAXSIZE
+    (connections per host), or 'httpx' for an HttpxSession with HTTP/2 when
+    HTTP2_ENABLED. Both send DEFAULT_HEADERS with every request.
+    """
+    client = (client or Config.HTTP_CLIENT).lower()
+    if client == 'httpx':
+        if httpx is not None:
+            return HttpxSession(Config.HTTP_POOL_CONNECTIONS, Config.HTTP_POOL_MAXSIZE, Config.HTTP2_ENABLED)
+        scraping_logger.warning("⚠️ HTTP_CLIENT=httpx but httpx is not installed, using requests")
+    elif client != 'requests':
+        raise ValueError(f"Unknown HTTP client: {client}")
+
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                                pool_maxsize=Config.HTTP_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
@@ -0,0 +1,89 @@
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+import requests
+from config import Config
+from logger import scraping_logger
+from page_parser import extract_full_res_images, extract_thumbnail_images
+from rate_limiter import host_rate_limiter
+from cancellation import CancellationToken, check_cancelled
+
+
+class HttpSearchBackend:
+    """Selenium-free Google Images search over plain HTTP.
+
+    Fetches paginated result pages with a requests.Session and parses image
+    URLs out of the HTML and its embedded script data.
+    """
+
+    def __init__(self, session: requests.Session, base_url: str = None, page_size: int = None,
+                 max_pages: int = None):
+        self.session = session
+        self.base_url = base_url or Config.HTTP_SEARCH_URL
+        self.page_size = page_size or Config.HTTP_SEARCH_PAGE_SIZE
+        self.max_pages = max_pages or Config.HTTP_SEARCH_MAX_PAGES
+
+    def fetch_page(self, query: str, page: int, cancel_token: Optional[CancellationToken] = None) -> Optional[str]:
+        """Fetch one page of results. Returns the HTML, or None if the request failed."""
+        params = {
+            'q': query,
+            'tbm': 'isch',
+            'hl': 'en',
+            'start': page * self.page_size,
+            'ijn': page
+        }
+
+        host_rate_limiter.acquire(self.base_url, cancel_token)
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=15)
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            scraping_logger.error(f"🌐 Error fetching results page {page + 1}: {str(e)}")
+            return None
+
+    def parse_page(self, html: str, full_resolution: bool = False) -> List[Dict]:
+        """Get candidate images from a results page."""
+        if full_resolution:
+            return extract_full_res_images(html)
+        return extract_thumbnail_images(html)
+
+    def iter_image_urls(self, query: str, max_images: int, time_budget: float, full_resolution: bool = False,
+                        is_valid: Callable[[str], bool] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield unique image URLs page by page until the target, a yield plateau or the time budget is reached."""
+        deadline = time.monotonic() + time_budget
+        image_urls = set()
+        stale_pages = 0
+
+        scraping_logger.info(f"🔍 Starting HTTP image search for: '{query}'")
+        scraping_logger.debug(f"✓ Target images: {max_images}, mode: {'full resolution' if full_resolution else 'thumbnails'}")
+
+        for page in range(self.max_pages):
+            check_cancelled(cancel_token)
+            if len(image_urls) >= max_images:
+                break
+            if time.monotonic() >= deadline:
+                scraping_logger.warning(f"⏰ Search time budget of {time_budget:g}s used up")
+                break
+
+            html = self.fetch_page(query, page, cancel_token)
+            if html is None:
+                break
+
+            new_on_page = 0
+            for candidate in self.parse_page(html, full_resolution):
+                if len(image_urls) >= max_images:
+                    break
+
+                img_url = candidate.get('url')
+                if img_url and img_url not in image_urls and (is_valid is None or is_valid(img_url)):
+                    image_urls.add(img_url)
+                    new_on_page += 1
+                    yield img_url
+
+            scraping_logger.info(f"📊 Page {page + 1}: {len(image_urls)}/{max_images} images (+{new_on_page})")
+
+            stale_pages = 0 if new_on_page else stale_pages + 1
+            if stale_pages >= Config.SEARCH_PLATEAU_PASSES:
+                scraping_logger.info(f"🛑 No new images in {stale_pages} pages, stopping search")
+                break
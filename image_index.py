@@ -0,0 +1,253 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import Config
+from sqlite_store import SQLiteStore
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def file_sha256(file_path: str, chunk_size: int = 65536) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UrlIndex(SQLiteStore):
+    """
+    Persistent record of which URLs were already downloaded into which class folder.
+
+    scrape_images looks URLs up here before fetching them, so repeat runs of a
+    query skip known images without a network request. Records whose file has
+    since been deleted or moved are dropped on lookup.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS url_index (
+        url_hash TEXT NOT NULL,
+        class_folder TEXT NOT NULL,
+        url TEXT NOT NULL,
+        class_name TEXT,
+        filename TEXT NOT NULL,
+        size INTEGER,
+        fetched_at REAL,
+        PRIMARY KEY (url_hash, class_folder)
+    );
+    """
+
+    def lookup(self, url: str, class_folder: str) -> Optional[Dict[str, Any]]:
+        """Get the record for a URL saved in class_folder, if its file still exists."""
+        key = (url_hash(url), os.path.abspath(class_folder))
+        row = self.query_one('SELECT * FROM url_index WHERE url_hash = ? AND class_folder = ?', key)
+        if row is None:
+            return None
+
+        if not os.path.exists(os.path.join(row['class_folder'], row['filename'])):
+            self.execute('DELETE FROM url_index WHERE url_hash = ? AND class_folder = ?', key)
+            return None
+        return dict(row)
+
+    def record(self, url: str, class_folder: str, filename: str, class_name: Optional[str] = None,
+               size: Optional[int] = None):
+        class_folder = os.path.abspath(class_folder)
+        if size is None:
+            file_path = os.path.join(class_folder, filename)
+            size = os.path.getsize(file_path) if os.path.exists(file_path) else None
+
+        self.execute(
+            """INSERT OR REPLACE INTO url_index (url_hash, class_folder, url, class_name, filename, size, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (url_hash(url), class_folder, url, class_name, filename, size, time.time())
+        )
+
+    def forget(self, url: str, class_folder: Optional[str] = None) -> int:
+        """Drop a URL from the index (for one class folder, or everywhere)."""
+        if class_folder is None:
+            return self.execute('DELETE FROM url_index WHERE url_hash = ?', (url_hash(url),))
+        return self.execute('DELETE FROM url_index WHERE url_hash = ? AND class_folder = ?',
+                            (url_hash(url), os.path.abspath(class_folder)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Number of indexed URLs and bytes, overall and per class."""
+        rows = self.query("""SELECT class_name, COUNT(*) AS urls, COALESCE(SUM(size), 0) AS bytes
+                             FROM url_index GROUP BY class_name ORDER BY class_name""")
+        classes = {row['class_name']: {'urls': row['urls'], 'bytes': row['bytes']} for row in rows}
+        return {
+            'urls': sum(c['urls'] for c in classes.values()),
+            'bytes': sum(c['bytes'] for c in classes.values()),
+            'classes': classes
+        }
+
+
+class ContentIndex(SQLiteStore):
+    """
+    SHA-256 digests of the saved images, used to drop byte-identical duplicates.
+
+    download_image hashes the body while streaming it into memory, and the
+    commit step asks find() whether the same bytes are already stored (in the
+    class folder, or anywhere with DEDUP_SCOPE=global) before writing the
+    buffer to disk, so duplicates are never written. Dropped duplicates are
+    counted per class for the dedup report.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS content_index (
+        class_folder TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        sha256 TEXT NOT NULL,
+        class_name TEXT,
+        size INTEGER,
+        url TEXT,
+        added_at REAL,
+        PRIMARY KEY (class_folder, filename)
+    );
+    CREATE INDEX IF NOT EXISTS content_index_sha256 ON content_index (sha256);
+    CREATE TABLE IF NOT EXISTS content_duplicates (
+        class_folder TEXT PRIMARY KEY,
+        class_name TEXT,
+        dropped INTEGER NOT NULL DEFAULT 0,
+        bytes_saved INTEGER NOT NULL DEFAULT 0
+    );
+    """
+
+    def find(self, digest: str, class_folder: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a saved image with this digest (in class_folder, or in any folder when None)."""
+        with self.lock:
+            if class_folder is None:
+                rows = self.query('SELECT * FROM content_index WHERE sha256 = ?', (digest,))
+            else:
+                rows = self.query('SELECT * FROM content_index WHERE sha256 = ? AND class_folder = ?',
+                                  (digest, os.path.abspath(class_folder)))
+            for row in rows:
+                if os.path.exists(os.path.join(row['class_folder'], row['filename'])):
+                    return dict(row)
+                self.forget(row['class_folder'], row['filename'])
+            return None
+
+    def add(self, digest: str, class_folder: str, filename: str, class_name: Optional[str] = None,
+            size: Optional[int] = None, url: Optional[str] = None):
+        self.execute(
+            """INSERT OR REPLACE INTO content_index (class_folder, filename, sha256, class_name, size, url, added_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (os.path.abspath(class_folder), filename, digest, class_name, size, url, time.time())
+        )
+
+    def forget(self, class_folder: str, filename: str) -> int:
+        return self.execute('DELETE FROM content_index WHERE class_folder = ? AND filename = ?',
+                            (os.path.abspath(class_folder), filename))
+
+    def record_duplicate(self, class_folder: str, class_name: Optional[str], size: int):
+        """Count a downloaded image that was dropped as a duplicate."""
+        self.execute(
+            """INSERT INTO content_duplicates (class_folder, class_name, dropped, bytes_saved) VALUES (?, ?, 1, ?)
+               ON CONFLICT(class_folder) DO UPDATE SET dropped = dropped + 1, bytes_saved = bytes_saved + excluded.bytes_saved""",
+            (os.path.abspath(class_folder), class_name, size)
+        )
+
+    def index_folder(self, class_folder: str, class_name: Optional[str] = None) -> int:
+        """Hash images in class_folder that are not indexed yet (e.g. saved before dedup). Returns how many."""
+        class_folder = os.path.abspath(class_folder)
+        if not os.path.isdir(class_folder):
+            return 0
+
+        known = {row['filename'] for row in self.query(
+            'SELECT filename FROM content_index WHERE class_folder = ?', (class_folder,))}
+        rows = []
+        for filename in sorted(os.listdir(class_folder)):
+            file_path = os.path.join(class_folder, filename)
+            if filename in known or not os.path.isfile(file_path):
+                continue
+            if os.path.splitext(filename)[1].lower().lstrip('.') not in Config.ALLOWED_EXTENSIONS:
+                continue
+            rows.append((class_folder, filename, file_sha256(file_path), class_name,
+                         os.path.getsize(file_path), None, time.time()))
+
+        self.executemany(
+            """INSERT OR REPLACE INTO content_index (class_folder, filename, sha256, class_name, size, url, added_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows
+        )
+        return len(rows)
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Per-class and global duplicate statistics.
+
+        For each class: indexed files, distinct digests, files that repeat another
+        file of the class, and duplicates dropped at download time. Globally, the
+        same plus the digests stored in more than one class.
+        """
+        with self.lock:
+            class_rows = self.query(
+                """SELECT class_folder, MAX(class_name) AS class_name, COUNT(*) AS files,
+                          COUNT(DISTINCT sha256) AS unique_images, COALESCE(SUM(size), 0) AS bytes
+                   FROM content_index GROUP BY class_folder ORDER BY class_name""")
+            dropped_rows = self.query('SELECT * FROM content_duplicates')
+            totals = self.query_one(
+                """SELECT COUNT(*) AS files, COUNT(DISTINCT sha256) AS unique_images
+                   FROM content_index""")
+            cross_rows = self.query(
+                """SELECT sha256, GROUP_CONCAT(class_folder || '/' || filename, '\n') AS files
+                   FROM content_index GROUP BY sha256 HAVING COUNT(DISTINCT class_folder) > 1""")
+
+        dropped = {row['class_folder']: row for row in dropped_rows}
+        classes = {}
+        for row in class_rows:
+            drop = dropped.get(row['class_folder'])
+            name = row['class_name'] or os.path.basename(row['class_folder'])
+            classes[name] = {
+                'folder': row['class_folder'],
+                'files': row['files'],
+                'unique': row['unique_images'],
+                'duplicate_files': row['files'] - row['unique_images'],
+                'bytes': row['bytes'],
+                'dropped': drop['dropped'] if drop else 0,
+                'bytes_saved': drop['bytes_saved'] if drop else 0
+            }
+
+        return {
+            'global': {
+                'files': totals['files'],
+                'unique': totals['unique_images'],
+                'duplicate_files': totals['files'] - totals['unique_images'],
+                'dropped': sum(row['dropped'] for row in dropped_rows),
+                'bytes_saved': sum(row['bytes_saved'] for row in dropped_rows),
+                'cross_class': [{'sha256': row['sha256'], 'files': row['files'].split('\n')}
+                                for row in cross_rows]
+            },
+            'classes': classes
+        }
+
+
+_url_index = None
+_content_index = None
+_url_index_lock = threading.Lock()
+
+
+def get_url_index() -> Optional[UrlIndex]:
+    """Get the process-wide URL index, or None when URL_INDEX_ENABLED is off."""
+    global _url_index
+    if not Config.URL_INDEX_ENABLED:
+        return None
+    with _url_index_lock:
+        if _url_index is None:
+            _url_index = UrlIndex(Config.IMAGE_INDEX_DB)
+        return _url_index
+
+
+def get_content_index() -> Optional[ContentIndex]:
+    """Get the process-wide content-hash index, or None when CONTENT_DEDUP_ENABLED is off."""
+    global _content_index
+    if not Config.CONTENT_DEDUP_ENABLED:
+        return None
+    with _url_index_lock:
+        if _content_index is None:
+            _content_index = ContentIndex(Config.IMAGE_INDEX_DB)
+        return _content_index
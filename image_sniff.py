@@ -0,0 +1,149 @@
+import hashlib
+import io
+from typing import Mapping, Optional, Tuple
+
+from PIL import ImageFile
+
+from config import Config
+
+# Leading bytes of the image formats we keep, and the extension to save them with
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+    (b'BM', '.bmp'),
+]
+
+# Enough leading bytes to tell all of the above (and RIFF....WEBP) apart
+SNIFF_BYTES = 12
+
+# Content types that may carry an image; the file signature is checked either way
+GENERIC_CONTENT_TYPES = ('image/', 'application/octet-stream', 'binary/octet-stream')
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Get the file extension for the image format in the first bytes of a file, or None if it is not one."""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+class ImageHeaderProbe:
+    """
+    Looks at the first chunks of a download to reject it before the rest arrives.
+
+    check() is called with every chunk. It returns a reason to abandon the
+    download as soon as the leading bytes are not a known image format or
+    the header gives dimensions under the minimum; otherwise None. Once the
+    dimensions are known (or max_header_bytes have been seen) it stops
+    parsing and the remaining chunks pass through untouched.
+    """
+
+    def __init__(self, min_width: int = 0, min_height: int = 0, max_header_bytes: int = 128 * 1024):
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_header_bytes = max_header_bytes
+        self.head = b''
+        self.kind = None  # file extension, once sniffed
+        self.size = None  # (width, height), once parsed
+        self.received = 0
+        self._parser = ImageFile.Parser()
+
+    def check(self, chunk: bytes) -> Optional[str]:
+        self.received += len(chunk)
+
+        if self.kind is None:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.kind = sniff_image_type(self.head)
+                if self.kind is None:
+                    return 'not an image (unknown file signature)'
+
+        if self._parser is not None:
+            try:
+                self._parser.feed(chunk)
+            except Exception:
+                # Leave it to the full validation once the body is in
+                self._parser = None
+                return None
+
+            if self._parser.image is not None:
+                self.size = self._parser.image.size
+                self._parser = None
+                return dimensions_problem(self.size, self.min_width, self.min_height)
+            elif self.received >= self.max_header_bytes:
+                self._parser = None
+        return None
+
+    def finish(self) -> Optional[str]:
+        """Check for the end of the body: bodies too short to sniff are rejected."""
+        if self.kind is None:
+            return 'not an image (unknown file signature)'
+        return None
+
+
+def content_length_problem(header: Optional[str], min_bytes: int, max_bytes: int) -> Optional[str]:
+    """Reason to skip a body from its Content-Length header without reading it, or None."""
+    try:
+        length = int(header)
+    except (TypeError, ValueError):
+        return None
+    if length < min_bytes:
+        return f'too small ({length} bytes)'
+    if length > max_bytes:
+        return f'too large ({length} bytes)'
+    return None
+
+
+def dimensions_problem(size: Tuple[int, int], min_width: int, min_height: int) -> Optional[str]:
+    width, height = size
+    if width < min_width or height < min_height:
+        return f'resolution too low ({width}x{height})'
+    return None
+
+
+def response_problem(headers: Mapping[str, str]) -> Optional[str]:
+    """Reason to skip a response from its headers alone (content type, Content-Length), or None."""
+    content_type = headers.get('content-type', '').lower()
+    if content_type and not content_type.startswith(GENERIC_CONTENT_TYPES):
+        return f'is not image data ({content_type})'
+
+    if headers.get('content-encoding', 'identity').lower() == 'identity':
+        return content_length_problem(headers.get('content-length'), Config.MIN_IMAGE_BYTES, Config.MAX_IMAGE_BYTES)
+    return None
+
+
+class DownloadBuffer:
+    """
+    In-memory body of a download, checked and hashed chunk by chunk.
+
+    feed() returns a reason to abandon the download as soon as the header
+    probe rejects it or the body grows past MAX_IMAGE_BYTES. Shared by the
+    thread and asyncio download engines.
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.sha256 = hashlib.sha256()
+        self.probe = ImageHeaderProbe(Config.MIN_IMAGE_WIDTH, Config.MIN_IMAGE_HEIGHT)
+
+    @property
+    def size(self) -> int:
+        return self.buffer.tell()
+
+    def feed(self, chunk: bytes) -> Optional[str]:
+        if not chunk:
+            return None
+        self.sha256.update(chunk)
+        self.buffer.write(chunk)
+        problem = self.probe.check(chunk)
+        if problem is None and self.size > Config.MAX_IMAGE_BYTES:
+            problem = f'larger than {Config.MAX_IMAGE_BYTES} bytes'
+        return problem
+
+    def getvalue(self) -> bytes:
+        return self.buffer.getvalue()
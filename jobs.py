@@ -0,0 +1,235 @@
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from logger import scraping_logger
+from cancellation import CancellationToken, JobCancelled
+
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+
+class Job:
+    """A unit of scraping work with its own state, progress and results."""
+
+    def __init__(self, kind: str, title: str, params: Dict[str, Any], job_id: Optional[str] = None,
+                 deadline_seconds: Optional[float] = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.title = title
+        self.params = params
+        self.state = 'queued'
+        self.progress = ''
+        self.error = None
+        self.result: Dict[str, Any] = {}
+        self.entries: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.deadline_seconds = deadline_seconds
+        self.token = CancellationToken()
+        self.sequence = 0
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True once the job was cancelled or ran past its deadline."""
+        return self.token.cancelled
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def set_progress(self, message: str):
+        self.progress = message
+
+    def to_dict(self, include_entries: bool = True) -> Dict[str, Any]:
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'title': self.title,
+            'state': self.state,
+            'progress': self.progress,
+            'error': self.error,
+            'result': self.result,
+            'params': self.params,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'deadline': self.token.deadline,
+            'cancel_requested': self.token.event.is_set(),
+            'cancel_reason': self.token.reason
+        }
+        if include_entries:
+            data['entries'] = self.entries
+        return data
+
+
+class JobManager:
+    """
+    Runs submitted jobs on background threads, at most max_concurrent at a time.
+
+    Jobs beyond the limit wait in a FIFO queue. Finished jobs are kept (up to
+    max_history) so their progress and results can still be inspected.
+
+    Each job carries a CancellationToken (job.token) that targets pass down to
+    the scraper. cancel() sets it, and so does the job's wall-clock deadline
+    (default_deadline seconds after it starts unless the job sets its own).
+    """
+
+    def __init__(self, max_concurrent: int = 1, max_history: int = 100, default_deadline: Optional[float] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_history = max_history
+        self.default_deadline = default_deadline
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self.pending: deque = deque()
+        self.running = set()
+        self.targets: Dict[str, Callable[[Job], None]] = {}
+        self.listeners: List[Callable[[Job], None]] = []
+        self.lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def add_listener(self, listener: Callable[[Job], None]):
+        """Call listener(job) whenever a job starts running or finishes."""
+        self.listeners.append(listener)
+
+    def _notify(self, job: Job):
+        for listener in self.listeners:
+            try:
+                listener(job)
+            except Exception as e:
+                scraping_logger.error(f"❌ Job listener failed for {job.id}: {str(e)}")
+
+    def submit(self, kind: str, title: str, target: Callable[[Job], None],
+               params: Optional[Dict[str, Any]] = None, job_id: Optional[str] = None,
+               deadline_seconds: Optional[float] = None) -> Job:
+        """Queue target(job) to run in the background and return the new job.
+
+        Passing the job_id of a finished job replaces it (used to resume jobs).
+        deadline_seconds overrides the manager's default deadline (0 disables it).
+        """
+        if deadline_seconds is None:
+            deadline_seconds = self.default_deadline
+        job = Job(kind, title, params or {}, job_id=job_id, deadline_seconds=deadline_seconds)
+        with self.lock:
+            existing = self.jobs.get(job.id)
+            if existing is not None and not existing.is_finished:
+                raise ValueError(f'Job {job.id} is still {existing.state}')
+            self.jobs.pop(job.id, None)
+            self.jobs[job.id] = job
+            self.targets[job.id] = target
+            self.pending.append(job.id)
+            self._prune_history()
+        scraping_logger.info(f"📥 Queued {kind} job {job.id}: {title}")
+        self._start_pending()
+        return job
+
+    def _start_pending(self):
+        to_start = []
+        with self.lock:
+            while self.pending and len(self.running) < self.max_concurrent:
+                job = self.jobs[self.pending.popleft()]
+                job.state = 'running'
+                job.started_at = time.time()
+                job.token.set_deadline(job.deadline_seconds)
+                job.sequence = next(self._sequence)
+                self.running.add(job.id)
+                to_start.append((job, self.targets.pop(job.id)))
+
+        for job, target in to_start:
+            self._notify(job)
+            thread = threading.Thread(target=self._run, args=(job, target), name=f'job-{job.id}')
+            thread.daemon = True
+            thread.start()
+
+    def _run(self, job: Job, target: Callable[[Job], None]):
+        try:
+            target(job)
+            # A deadline that passed unnoticed after the work finished does not count
+            job.state = 'cancelled' if job.token.event.is_set() else 'done'
+        except JobCancelled as e:
+            job.error = str(e)
+            job.state = 'cancelled'
+            scraping_logger.warning(f"🛑 Job {job.id} stopped: {str(e)}")
+        except Exception as e:
+            job.error = str(e)
+            job.state = 'cancelled' if job.token.event.is_set() else 'failed'
+            scraping_logger.error(f"💥 Job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            with self.lock:
+                self.running.discard(job.id)
+            self._notify(job)
+            self._start_pending()
+
+    def _prune_history(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_history)]:
+            del self.jobs[job_id]
+
+    def cancel(self, job_id: str, reason: str = 'Cancelled by user') -> Optional[Job]:
+        """Cancel a queued job, or signal a running job to stop. Returns None for unknown IDs."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.is_finished:
+                return job
+
+            job.token.cancel(reason)
+            if job.state == 'queued':
+                self.pending.remove(job_id)
+                self.targets.pop(job_id, None)
+                job.state = 'cancelled'
+                job.finished_at = time.time()
+
+        scraping_logger.warning(f"🛑 Cancellation requested for job {job_id}")
+        if job.state == 'cancelled':
+            self._notify(job)
+        return job
+
+    def cancel_all(self, reason: str = 'Cancelled by user') -> int:
+        """Cancel every queued and running job. Returns how many were affected."""
+        with self.lock:
+            active = [job_id for job_id, job in self.jobs.items() if not job.is_finished]
+        for job_id in active:
+            self.cancel(job_id, reason)
+        return len(active)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self, state: Optional[str] = None) -> List[Job]:
+        with self.lock:
+            jobs = list(self.jobs.values())
+        if state:
+            jobs = [job for job in jobs if job.state == state]
+        return jobs
+
+    def running_count(self) -> int:
+        with self.lock:
+            return len(self.running)
+
+    def queued_count(self) -> int:
+        with self.lock:
+            return len(self.pending)
+
+    def latest_job(self) -> Optional[Job]:
+        """The most recently started running job, else the most recently started job overall."""
+        with self.lock:
+            started = [job for job in self.jobs.values() if job.started_at is not None]
+        if not started:
+            return None
+        running = [job for job in started if job.state == 'running']
+        return max(running or started, key=lambda job: job.sequence)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self.jobs.values():
+                counts[job.state] += 1
+        counts['max_concurrent'] = self.max_concurrent
+        return counts
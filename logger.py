@@ -11,6 +11,7 @@ class ScrapingLogger:
     def __init__(self):
         self.log_queue = queue.Queue()
         self.log_history = []
+        self.listeners = []
         self.lock = threading.Lock()
         
         # Setup console logger
@@ -53,6 +54,13 @@ class ScrapingLogger:
         with self.lock:
             self.log_history.append(log_entry)
             self.log_queue.put(log_entry)
+            listeners = list(self.listeners)
+
+        for listener in listeners:
+            try:
+                listener(log_entry)
+            except Exception:
+                pass
         
         # Also log to standard logger
         log_method = getattr(self.logger, level.lower(), self.logger.info)
@@ -78,6 +86,11 @@ class ScrapingLogger:
         """Log success message (custom level)."""
         self.log('SUCCESS', message, kwargs)
     
+    def add_listener(self, listener):
+        """Call listener(log_entry) for every new log entry (e.g. to forward logs from a worker process)."""
+        with self.lock:
+            self.listeners.append(listener)
+
     def get_logs(self) -> List[Dict[str, Any]]:
         """Get all log history."""
         with self.lock:
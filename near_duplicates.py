@@ -0,0 +1,245 @@
+import io
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config import Config
+from sqlite_store import SQLiteStore
+
+HASH_SIZE = 8  # 8x8 comparisons -> 64-bit hashes
+
+# Number of set bits for every byte value, used to popcount whole arrays at once
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    Difference hash of an image as a 64-bit int.
+
+    The image is shrunk to 9x8 grayscale and each bit records whether a pixel
+    is brighter than its right neighbour, so resized or re-encoded copies get
+    the same or a very close hash. JPEGs are decoded straight to grayscale
+    at the smallest scale that still covers 9x8, which skips most of the work.
+    """
+    image.draft('L', (HASH_SIZE + 1, HASH_SIZE))
+    small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def dhash_file(file_path: str) -> Optional[int]:
+    """dhash() of an image file, or None if it cannot be read."""
+    try:
+        with Image.open(file_path) as image:
+            return dhash(image)
+    except Exception:
+        return None
+
+
+def dhash_bytes(data: bytes) -> Optional[int]:
+    """dhash() of encoded image data, or None if it cannot be decoded."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return dhash(image)
+    except Exception:
+        return None
+
+
+def hamming_distances(hashes: np.ndarray, value: int) -> np.ndarray:
+    """Bit distance between every uint64 in hashes and value."""
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    return _POPCOUNT[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateIndex(SQLiteStore):
+    """
+    Perceptual hashes of saved images, searchable by Hamming distance.
+
+    Hashes are persisted in SQLite and kept in memory as one uint64 NumPy
+    array per class folder, so checking a new download or clustering a class
+    compares against all of its images with array operations instead of
+    Python loops. Each cached class remembers its row count and newest
+    added_at and is reloaded when they change, so hashes saved by other
+    processes (bulk workers) are seen too.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS perceptual_hashes (
+        class_folder TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        dhash INTEGER NOT NULL,
+        added_at REAL,
+        PRIMARY KEY (class_folder, filename)
+    );
+    """
+
+    # Compare this many rows at a time when clustering (keeps memory at rows * n * 8 bytes)
+    CLUSTER_BLOCK_SIZE = 512
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._folders = {}  # class_folder -> (filenames, uint64 array, version)
+
+    def _version(self, class_folder: str) -> Tuple[int, float]:
+        """Row count and newest added_at of a class; any process adding or removing its hashes changes them."""
+        row = self.query_one('SELECT COUNT(*), MAX(added_at) FROM perceptual_hashes WHERE class_folder = ?',
+                             (class_folder,))
+        return row[0], row[1] or 0.0
+
+    def _load(self, class_folder: str) -> Tuple[List[str], np.ndarray]:
+        with self.lock:
+            version = self._version(class_folder)
+            folder = self._folders.get(class_folder)
+            if folder is None or folder[2] != version:
+                rows = self.query('SELECT filename, dhash FROM perceptual_hashes WHERE class_folder = ? ORDER BY rowid',
+                                  (class_folder,))
+                filenames = [row['filename'] for row in rows]
+                hashes = np.array([_to_unsigned(row['dhash']) for row in rows], dtype=np.uint64)
+                folder = self._folders[class_folder] = (filenames, hashes, version)
+            return folder[0], folder[1]
+
+    def add(self, class_folder: str, filename: str, value: int):
+        class_folder = os.path.abspath(class_folder)
+        with self.lock:
+            self.forget(class_folder, filename)
+            added_at = time.time()
+            self.execute('INSERT INTO perceptual_hashes (class_folder, filename, dhash, added_at) VALUES (?, ?, ?, ?)',
+                         (class_folder, filename, _to_signed(value), added_at))
+
+            folder = self._folders.pop(class_folder, None)
+            if folder is not None:
+                filenames, hashes, (count, _) = folder
+                # Extend the cached class only if this insert is the one change since it was loaded
+                if self._version(class_folder) == (count + 1, added_at):
+                    self._folders[class_folder] = (filenames + [filename], np.append(hashes, np.uint64(value)),
+                                                   (count + 1, added_at))
+
+    def forget(self, class_folder: str, filename: str) -> int:
+        class_folder = os.path.abspath(class_folder)
+        with self.lock:
+            removed = self.execute('DELETE FROM perceptual_hashes WHERE class_folder = ? AND filename = ?',
+                                   (class_folder, filename))
+            if removed:
+                self._folders.pop(class_folder, None)  # reloaded on next use
+            return removed
+
+    def find_similar(self, class_folder: str, value: int, max_distance: int) -> List[Tuple[str, int]]:
+        """Saved images in class_folder within max_distance bits of value, closest first."""
+        class_folder = os.path.abspath(class_folder)
+        with self.lock:
+            filenames, hashes = self._load(class_folder)
+            if not filenames:
+                return []
+            distances = hamming_distances(hashes, value)
+            matches = np.flatnonzero(distances <= max_distance)
+            found = sorted(((filenames[i], int(distances[i])) for i in matches), key=lambda match: match[1])
+
+            # Drop images deleted or moved since they were indexed
+            similar = []
+            for filename, distance in found:
+                if os.path.exists(os.path.join(class_folder, filename)):
+                    similar.append((filename, distance))
+                else:
+                    self.forget(class_folder, filename)
+            return similar
+
+    def index_folder(self, class_folder: str) -> int:
+        """Hash images in class_folder that are not indexed yet and drop records of missing files."""
+        class_folder = os.path.abspath(class_folder)
+        if not os.path.isdir(class_folder):
+            return 0
+
+        with self.lock:
+            indexed = set(self._load(class_folder)[0])
+            present = {f for f in os.listdir(class_folder)
+                       if os.path.splitext(f)[1].lower().lstrip('.') in Config.ALLOWED_EXTENSIONS}
+            for filename in indexed - present:
+                self.forget(class_folder, filename)
+
+        added = 0
+        for filename in sorted(present - indexed):
+            value = dhash_file(os.path.join(class_folder, filename))
+            if value is not None:
+                self.add(class_folder, filename, value)
+                added += 1
+        return added
+
+    def clusters(self, class_folder: str, max_distance: int) -> List[Dict[str, Any]]:
+        """
+        Groups of images in class_folder that are near-duplicates of each other.
+
+        Images are linked when their hashes differ in at most max_distance bits;
+        each cluster is a connected group of linked images, largest first.
+        """
+        class_folder = os.path.abspath(class_folder)
+        with self.lock:
+            filenames, hashes = self._load(class_folder)
+        count = len(filenames)
+        if count < 2:
+            return []
+
+        # Union-find over all linked pairs, one block of rows at a time
+        parent = list(range(count))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        hash_bytes = hashes.view(np.uint8).reshape(count, 8)
+        for start in range(0, count, self.CLUSTER_BLOCK_SIZE):
+            block = hash_bytes[start:start + self.CLUSTER_BLOCK_SIZE]
+            xor = np.bitwise_xor(block[:, None, :], hash_bytes[None, :, :])
+            distances = _POPCOUNT[xor].sum(axis=2, dtype=np.int64)
+            rows, cols = np.nonzero(distances <= max_distance)
+            for row, col in zip(rows + start, cols):
+                if row < col:
+                    parent[find(row)] = find(col)
+
+        groups = {}
+        for i in range(count):
+            groups.setdefault(find(i), []).append(i)
+
+        clusters = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            member_hashes = hashes[members]
+            spread = max(int(hamming_distances(member_hashes, int(value)).max()) for value in member_hashes)
+            clusters.append({
+                'files': [filenames[i] for i in members],
+                'size': len(members),
+                'max_distance': spread
+            })
+        clusters.sort(key=lambda cluster: cluster['size'], reverse=True)
+        return clusters
+
+
+_near_duplicate_index = None
+_near_duplicate_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """Get the process-wide perceptual-hash index, or None when NEAR_DUP_ENABLED is off."""
+    global _near_duplicate_index
+    if not Config.NEAR_DUP_ENABLED:
+        return None
+    with _near_duplicate_index_lock:
+        if _near_duplicate_index is None:
+            _near_duplicate_index = NearDuplicateIndex(Config.IMAGE_INDEX_DB)
+        return _near_duplicate_index
@@ -0,0 +1,159 @@
+import json
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from bs4 import BeautifulSoup
+
+# ["url",height,width] triples inside the AF_initDataCallback script data.
+# Each result lists its thumbnail triple first, then the original image.
+DATA_TRIPLE_PATTERN = re.compile(r'\["(https?://[^"\\]*(?:\\.[^"\\]*)*)",(\d+),(\d+)\]')
+
+# Hosts that serve Google's own thumbnails, icons and branding rather than original images
+GOOGLE_HOST_SUFFIXES = ('gstatic.com', 'google.com')
+
+
+def _unescape_js_string(raw: str) -> str:
+    """Decode JS string escapes such as \\u003d and \\/ in an embedded URL."""
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _is_google_hosted(url: str) -> bool:
+    host = urlparse(url).netloc.lower()
+    return any(host == suffix or host.endswith('.' + suffix) for suffix in GOOGLE_HOST_SUFFIXES)
+
+
+def _parse_script_data(html: str) -> List[Dict]:
+    """Extract originals from the ["url",height,width] triples in embedded script data."""
+    images = []
+    thumbnail = None
+
+    for match in DATA_TRIPLE_PATTERN.finditer(html):
+        url = _unescape_js_string(match.group(1))
+        height, width = int(match.group(2)), int(match.group(3))
+
+        if _is_google_hosted(url):
+            thumbnail = url
+            continue
+
+        images.append({'url': url, 'width': width, 'height': height, 'thumbnail': thumbnail})
+        thumbnail = None
+
+    return images
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_rg_meta(soup: BeautifulSoup) -> List[Dict]:
+    """Extract originals from the legacy <div class="rg_meta"> JSON blobs."""
+    images = []
+
+    for div in soup.find_all('div', class_='rg_meta'):
+        try:
+            meta = json.loads(div.get_text())
+        except ValueError:
+            continue
+
+        url = meta.get('ou')
+        if url and url.startswith(('http://', 'https://')) and not _is_google_hosted(url):
+            images.append({
+                'url': url,
+                'width': _to_int(meta.get('ow')),
+                'height': _to_int(meta.get('oh')),
+                'thumbnail': meta.get('tu')
+            })
+
+    return images
+
+
+def _parse_imgres_links(soup: BeautifulSoup) -> List[Dict]:
+    """Extract originals from /imgres?imgurl=... result links used by the no-JS layout."""
+    images = []
+
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if 'imgurl=' not in href:
+            continue
+
+        params = parse_qs(urlparse(href).query)
+        url = params.get('imgurl', [''])[0]
+        if not url.startswith(('http://', 'https://')) or _is_google_hosted(url):
+            continue
+
+        img = link.find('img')
+        images.append({
+            'url': url,
+            'width': _to_int(params.get('w', [0])[0]),
+            'height': _to_int(params.get('h', [0])[0]),
+            'thumbnail': (img.get('data-src') or img.get('src')) if img else None
+        })
+
+    return images
+
+
+def extract_full_res_images(html: str, min_width: int = 0, min_height: int = 0,
+                            limit: Optional[int] = None) -> List[Dict]:
+    """Parse original image URLs and their dimensions out of a Google Images results page.
+
+    Works on the raw page source in one pass, without clicking any thumbnails.
+    Returns dicts with url, width, height and thumbnail (the matching
+    encrypted-tbn URL, when known) in page order, without duplicates.
+    """
+    if not html:
+        return []
+
+    images = []
+    seen = set()
+
+    candidates = _parse_script_data(html)
+    if 'rg_meta' in html or 'imgurl=' in html:
+        soup = BeautifulSoup(html, 'html.parser')
+        candidates += _parse_rg_meta(soup) + _parse_imgres_links(soup)
+
+    for image in candidates:
+        if image['url'] in seen:
+            continue
+        if image['width'] < min_width or image['height'] < min_height:
+            continue
+
+        seen.add(image['url'])
+        images.append(image)
+        if limit and len(images) >= limit:
+            break
+
+    return images
+
+
+def extract_thumbnail_images(html: str) -> List[Dict]:
+    """Collect result thumbnail URLs from <img> tags and embedded script data.
+
+    Returns dicts with url, width and height (0 when unknown) in page order,
+    without duplicates. Inline data: URIs are skipped.
+    """
+    if not html:
+        return []
+
+    images = []
+    seen = set()
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for img in soup.find_all('img'):
+        url = img.get('data-src') or img.get('src') or img.get('data-iurl') or img.get('data-original')
+        if url and url.startswith(('http://', 'https://')) and url not in seen:
+            seen.add(url)
+            images.append({'url': url, 'width': _to_int(img.get('width')), 'height': _to_int(img.get('height'))})
+
+    for image in _parse_script_data(html):
+        url = image['thumbnail']
+        if url and url not in seen:
+            seen.add(url)
+            images.append({'url': url, 'width': 0, 'height': 0})
+
+    return images
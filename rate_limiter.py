@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from config import Config
+from cancellation import CancellationToken
+
+
+def parse_host_rates(spec: str) -> Dict[str, float]:
+    """Parse a 'host=rate,host=rate' string into a dict of per-host rates."""
+    rates = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        host, rate = item.split('=', 1)
+        host = host.strip().lower()
+        try:
+            rates[host] = float(rate)
+        except ValueError:
+            continue
+    return rates
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a fixed rate (tokens per second)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it.
+
+        Tokens may go negative, which queues callers fairly: each one waits for
+        the refill that covers its own reservation.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, cancel_token: Optional[CancellationToken] = None) -> float:
+        """Block until a token is available. Returns the time spent waiting.
+
+        With a cancel_token the wait ends early and JobCancelled is raised once it is cancelled.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            if cancel_token is not None:
+                if cancel_token.wait(wait):
+                    cancel_token.raise_if_cancelled()
+            else:
+                time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Process-wide registry of token buckets, one per download host."""
+
+    def __init__(self, default_rate: float, burst: float, host_rates: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def rate_for_host(self, host: str) -> float:
+        """Get the configured rate for a host, matching overrides by domain suffix."""
+        for pattern, rate in self.host_rates.items():
+            if host == pattern or host.endswith('.' + pattern.lstrip('.')):
+                return rate
+        return self.default_rate
+
+    def bucket_for_host(self, host: str) -> TokenBucket:
+        """Get (or create) the token bucket for a host."""
+        host = host.lower()
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_for_host(host), self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str, cancel_token: Optional[CancellationToken] = None) -> float:
+        """Block until a request to the URL's host is allowed. Returns the time spent waiting."""
+        host = urlparse(url).netloc
+        return self.bucket_for_host(host).acquire(cancel_token)
+
+    def set_host_rate(self, host: str, rate: float):
+        """Change the rate for a host at runtime."""
+        host = host.lower()
+        with self.lock:
+            self.host_rates[host] = rate
+            self.buckets.pop(host, None)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the current rate and available tokens for every known host."""
+        with self.lock:
+            return {
+                host: {'rate': bucket.rate, 'tokens': round(bucket.tokens, 2)}
+                for host, bucket in self.buckets.items()
+            }
+
+
+# Global rate limiter shared by all downloads in the process
+host_rate_limiter = HostRateLimiter(
+    Config.DOWNLOAD_RATE_PER_HOST,
+    Config.DOWNLOAD_BURST_PER_HOST,
+    parse_host_rates(Config.HOST_RATE_LIMITS)
+)
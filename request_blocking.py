@@ -0,0 +1,73 @@
+from typing import Dict, Iterable, List
+from selenium.common.exceptions import WebDriverException
+from logger import scraping_logger
+
+# URL patterns per resource type. They are written so they are valid both as
+# CDP wildcard patterns and as URLPattern strings.
+RESOURCE_TYPE_PATTERNS: Dict[str, List[str]] = {
+    'image': [
+        '*://*/*.jpg*', '*://*/*.jpeg*', '*://*/*.png*', '*://*/*.gif*',
+        '*://*/*.webp*', '*://*/*.svg*', '*://*/*.ico*', '*://*/*.bmp*',
+        '*://encrypted-tbn*.gstatic.com/*'
+    ],
+    'font': ['*://*/*.woff*', '*://*/*.ttf*', '*://*/*.otf*', '*://*/*.eot*', '*://fonts.gstatic.com/*'],
+    'media': ['*://*/*.mp4*', '*://*/*.webm*', '*://*/*.mp3*', '*://*/*.m3u8*'],
+    'tracking': [
+        '*://*.google-analytics.com/*', '*://*.googletagmanager.com/*',
+        '*://*.doubleclick.net/*', '*://*/gen_204*', '*://*/client_204*'
+    ],
+}
+
+# The results page itself is never blocked: the extension patterns above also
+# match inside its query string, e.g. a search for "logo.png".
+SEARCH_PAGE_PATTERNS: List[str] = ['*://www.google.com/search*']
+
+
+def split_patterns(value: str) -> List[str]:
+    """Split a comma-separated setting into a list of non-empty items."""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def build_block_patterns(resource_types: Iterable[str], extra_patterns: Iterable[str] = ()) -> List[str]:
+    """Get the URL patterns that block the given resource types, plus any extra patterns."""
+    patterns = []
+    for resource_type in resource_types:
+        type_patterns = RESOURCE_TYPE_PATTERNS.get(resource_type.strip().lower())
+        if type_patterns is None:
+            scraping_logger.warning(f"⚠️ Unknown resource type to block: {resource_type}")
+            continue
+        patterns.extend(type_patterns)
+    patterns.extend(extra_patterns)
+    return list(dict.fromkeys(patterns))
+
+
+def apply_request_blocking(driver, block_patterns: List[str], allow_patterns: List[str] = ()):
+    """Block matching browser requests through the DevTools Protocol.
+
+    Allowlisted patterns, and always the search page (SEARCH_PAGE_PATTERNS),
+    take precedence on Chrome versions that support ordered urlPatterns.
+    Older versions ignore that field and apply only the plain block list in `urls`.
+    Passing no block patterns clears any blocking left by a previous job.
+    """
+    if block_patterns:
+        allow_patterns = list(dict.fromkeys([*SEARCH_PAGE_PATTERNS, *allow_patterns]))
+    url_patterns = ([{'urlPattern': pattern, 'block': False} for pattern in allow_patterns] +
+                    [{'urlPattern': pattern, 'block': True} for pattern in block_patterns])
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        try:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(block_patterns), 'urlPatterns': url_patterns})
+        except WebDriverException:
+            # Chrome versions that reject urlPatterns still accept the plain block list
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(block_patterns)})
+            if allow_patterns:
+                scraping_logger.debug("⚠️ This Chrome version does not support allowlisted URL patterns")
+
+        if block_patterns:
+            scraping_logger.debug(f"✓ Blocking {len(block_patterns)} URL patterns, allowing {len(allow_patterns)}")
+        return True
+
+    except WebDriverException as e:
+        scraping_logger.warning(f"⚠️ Could not configure request blocking: {str(e)[:100]}")
+        return False
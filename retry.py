@@ -0,0 +1,73 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from config import Config
+
+# Responses worth retrying: the server is throttling us or briefly unavailable
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying an idempotent request.
+
+    Waits grow exponentially from base_delay up to max_delay with full jitter,
+    so workers retrying the same host do not hit it in lockstep. A server's
+    Retry-After is honoured instead, unless it asks for longer than max_delay,
+    in which case the request is not retried.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max(int(max_attempts), 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered wait after the given failed attempt (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None if the request should not be retried."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            return self.backoff(attempt)
+        return wait if wait <= self.max_delay else None
+
+
+def sleep_for_retry(seconds: float, cancel_token=None):
+    """Sleep before a retry; with a cancel_token the wait ends early and JobCancelled is raised."""
+    if cancel_token is not None:
+        if cancel_token.wait(seconds):
+            cancel_token.raise_if_cancelled()
+    else:
+        time.sleep(seconds)
+
+
+# Retry policy for image downloads
+download_retry_policy = RetryPolicy(
+    Config.DOWNLOAD_MAX_ATTEMPTS,
+    Config.RETRY_BACKOFF_BASE,
+    Config.RETRY_BACKOFF_MAX
+)
@@ -4,73 +4,250 @@ import time
 import hashlib
 import json
 import re
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from urllib.parse import urlparse, unquote
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from PIL import Image
 import io
-from utils import create_class_folder, validate_image, generate_unique_filename
+from config import Config
+from utils import create_class_folder, validate_image_bytes, write_new_file_atomic
 from logger import scraping_logger
+from rate_limiter import host_rate_limiter
+from http_client import IMAGE_HEADERS, create_session
+from circuit_breaker import host_circuit_breakers
+from retry import RETRYABLE_STATUS_CODES, download_retry_policy, parse_retry_after, sleep_for_retry
+from driver_pool import DriverPool
+from driver_cache import resolve_chromedriver_path, invalidate_driver_cache
+from page_parser import extract_full_res_images
+from http_search import HttpSearchBackend
+from request_blocking import apply_request_blocking, build_block_patterns, split_patterns
+from cancellation import JobCancelled, check_cancelled
+from image_sniff import DownloadBuffer, dimensions_problem, response_problem
+from image_index import get_url_index, get_content_index
+from near_duplicates import dhash_bytes, get_near_duplicate_index
+from async_downloader import create_async_downloader
+from catalog import get_image_catalog
+
+# CSS selectors that match result thumbnails across Google Images layouts
+IMAGE_SELECTORS = [
+    "img[data-src]",
+    "img[src]",
+    "div[data-tbnid] img",
+    ".rg_i",
+    ".Q4LuWd img"
+]
+
+# Collects candidate URLs for every selector in a single WebDriver round trip.
+# Returns a JSON array of {url, selector, width, height} objects.
+IMAGE_EXTRACTION_SCRIPT = """
+const selectors = arguments[0];
+const seen = new Set();
+const results = [];
+for (const selector of selectors) {
+    for (const img of document.querySelectorAll(selector)) {
+        if (seen.has(img)) continue;
+        seen.add(img);
+        const url = img.getAttribute('data-src') || img.src ||
+                    img.getAttribute('data-iurl') || img.getAttribute('data-original');
+        if (url) {
+            results.push({
+                url: url,
+                selector: selector,
+                width: img.naturalWidth || img.width || 0,
+                height: img.naturalHeight || img.height || 0
+            });
+        }
+    }
+}
+return JSON.stringify(results);
+"""
+
+COUNT_RESULTS_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+# XPath lookups run in the page so they never hit the driver's implicit wait
+FIND_CONSENT_BUTTON_SCRIPT = """
+const xpath = "//button[contains(text(), 'Accept all') or contains(text(), 'I agree') or contains(text(), 'Accept')]";
+const button = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return button && button.offsetParent !== null ? button : null;
+"""
+
+CLICK_SHOW_MORE_SCRIPT = """
+const xpaths = ["//input[@value='Show more results']", "//div[contains(text(), 'Show more results')]"];
+let button = null;
+for (const xpath of xpaths) {
+    button = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (button) break;
+}
+button = button || document.querySelector('.mye4qd');
+if (button && button.offsetParent !== null) {
+    button.click();
+    return true;
+}
+return false;
+"""
+
+def create_chrome_driver(headless=True):
+    """Create a Chrome WebDriver with appropriate options."""
+    chrome_options = Options()
+
+    # Essential options for stability
+    if headless:
+        chrome_options.add_argument("--headless")
+        scraping_logger.debug("✓ Headless mode enabled")
+    else:
+        scraping_logger.debug("✓ GUI mode enabled")
+
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+    # Performance optimizations
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+
+    scraping_logger.debug("✓ Chrome options configured")
+
+    # Resolve ChromeDriver (cached per Chrome version)
+    driver_path = resolve_chromedriver_path()
+    scraping_logger.debug(f"✓ ChromeDriver path: {driver_path}")
+
+    scraping_logger.info("🌐 Starting Chrome browser...")
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except WebDriverException as e:
+        # A cached driver may no longer match the installed Chrome; resolve it again once
+        scraping_logger.warning(f"⚠️ Chrome failed to start with cached driver, refreshing: {str(e)[:100]}")
+        invalidate_driver_cache()
+        driver_path = resolve_chromedriver_path(refresh=True)
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+
+    # Set timeouts
+    driver.implicitly_wait(10)
+    driver.set_page_load_timeout(30)
+
+    return driver
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+# Serializes the duplicate check of finished downloads across scrapers in this process
+# (file names are claimed on disk, so other processes cannot take the same one)
+_commit_lock = threading.Lock()
+
+def get_driver_pool():
+    """Get the process-wide pool of warm headless Chrome drivers, or None if pooling is disabled."""
+    global _driver_pool
+    if Config.DRIVER_POOL_SIZE <= 0:
+        return None
+
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(
+                lambda: create_chrome_driver(headless=True),
+                size=Config.DRIVER_POOL_SIZE,
+                max_age=Config.DRIVER_MAX_AGE,
+                max_uses=Config.DRIVER_MAX_USES,
+                checkout_timeout=Config.DRIVER_CHECKOUT_TIMEOUT
+            )
+            atexit.register(_driver_pool.close_all)
+        return _driver_pool
 
 class GoogleImageScraper:
-    def __init__(self, headless=True):
-        """Initialize the Google Images scraper with Selenium WebDriver."""
+    def __init__(self, headless=True, download_workers=None, max_per_host=None, driver_pool=None,
+                 block_resources=None, blocked_resource_types=None, allowed_url_patterns=None,
+                 backend=None, url_index=None, content_index=None, near_dup_index=None, download_engine=None,
+                 catalog=None):
+        """Initialize the Google Images scraper.
+
+        backend selects how searches run: 'selenium' drives Chrome, 'http'
+        fetches result pages with the requests session and never starts a
+        browser. It defaults to the SEARCH_BACKEND setting.
+
+        Pass a DriverPool (see get_driver_pool) to borrow a warm browser instead
+        of launching a new one; close() then returns it to the pool.
+
+        block_resources, blocked_resource_types and allowed_url_patterns
+        control which browser requests are blocked for this scraper. They
+        default to the BLOCK_* / ALLOWED_URL_PATTERNS settings.
+
+        url_index is the UrlIndex of already downloaded URLs; it defaults to the
+        shared index (see URL_INDEX_ENABLED). Pass url_index=False to ignore it.
+        content_index is the ContentIndex used to drop byte-identical downloads
+        (see CONTENT_DEDUP_ENABLED) and near_dup_index the NearDuplicateIndex for
+        resized or re-encoded copies (see NEAR_DUP_ENABLED); they work the same way.
+        catalog is the ImageCatalog that saved images are recorded in (see
+        CATALOG_ENABLED), again with False to leave it alone.
+
+        download_engine is 'threads' (a worker thread per download) or 'asyncio'
+        (coroutines on an AsyncDownloader event loop, needs httpx); it defaults
+        to the DOWNLOAD_ENGINE setting. scrape_images blocks either way.
+        """
         self.headless = headless
+        self.backend = (backend or Config.SEARCH_BACKEND).lower()
         self.driver = None
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        self.setup_driver()
+        self.driver_pool = driver_pool
+        self.block_resources = Config.BLOCK_BROWSER_RESOURCES if block_resources is None else block_resources
+        self.blocked_resource_types = (split_patterns(Config.BLOCKED_RESOURCE_TYPES)
+                                       if blocked_resource_types is None else list(blocked_resource_types))
+        self.allowed_url_patterns = (split_patterns(Config.ALLOWED_URL_PATTERNS)
+                                     if allowed_url_patterns is None else list(allowed_url_patterns))
+        self.download_workers = download_workers or Config.DOWNLOAD_WORKERS
+        self.max_per_host = max_per_host or Config.DOWNLOAD_MAX_PER_HOST
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        self.url_index = get_url_index() if url_index is None else (url_index or None)
+        self.content_index = get_content_index() if content_index is None else (content_index or None)
+        self.near_dup_index = get_near_duplicate_index() if near_dup_index is None else (near_dup_index or None)
+        self.catalog = get_image_catalog() if catalog is None else (catalog or None)
+        self._duplicate_urls = set()
+        self.last_stats = {}
+        self.session = create_session()
+
+        self.download_engine = (download_engine or Config.DOWNLOAD_ENGINE).lower()
+        if self.download_engine == 'asyncio':
+            self.async_downloader = create_async_downloader(self._accept_download, self.max_per_host)
+        elif self.download_engine == 'threads':
+            self.async_downloader = None
+        else:
+            raise ValueError(f"Unknown download engine: {self.download_engine}")
+
+        if self.backend == 'http':
+            scraping_logger.info("🌐 Using HTTP search backend (no browser)")
+            self.http_search = HttpSearchBackend(self.session)
+        elif self.backend == 'selenium':
+            self.http_search = None
+            self.setup_driver()
+        else:
+            raise ValueError(f"Unknown search backend: {self.backend}")
 
     def setup_driver(self):
-        """Setup Chrome WebDriver with appropriate options."""
+        """Setup Chrome WebDriver, checking one out of the driver pool when configured."""
         try:
-            scraping_logger.info("🚀 Initializing Chrome WebDriver...")
-
-            chrome_options = Options()
-
-            # Essential options for stability
-            if self.headless:
-                chrome_options.add_argument("--headless")
-                scraping_logger.debug("✓ Headless mode enabled")
+            if self.driver_pool:
+                scraping_logger.info("🚀 Checking out Chrome WebDriver from pool...")
+                self.driver = self.driver_pool.checkout()
             else:
-                scraping_logger.debug("✓ GUI mode enabled")
-
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")  # Don't load images in browser for faster loading
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-
-            # Performance optimizations
-            chrome_options.add_argument("--disable-background-timer-throttling")
-            chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-            chrome_options.add_argument("--disable-renderer-backgrounding")
-
-            scraping_logger.debug("✓ Chrome options configured")
-
-            # Install and setup ChromeDriver
-            scraping_logger.info("📥 Installing/updating ChromeDriver...")
-            driver_path = ChromeDriverManager().install()
-            scraping_logger.debug(f"✓ ChromeDriver path: {driver_path}")
-
-            service = Service(driver_path)
-            scraping_logger.info("🌐 Starting Chrome browser...")
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                scraping_logger.info("🚀 Initializing Chrome WebDriver...")
+                self.driver = create_chrome_driver(self.headless)
 
-            # Set timeouts
-            self.driver.implicitly_wait(10)
-            self.driver.set_page_load_timeout(30)
+            # Applied on every setup because pooled browsers keep the previous job's rules
+            if self.block_resources:
+                block_patterns = build_block_patterns(self.blocked_resource_types,
+                                                      split_patterns(Config.BLOCKED_URL_PATTERNS))
+            else:
+                block_patterns = []
+            apply_request_blocking(self.driver, block_patterns, self.allowed_url_patterns)
 
             scraping_logger.success("✅ WebDriver initialized successfully!")
             scraping_logger.debug(f"✓ Browser version: {self.driver.capabilities.get('browserVersion', 'Unknown')}")
@@ -81,126 +258,196 @@ class GoogleImageScraper:
             scraping_logger.error(error_msg)
             raise Exception(error_msg)
 
-    def search_images(self, query, max_images=20):
-        """Search for images on Google Images and extract image URLs."""
-        if not self.driver:
-            error_msg = "❌ WebDriver not initialized"
-            scraping_logger.error(error_msg)
-            raise Exception(error_msg)
-
+    def search_images(self, query, max_images=20, stream=False, time_budget=None, full_resolution=False,
+                      cancel_token=None):
+        """Search for images on Google Images and extract image URLs.
+
+        With stream=True a generator is returned that yields each URL as soon
+        as a scroll pass finds it, so downloads can start while the browser
+        keeps scrolling.
+
+        Scrolling continues while passes still find new URLs and stops once
+        SEARCH_PLATEAU_PASSES passes in a row find nothing new, or when
+        time_budget seconds (SEARCH_TIME_BUDGET by default) have passed.
+
+        With full_resolution=True the original image URLs are parsed out of the
+        page's embedded result data instead of collecting encrypted-tbn thumbnails.
+
+        A CancellationToken passed as cancel_token is checked on every pass and
+        while waiting for the page; JobCancelled is raised once it is cancelled.
+        """
+        time_budget = Config.SEARCH_TIME_BUDGET if time_budget is None else time_budget
+
+        if getattr(self, 'http_search', None):
+            url_stream = self.http_search.iter_image_urls(
+                query, max_images, time_budget, full_resolution, is_valid=self._is_valid_image_url,
+                cancel_token=cancel_token
+            )
+        else:
+            if not self.driver:
+                error_msg = "❌ WebDriver not initialized"
+                scraping_logger.error(error_msg)
+                raise Exception(error_msg)
+            url_stream = self._iter_image_urls(query, max_images, time_budget, full_resolution, cancel_token)
+        if stream:
+            return url_stream
+
+        final_urls = list(url_stream)
+        print(f"Found {len(final_urls)} image URLs for query: {query}")
+        return final_urls
+
+    def _iter_image_urls(self, query, max_images, time_budget, full_resolution=False, cancel_token=None):
+        """Yield unique image URLs from Google Images as each scroll pass finds them."""
+        deadline = time.monotonic() + time_budget
         try:
             # Navigate to Google Images
             search_url = f"https://www.google.com/search?q={query}&tbm=isch&hl=en"
             scraping_logger.info(f"🔍 Starting image search for: '{query}'")
             scraping_logger.info(f"🌐 Navigating to: {search_url}")
             scraping_logger.debug(f"✓ Target images: {max_images}")
+            scraping_logger.debug(f"✓ Mode: {'full resolution' if full_resolution else 'thumbnails'}")
 
+            check_cancelled(cancel_token)
             self.driver.get(search_url)
 
-            # Wait for page to load
+            # Wait until result thumbnails or a cookie consent dialog show up
             scraping_logger.debug("⏳ Waiting for page to load...")
-            time.sleep(2)
+            try:
+                load_timeout = min(Config.PAGE_LOAD_WAIT_TIMEOUT, time_budget)
+                WebDriverWait(self.driver, load_timeout, poll_frequency=0.1).until(
+                    lambda driver: check_cancelled(cancel_token) or
+                    self._count_result_images() > 0 or self._find_consent_button()
+                )
+            except TimeoutException:
+                scraping_logger.warning("⚠️ No results appeared before the page load timeout")
 
             # Accept cookies if present
             scraping_logger.debug("🍪 Checking for cookie consent dialog...")
-            try:
-                accept_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Accept all') or contains(text(), 'I agree') or contains(text(), 'Accept')]"))
-                )
+            accept_button = self._find_consent_button()
+            if accept_button:
                 accept_button.click()
                 scraping_logger.info("✅ Cookie consent accepted")
-                time.sleep(1)
-            except TimeoutException:
+                self._wait_for_new_results(0, min(Config.PAGE_LOAD_WAIT_TIMEOUT, max(deadline - time.monotonic(), 0)),
+                                           cancel_token)
+            else:
                 scraping_logger.debug("✓ No cookie consent dialog found or already accepted")
 
             image_urls = set()  # Use set to avoid duplicates
-            scroll_attempts = 0
-            max_scroll_attempts = 10
+            scroll_pass = 0
+            stale_passes = 0
 
-            scraping_logger.info(f"🔄 Starting image extraction (max {max_scroll_attempts} scroll attempts)")
+            scraping_logger.info(f"🔄 Starting image extraction (time budget {time_budget:g}s, "
+                                 f"stop after {Config.SEARCH_PLATEAU_PASSES} passes without new images)")
 
-            while len(image_urls) < max_images and scroll_attempts < max_scroll_attempts:
-                scroll_attempts += 1
-                scraping_logger.debug(f"📜 Scroll attempt {scroll_attempts}/{max_scroll_attempts}")
+            while len(image_urls) < max_images:
+                check_cancelled(cancel_token)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    scraping_logger.warning(f"⏰ Search time budget of {time_budget:g}s used up")
+                    break
+                if scroll_pass >= Config.SEARCH_MAX_SCROLL_PASSES:
+                    scraping_logger.warning(f"⚠️ Reached the limit of {Config.SEARCH_MAX_SCROLL_PASSES} scroll passes")
+                    break
+
+                scroll_pass += 1
+                new_in_pass = 0
+                scraping_logger.debug(f"📜 Scroll pass {scroll_pass}")
 
-                # Find image elements using multiple selectors
                 try:
-                    # Multiple CSS selectors to catch different image formats
-                    selectors = [
-                        "img[data-src]",
-                        "img[src]",
-                        "div[data-tbnid] img",
-                        ".rg_i",
-                        ".Q4LuWd img"
-                    ]
-
-                    for selector in selectors:
+                    if full_resolution:
+                        candidates = self._extract_full_res_candidates()
+                    else:
+                        candidates = self._extract_image_candidates()
+                    scraping_logger.debug(f"🔍 Found {len(candidates)} candidate images on page")
+
+                    for candidate in candidates:
                         if len(image_urls) >= max_images:
                             break
 
-                        image_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        scraping_logger.debug(f"🔍 Found {len(image_elements)} elements with selector: {selector}")
+                        img_url = candidate.get('url')
+                        if img_url and img_url not in image_urls and self._is_valid_image_url(img_url):
+                            image_urls.add(img_url)
+                            new_in_pass += 1
+                            scraping_logger.debug(f"✅ Added image URL: {img_url[:80]}...")
+                            yield img_url
 
-                        for img_element in image_elements:
-                            if len(image_urls) >= max_images:
-                                break
+                    current_count = len(image_urls)
+                    scraping_logger.info(f"📊 Current image count: {current_count}/{max_images} (+{new_in_pass} this pass)")
 
-                            # Try multiple attributes for image URL
-                            img_url = (img_element.get_attribute("data-src") or
-                                     img_element.get_attribute("src") or
-                                     img_element.get_attribute("data-iurl") or
-                                     img_element.get_attribute("data-original"))
+                    if current_count >= max_images:
+                        break
 
-                            if img_url and self._is_valid_image_url(img_url):
-                                image_urls.add(img_url)
-                                scraping_logger.debug(f"✅ Added image URL: {img_url[:80]}...")
+                    # Keep going while passes still yield new URLs; stop once the yield plateaus
+                    stale_passes = 0 if new_in_pass else stale_passes + 1
+                    if stale_passes >= Config.SEARCH_PLATEAU_PASSES:
+                        scraping_logger.info(f"🛑 No new images in {stale_passes} passes, stopping search")
+                        break
 
-                    current_count = len(image_urls)
-                    scraping_logger.info(f"📊 Current image count: {current_count}/{max_images}")
-
-                    # Scroll down to load more images
+                    # Scroll down and move on as soon as new thumbnails arrive
                     scraping_logger.debug("📜 Scrolling to load more images...")
+                    wait_timeout = min(Config.SCROLL_WAIT_TIMEOUT, max(deadline - time.monotonic(), 0))
+                    previous_count = self._count_result_images()
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(3)
-
-                    # Try to click "Show more results" button if available
-                    try:
-                        show_more_selectors = [
-                            "//input[@value='Show more results']",
-                            "//div[contains(text(), 'Show more results')]",
-                            ".mye4qd"
-                        ]
-
-                        for selector in show_more_selectors:
-                            try:
-                                if selector.startswith("//"):
-                                    show_more_button = self.driver.find_element(By.XPATH, selector)
-                                else:
-                                    show_more_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-
-                                if show_more_button.is_displayed():
-                                    self.driver.execute_script("arguments[0].click();", show_more_button)
-                                    time.sleep(3)
-                                    break
-                            except NoSuchElementException:
-                                continue
-                    except Exception:
-                        pass
-
-                    scroll_attempts += 1
 
-                except Exception as e:
-                    print(f"Error during image extraction: {str(e)}")
-                    scroll_attempts += 1
+                    if not self._wait_for_new_results(previous_count, wait_timeout, cancel_token):
+                        # Try to click "Show more results" button if available
+                        if self._click_show_more():
+                            scraping_logger.debug("🖱️ Clicked 'Show more results'")
+                            self._wait_for_new_results(previous_count, wait_timeout, cancel_token)
 
-            final_urls = list(image_urls)[:max_images]
-            print(f"Found {len(final_urls)} image URLs for query: {query}")
-            return final_urls
+                except Exception as e:
+                    scraping_logger.error(f"❌ Error during image extraction: {str(e)}")
+                    stale_passes += 1
+                    if stale_passes >= Config.SEARCH_PLATEAU_PASSES:
+                        break
 
         except Exception as e:
             print(f"Error searching for images: {str(e)}")
+
+    def _count_result_images(self):
+        """Count result thumbnails currently in the DOM."""
+        return self.driver.execute_script(COUNT_RESULTS_SCRIPT, ", ".join(IMAGE_SELECTORS)) or 0
+
+    def _wait_for_new_results(self, previous_count, timeout=None, cancel_token=None):
+        """Wait until there are more result thumbnails than previous_count.
+
+        Returns True as soon as new thumbnails appear, or False if none appear
+        within the timeout (SCROLL_WAIT_TIMEOUT by default). Raises JobCancelled
+        if cancel_token is cancelled while waiting.
+        """
+        timeout = Config.SCROLL_WAIT_TIMEOUT if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: check_cancelled(cancel_token) or self._count_result_images() > previous_count
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def _find_consent_button(self):
+        """Get the cookie consent button if the dialog is showing, without waiting."""
+        return self.driver.execute_script(FIND_CONSENT_BUTTON_SCRIPT)
+
+    def _click_show_more(self):
+        """Click the "Show more results" button if it is visible. Returns True if clicked."""
+        try:
+            return bool(self.driver.execute_script(CLICK_SHOW_MORE_SCRIPT))
+        except WebDriverException:
+            return False
+
+    def _extract_image_candidates(self):
+        """Collect candidate image URLs for all selectors with one execute_script call."""
+        raw = self.driver.execute_script(IMAGE_EXTRACTION_SCRIPT, IMAGE_SELECTORS)
+        try:
+            return json.loads(raw) if raw else []
+        except (TypeError, ValueError):
+            scraping_logger.warning("⚠️ Could not parse image candidates returned by the page")
             return []
 
+    def _extract_full_res_candidates(self):
+        """Parse original image URLs and dimensions out of the page source in one pass."""
+        return extract_full_res_images(self.driver.page_source)
+
     def _is_valid_image_url(self, url):
         """Check if the URL is a valid image URL."""
         if not url or not url.startswith(('http://', 'https://')):
@@ -233,121 +480,264 @@ class GoogleImageScraper:
         # More permissive - if it looks like it could be an image, allow it
         return any(pattern in url_lower for pattern in valid_patterns) or len(url) > 50
 
-    def _extract_high_res_images(self, image_urls, max_images):
-        """Try to extract higher resolution images by clicking on thumbnails."""
+    def download_image(self, url, folder_path, filename_prefix="image", cancel_token=None):
+        """Download a single image from URL.
+
+        Downloads are abandoned as early as possible: on a Content-Length outside
+        MIN_IMAGE_BYTES..MAX_IMAGE_BYTES before reading the body, and on an unknown
+        file signature or dimensions under MIN_IMAGE_WIDTH x MIN_IMAGE_HEIGHT once
+        the first chunks are in. The body is streamed into memory (at most
+        MAX_IMAGE_BYTES) and hashed on the way, then validated there, so rejected
+        images never touch the disk.
+        If the same or a near-identical image is already stored (see
+        _commit_download), the download is dropped and its URL remembered in
+        _duplicate_urls.
+
+        Connection errors, 429 and 5xx responses are retried (see
+        _get_with_retries).
+
+        Raises JobCancelled if cancel_token is cancelled while waiting for the
+        rate limiter, a retry or streaming the body.
+        """
         try:
-            # Find clickable image thumbnails
-            thumbnails = self.driver.find_elements(By.CSS_SELECTOR, "img[data-src]")[:5]  # Limit to first 5 for performance
+            check_cancelled(cancel_token)
+            scraping_logger.debug(f"📥 Downloading: {url[:80]}...")
 
-            for thumbnail in thumbnails:
-                if len(image_urls) >= max_images:
-                    break
+            response = self._get_with_retries(url, IMAGE_HEADERS, cancel_token)
+            if response is None:
+                return None
 
-                try:
-                    # Click on thumbnail to get larger image
-                    self.driver.execute_script("arguments[0].click();", thumbnail)
-                    time.sleep(1)
-
-                    # Look for the larger image
-                    large_images = self.driver.find_elements(By.CSS_SELECTOR, "img[src*='http']")
-                    for large_img in large_images:
-                        img_url = large_img.get_attribute("src")
-                        if img_url and self._is_valid_image_url(img_url) and 'encrypted-tbn' not in img_url:
-                            image_urls.add(img_url)
-                            break
+            # Skip non-image responses and bodies whose announced size is out of bounds without reading them
+            scraping_logger.debug(f"✓ Content-Type: {response.headers.get('content-type', '')}")
+            problem = response_problem(response.headers)
+            if problem:
+                response.close()
+                scraping_logger.warning(f"🚫 URL {problem}, skipping: {url[:80]}...")
+                return None
 
-                except Exception as e:
-                    continue  # Skip this thumbnail if there's an error
+            # Download image in chunks into memory, hashing the bytes as they arrive and
+            # checking the file signature and dimensions as soon as the header is in
+            body = DownloadBuffer()
+            try:
+                for chunk in response.iter_content(chunk_size=8192):
+                    check_cancelled(cancel_token)
+                    problem = body.feed(chunk)
+                    if problem:
+                        scraping_logger.warning(f"🚫 Image {problem}, aborted after {body.size} bytes: {url[:80]}...")
+                        return None
+            finally:
+                response.close()
 
+            return self._accept_download(url, body, folder_path, filename_prefix)
+
+        except requests.exceptions.RequestException as e:
+            scraping_logger.error(f"🌐 Network error downloading image: {str(e)}")
+            return None
         except Exception as e:
-            print(f"Error extracting high-res images: {str(e)}")
+            scraping_logger.error(f"❌ Error downloading image: {str(e)}")
+            return None
 
-    def download_image(self, url, folder_path, filename_prefix="image"):
-        """Download a single image from URL."""
-        try:
-            scraping_logger.debug(f"📥 Downloading: {url[:80]}...")
+    def _accept_download(self, url, body, folder_path, filename_prefix):
+        """Validate a fully read DownloadBuffer and save it (see _commit_download).
 
-            # Add additional headers to mimic a real browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
+        Shared by the thread and asyncio download engines. Returns the saved
+        filename, or None if the image was rejected or is a duplicate.
+        """
+        data = body.getvalue()
 
-            response = self.session.get(url, headers=headers, timeout=15, stream=True)
-            response.raise_for_status()
+        # Check size (filters out tiny images)
+        scraping_logger.debug(f"✓ Size: {len(data)} bytes")
+        if len(data) < Config.MIN_IMAGE_BYTES:
+            scraping_logger.warning(f"⚠️ Image too small ({len(data)} bytes), skipping: {url[:80]}...")
+            return None
 
-            # Check if the response contains image data
-            content_type = response.headers.get('content-type', '').lower()
-            scraping_logger.debug(f"✓ Content-Type: {content_type}")
+        problem = body.probe.finish()
+        if problem:
+            scraping_logger.warning(f"⚠️ Image {problem}, skipping: {url[:80]}...")
+            return None
 
-            if not content_type.startswith('image/'):
-                scraping_logger.warning(f"⚠️ URL does not contain image data: {url[:80]}...")
-                return None
+        # The file signature decides the extension, whatever the URL or Content-Type claim
+        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+        base_filename = f"{filename_prefix}_{url_hash}{body.probe.kind}"
 
-            # Try to determine file extension from URL or content type
-            parsed_url = urlparse(url)
-            ext = os.path.splitext(parsed_url.path)[1].lower()
-
-            if not ext or ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']:
-                if 'jpeg' in content_type or 'jpg' in content_type:
-                    ext = '.jpg'
-                elif 'png' in content_type:
-                    ext = '.png'
-                elif 'gif' in content_type:
-                    ext = '.gif'
-                elif 'webp' in content_type:
-                    ext = '.webp'
-                elif 'bmp' in content_type:
-                    ext = '.bmp'
-                else:
-                    ext = '.jpg'  # Default
+        # Validate the downloaded image
+        scraping_logger.debug(f"🔍 Validating image: {base_filename}")
+        if not validate_image_bytes(data):
+            scraping_logger.warning(f"⚠️ Invalid image data, skipping: {url[:80]}...")
+            return None
 
-            # Generate unique filename
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-            base_filename = f"{filename_prefix}_{url_hash}{ext}"
-            filename = generate_unique_filename(base_filename, folder_path)
-            file_path = os.path.join(folder_path, filename)
+        dimensions = body.probe.size
+        if dimensions is None:
+            # Header was too large to parse on the way; read the dimensions now
+            with Image.open(io.BytesIO(data)) as image:
+                dimensions = image.size
+            problem = dimensions_problem(dimensions, Config.MIN_IMAGE_WIDTH, Config.MIN_IMAGE_HEIGHT)
+            if problem:
+                scraping_logger.warning(f"⚠️ Image {problem}, skipping: {url[:80]}...")
+                return None
 
-            # Download and save image in chunks
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            # Validate the downloaded image
-            scraping_logger.debug(f"🔍 Validating image: {filename}")
-            if validate_image(file_path):
-                # Check file size (minimum 1KB to filter out tiny images)
-                file_size = os.path.getsize(file_path)
-                scraping_logger.debug(f"✓ File size: {file_size} bytes")
-
-                if file_size > 1024:
-                    scraping_logger.success(f"✅ Successfully downloaded: {filename}")
-                    return filename
-                else:
-                    scraping_logger.warning(f"⚠️ Image too small ({file_size} bytes), removing: {filename}")
-                    os.remove(file_path)
-                    return None
-            else:
-                scraping_logger.warning(f"⚠️ Invalid image file, removing: {filename}")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+        return self._commit_download(url, data, folder_path, base_filename, filename_prefix,
+                                     body.sha256.hexdigest(), dimensions)
+
+    def _get_with_retries(self, url, headers, cancel_token=None):
+        """GET an image with retries, honouring the host's rate limit and circuit breaker.
+
+        Transient failures (connection errors, timeouts, 429 and 5xx) are retried
+        with jittered exponential backoff or after the server's Retry-After, and
+        count against the host's circuit breaker. Returns the streaming response,
+        or None when the host's circuit is open. Other HTTP errors are raised.
+        """
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            if not host_circuit_breakers.allow(url):
+                scraping_logger.warning(f"⛔ Circuit open for {host}, skipping: {url[:80]}...")
                 return None
 
-        except requests.exceptions.RequestException as e:
-            scraping_logger.error(f"🌐 Network error downloading image: {str(e)}")
-            return None
-        except Exception as e:
-            scraping_logger.error(f"❌ Error downloading image: {str(e)}")
+            waited = host_rate_limiter.acquire(url, cancel_token)
+            if waited > 0:
+                scraping_logger.debug(f"⏱️ Rate limited for {waited:.2f}s: {host}")
+
+            try:
+                response = self.session.get(url, headers=headers, timeout=15, stream=True)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                host_circuit_breakers.record_failure(url)
+                delay = download_retry_policy.delay(attempt)
+                if delay is None:
+                    raise
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # The host answered; a 404 or 403 is about this URL, not the host
+                    host_circuit_breakers.record_success(url)
+                    if response.status_code >= 400:
+                        response.close()
+                    response.raise_for_status()
+                    return response
+
+                host_circuit_breakers.record_failure(url)
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+                delay = download_retry_policy.delay(attempt, retry_after)
+                if delay is None:
+                    wait = parse_retry_after(retry_after)
+                    if wait is not None and wait > download_retry_policy.max_delay:
+                        # The host asked for a long break: give it one for all downloads
+                        host_circuit_breakers.trip(url, wait)
+                    response.raise_for_status()
+                reason = f"HTTP {response.status_code}"
+
+            attempt += 1
+            scraping_logger.info(f"🔁 {reason} from {host}, retry {attempt} in {delay:.1f}s: {url[:80]}...")
+            sleep_for_retry(delay, cancel_token)
+
+    def _commit_download(self, url, data, folder_path, base_filename, class_name, digest, dimensions=(None, None)):
+        """Write a validated download to the class folder unless the image is already stored.
+
+        Exact copies are found by SHA-256 in the content index, resized or
+        re-encoded ones by perceptual hash in the near-duplicate index. Saved
+        images are recorded in the catalog with their (width, height) dimensions.
+        """
+        file_size = len(data)
+        perceptual_hash = dhash_bytes(data) if self.near_dup_index else None
+
+        # One commit at a time, so two threads cannot both save the same image
+        with _commit_lock:
+            existing = self._find_duplicate(folder_path, digest, perceptual_hash)
+            if existing is None:
+                filename = write_new_file_atomic(folder_path, base_filename, data)
+                if self.content_index:
+                    self.content_index.add(digest, folder_path, filename, class_name, file_size, url)
+                if perceptual_hash is not None:
+                    self.near_dup_index.add(folder_path, filename, perceptual_hash)
+                if self.catalog:
+                    width, height = dimensions
+                    self.catalog.add_image(folder_path, filename, file_size, width, height, digest,
+                                           perceptual_hash, url)
+
+        if existing is not None:
+            self._duplicate_urls.add(url)
+            if existing['distance'] == 0 and self.content_index:
+                self.content_index.record_duplicate(folder_path, class_name, file_size)
+            if self.url_index and os.path.abspath(existing['class_folder']) == os.path.abspath(folder_path):
+                # Same image under another URL: repeat runs can skip this URL too
+                self.url_index.record(url, folder_path, existing['filename'], class_name)
+            if existing['distance']:
+                scraping_logger.info(f"♻️ Near-duplicate of {existing['filename']} "
+                                     f"(distance {existing['distance']}), not saved: {url[:80]}...")
+            else:
+                scraping_logger.info(f"♻️ Duplicate of {existing['filename']}, not saved: {url[:80]}...")
             return None
 
-    def scrape_images(self, query, destination_folder, class_name, max_images=20, progress_callback=None):
-        """Main method to scrape images."""
+        scraping_logger.success(f"✅ Successfully downloaded: {filename}")
+        return filename
+
+    def _find_duplicate(self, folder_path, digest, perceptual_hash):
+        """Get {'class_folder', 'filename', 'distance'} of a stored copy of the image, if any."""
+        if self.content_index:
+            scope = None if Config.DEDUP_SCOPE == 'global' else folder_path
+            existing = self.content_index.find(digest, scope)
+            if existing is not None:
+                return {'class_folder': existing['class_folder'], 'filename': existing['filename'], 'distance': 0}
+
+        if perceptual_hash is not None:
+            similar = self.near_dup_index.find_similar(folder_path, perceptual_hash, Config.NEAR_DUP_MAX_DISTANCE)
+            if similar:
+                filename, distance = similar[0]
+                return {'class_folder': folder_path, 'filename': filename, 'distance': distance}
+        return None
+
+    def _host_slot(self, url):
+        """Get the semaphore that caps concurrent downloads for the URL's host."""
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _download_with_host_limit(self, url, folder_path, filename_prefix, cancel_token=None):
+        """Download an image while holding one of its host's concurrency slots."""
+        slot = self._host_slot(url)
+        while not slot.acquire(timeout=0.2):
+            check_cancelled(cancel_token)
+        try:
+            return self.download_image(url, folder_path, filename_prefix, cancel_token)
+        finally:
+            slot.release()
+
+    def _submit_download(self, executor, url, folder_path, filename_prefix, cancel_token=None):
+        """Start a download on the configured engine. Returns a concurrent.futures.Future."""
+        if self.async_downloader:
+            return self.async_downloader.submit(url, folder_path, filename_prefix, cancel_token)
+        return executor.submit(self._download_with_host_limit, url, folder_path, filename_prefix, cancel_token)
+
+    def scrape_images(self, query, destination_folder, class_name, max_images=20, progress_callback=None,
+                      full_resolution=None, skip_urls=None, url_callback=None, cancel_token=None,
+                      cleanup_on_cancel=False):
+        """Main method to scrape images.
+
+        full_resolution selects original images instead of thumbnails for this
+        job; it defaults to the FULL_RESOLUTION setting.
+
+        skip_urls is a set of URLs not to fetch again (e.g. from a resumed job);
+        they do not count towards max_images. URLs the URL index knows are already
+        saved in this class are skipped without a request and do count towards
+        max_images, so a repeat run only fetches the delta. url_callback(url, status, filename)
+        is called from this thread with status 'discovered', 'downloaded', 'duplicate'
+        (same bytes as a saved image) or 'failed'.
+
+        cancel_token (a CancellationToken) stops the search and in-flight downloads;
+        JobCancelled is then re-raised to the caller. With cleanup_on_cancel the
+        images already saved by this call are deleted as well.
+        """
+        if full_resolution is None:
+            full_resolution = Config.FULL_RESOLUTION
+
+        class_folder = None
+        futures = {}
+
         try:
             scraping_logger.info(f"🚀 Starting scraping session")
             scraping_logger.info(f"📝 Query: '{query}', Class: '{class_name}', Max Images: {max_images}")
@@ -356,46 +746,138 @@ class GoogleImageScraper:
             class_folder = create_class_folder(destination_folder, class_name)
             scraping_logger.info(f"📁 Created/using folder: {class_folder}")
 
-            # Search for images
+            # Search for images and download them as the search finds them
             if progress_callback:
                 progress_callback(f"Searching for images: {query}")
 
             scraping_logger.info(f"🔍 Starting image URL extraction...")
-            image_urls = self.search_images(query, max_images)
-
-            if progress_callback:
-                progress_callback(f"Found {len(image_urls)} images. Starting download...")
-
-            scraping_logger.info(f"📊 Found {len(image_urls)} image URLs, starting downloads...")
+            if self.async_downloader:
+                scraping_logger.debug(f"⚙️ Async downloads in flight: {self.async_downloader.max_concurrency}, "
+                                      f"max per host: {self.max_per_host}")
+            else:
+                scraping_logger.debug(f"⚙️ Download workers: {self.download_workers}, max per host: {self.max_per_host}")
 
             downloaded_count = 0
             failed_count = 0
+            completed_count = 0
+            skipped_count = 0
+            known_count = 0
+            duplicate_count = 0
+            skip_urls = set(skip_urls or ())
+            self._duplicate_urls = set()
+
+            def record_result(future):
+                nonlocal downloaded_count, failed_count, completed_count, duplicate_count
+                url = futures[future]
+                filename = future.result()
+                completed_count += 1
 
-            for i, url in enumerate(image_urls):
                 if progress_callback:
-                    progress_callback(f"Downloading image {i+1}/{len(image_urls)}")
+                    progress_callback(f"Downloading image {completed_count}/{len(futures)}")
 
-                scraping_logger.info(f"📥 Downloading image {i+1}/{len(image_urls)}")
-                filename = self.download_image(url, class_folder, class_name)
+                scraping_logger.info(f"📥 Downloaded image {completed_count}/{len(futures)}")
 
                 if filename:
                     downloaded_count += 1
+                    status = 'downloaded'
                     scraping_logger.debug(f"✅ Success: {filename}")
+                    if self.url_index:
+                        self.url_index.record(url, class_folder, filename, class_name)
+                elif url in self._duplicate_urls:
+                    duplicate_count += 1
+                    status = 'duplicate'
                 else:
                     failed_count += 1
+                    status = 'failed'
                     scraping_logger.debug(f"❌ Failed: {url[:50]}...")
 
-                time.sleep(0.5)  # Be respectful to the server
+                if url_callback:
+                    url_callback(url, status, filename)
+
+            with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+                pending = set()
+                try:
+                    # Ask the search for extra URLs to make up for the ones we skip
+                    search_limit = max_images + len(skip_urls)
+                    for url in self.search_images(query, search_limit, stream=True, full_resolution=full_resolution,
+                                                  cancel_token=cancel_token):
+                        if url in skip_urls:
+                            skipped_count += 1
+                            continue
+
+                        if self.url_index and self.url_index.lookup(url, class_folder):
+                            known_count += 1
+                            if len(futures) + known_count >= max_images:
+                                break
+                            continue
+
+                        if url_callback:
+                            url_callback(url, 'discovered', None)
+
+                        future = self._submit_download(executor, url, class_folder, class_name, cancel_token)
+                        futures[future] = url
+                        pending.add(future)
+
+                        # Report downloads that finished while the browser was scrolling
+                        for done in [f for f in pending if f.done()]:
+                            pending.discard(done)
+                            record_result(done)
+
+                        if len(futures) + known_count >= max_images:
+                            break
+
+                    if progress_callback:
+                        progress_callback(f"Found {len(futures)} images. Starting download...")
+
+                    scraping_logger.info(f"📊 Found {len(futures)} image URLs, finishing downloads...")
+                    if skipped_count:
+                        scraping_logger.info(f"⏭️ Skipped {skipped_count} URLs that were already fetched")
+                    if known_count:
+                        scraping_logger.info(f"⏭️ Skipped {known_count} images already saved in '{class_name}'")
+
+                    for done in as_completed(pending):
+                        record_result(done)
+                except JobCancelled:
+                    if self.async_downloader:
+                        # Coroutines see the token and stop on their own; wait so cleanup sees every saved file
+                        wait(pending)
+                    else:
+                        # Drop queued downloads; running ones see the token and stop on their own
+                        for future in pending:
+                            future.cancel()
+                    raise
+
+            self.last_stats = {
+                'downloaded': downloaded_count,
+                'failed': failed_count,
+                'skipped_known': known_count,
+                'skipped_checkpoint': skipped_count,
+                'duplicates': duplicate_count
+            }
 
             success_msg = f"✅ Download complete! {downloaded_count} images saved, {failed_count} failed"
+            if duplicate_count:
+                success_msg += f", {duplicate_count} duplicates dropped"
+            if known_count:
+                success_msg += f", {known_count} already present"
             scraping_logger.success(success_msg)
             scraping_logger.info(f"📁 Images saved to: {class_folder}")
 
             if progress_callback:
-                progress_callback(f"Download complete! {downloaded_count} images saved to {class_folder}")
+                progress_callback(f"Download complete! {downloaded_count} images saved to {class_folder}"
+                                  + (f" ({known_count} already present)" if known_count else ""))
 
             return downloaded_count, class_folder
 
+        except JobCancelled as e:
+            scraping_logger.warning(f"🛑 Scraping cancelled: {str(e)}")
+            if cleanup_on_cancel and class_folder:
+                removed = self._remove_downloaded(futures, class_folder, url_callback)
+                scraping_logger.info(f"🧹 Removed {removed} images saved before cancellation")
+            if progress_callback:
+                progress_callback(f"Cancelled: {str(e)}")
+            raise
+
         except Exception as e:
             error_msg = f"❌ Error during scraping: {str(e)}"
             scraping_logger.error(error_msg)
@@ -403,14 +885,47 @@ class GoogleImageScraper:
                 progress_callback(error_msg)
             return 0, None
 
+    def _remove_downloaded(self, futures, class_folder, url_callback=None):
+        """Delete the files saved by finished download futures. Returns how many were removed."""
+        removed = 0
+        for future, url in futures.items():
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                continue
+            filename = future.result()
+            if not filename:
+                continue
+
+            file_path = os.path.join(class_folder, filename)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+                removed += 1
+            if self.content_index:
+                self.content_index.forget(class_folder, filename)
+            if self.near_dup_index:
+                self.near_dup_index.forget(class_folder, filename)
+            if self.catalog:
+                self.catalog.remove_image(class_folder, filename)
+            if self.url_index:
+                self.url_index.forget(url, class_folder)
+            if url_callback:
+                # Let checkpoints fetch it again on resume
+                url_callback(url, 'discovered', None)
+        return removed
+
     def close(self):
-        """Close the WebDriver and session."""
+        """Close the WebDriver, session and async downloader."""
         try:
             if hasattr(self, 'driver') and self.driver:
-                scraping_logger.info("🔒 Closing WebDriver...")
-                self.driver.quit()
-                self.driver = None
-                scraping_logger.success("✅ WebDriver closed successfully")
+                if getattr(self, 'driver_pool', None):
+                    scraping_logger.info("🔁 Returning WebDriver to pool...")
+                    self.driver_pool.checkin(self.driver)
+                    self.driver = None
+                    scraping_logger.success("✅ WebDriver returned to pool")
+                else:
+                    scraping_logger.info("🔒 Closing WebDriver...")
+                    self.driver.quit()
+                    self.driver = None
+                    scraping_logger.success("✅ WebDriver closed successfully")
         except Exception as e:
             scraping_logger.error(f"❌ Error closing WebDriver: {str(e)}")
 
@@ -422,6 +937,14 @@ class GoogleImageScraper:
         except Exception as e:
             scraping_logger.error(f"❌ Error closing session: {str(e)}")
 
+        try:
+            if getattr(self, 'async_downloader', None):
+                scraping_logger.debug("🔒 Stopping async downloader...")
+                self.async_downloader.close()
+                self.async_downloader = None
+        except Exception as e:
+            scraping_logger.error(f"❌ Error stopping async downloader: {str(e)}")
+
     def __del__(self):
         """Destructor to ensure WebDriver is closed."""
         self.close()
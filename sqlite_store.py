@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+class SQLiteStore:
+    """
+    Small base class for the app's SQLite-backed state.
+
+    One connection is shared by all threads and serialized with a lock.
+    Every write is committed immediately, so the data survives a crash
+    or restart. Subclasses set SCHEMA to their CREATE TABLE statements.
+    """
+
+    SCHEMA = ''
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            if self.SCHEMA:
+                self.conn.executescript(self.SCHEMA)
+            self.conn.commit()
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a write statement and commit it. Returns the number of affected rows."""
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Run a write statement for many rows in one transaction."""
+        with self.lock, self.conn:
+            return self.conn.executemany(sql, rows).rowcount
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
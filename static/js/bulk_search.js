@@ -151,10 +151,14 @@ function collectBulkSearchData() {
         }
     });
 
+    const workerProcesses = document.getElementById('worker_processes').value.trim();
+
     return {
         search_entries: searchEntries,
         images_per_class: parseInt(document.getElementById('images_per_class').value),
-        destination_folder: document.getElementById('destination_folder').value.trim()
+        destination_folder: document.getElementById('destination_folder').value.trim(),
+        full_resolution: document.getElementById('full_resolution').checked,
+        worker_processes: workerProcesses === '' ? null : parseInt(workerProcesses)
     };
 }
 
@@ -311,6 +315,8 @@ function resetToForm() {
 
     document.getElementById('images_per_class').value = '100';
     document.getElementById('destination_folder').value = '';
+    document.getElementById('full_resolution').checked = false;
+    document.getElementById('worker_processes').value = '';
 
     // Clear validation errors
     clearValidationErrors();
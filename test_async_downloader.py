@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio download engine.
+Images come from a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import async_downloader
+from cancellation import CancellationToken, JobCancelled
+from config import Config
+from http_client import httpx
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+
+class SlowImageHandler(ImageHandler):
+    """Serves a fresh PNG after a short delay; /text/* is HTML, /missing/* is 404, /flaky/* fails once."""
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    hits = Counter()
+    delay = 0.2
+
+    def do_GET(self):
+        cls = SlowImageHandler
+        with cls.lock:
+            cls.hits[self.path] += 1
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(cls.delay)
+            if self.path.startswith('/missing/') or (self.path.startswith('/flaky/') and cls.hits[self.path] == 1):
+                self.send_body(b'', 'text/plain', 404 if self.path.startswith('/missing/') else 503)
+            elif self.path.startswith('/text/'):
+                self.send_body(b'<html></html>' * 100, 'text/html')
+            else:
+                self.send_body(make_png_bytes())
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+def start_slow_server():
+    SlowImageHandler.active = SlowImageHandler.peak = 0
+    SlowImageHandler.hits = Counter()
+    server, host = start_server(SlowImageHandler)
+    return server, f'http://{host}'
+
+def make_async_scraper(urls, **kwargs):
+    return make_scraper(urls, download_engine='asyncio', **kwargs)
+
+def test_async_engine_downloads_concurrently():
+    """Downloads run as coroutines, many at once but within the per-host cap."""
+    print("🧪 Testing asyncio engine concurrency...")
+    if httpx is None:
+        print("⏭️ httpx is not installed, skipping")
+        return
+
+    server, base_url = start_slow_server()
+    folder = tempfile.mkdtemp()
+    original = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    try:
+        urls = [f'{base_url}/img/{n}.png' for n in range(24)]
+        scraper = make_async_scraper(urls, download_workers=1, max_per_host=12)
+        threads_before = threading.active_count()
+        started = time.time()
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'cats', len(urls))
+        elapsed = time.time() - started
+        assert threading.active_count() - threads_before < 12  # no thread per download
+        scraper.close()
+
+        assert downloaded == 24, downloaded
+        assert len(os.listdir(class_folder)) == 24
+        assert 1 < SlowImageHandler.peak <= 12, SlowImageHandler.peak
+        assert elapsed < 24 * SlowImageHandler.delay / 2, elapsed
+        assert scraper.async_downloader is None  # stopped by close()
+        print(f"✅ 24 downloads in {elapsed:.2f}s, peak {SlowImageHandler.peak} in flight")
+    finally:
+        Config.UPLOAD_FOLDER = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_async_engine_rejects_and_retries():
+    """Non-images and 404s fail, transient errors are retried, like the thread engine."""
+    print("🧪 Testing asyncio engine error handling...")
+    if httpx is None:
+        print("⏭️ httpx is not installed, skipping")
+        return
+
+    server, base_url = start_slow_server()
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, async_downloader.download_retry_policy)
+    Config.UPLOAD_FOLDER = folder
+    from retry import RetryPolicy
+    async_downloader.download_retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+    try:
+        urls = [f'{base_url}/text/1.png', f'{base_url}/missing/1.png', f'{base_url}/flaky/1.png', f'{base_url}/ok/1.png']
+        statuses = {}
+        scraper = make_async_scraper(urls)
+        downloaded, _ = scraper.scrape_images('q', folder, 'dogs', len(urls),
+                                              url_callback=lambda url, status, filename: statuses.__setitem__(url, status))
+        scraper.close()
+
+        assert downloaded == 2, statuses
+        assert statuses[urls[0]] == statuses[urls[1]] == 'failed'
+        assert statuses[urls[2]] == statuses[urls[3]] == 'downloaded'
+        assert SlowImageHandler.hits['/flaky/1.png'] == 2
+        assert scraper.last_stats['failed'] == 2
+        print("✅ Errors are handled the same way as with threads")
+    finally:
+        Config.UPLOAD_FOLDER, async_downloader.download_retry_policy = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_async_engine_cancellation():
+    """Cancelling the job stops in-flight coroutines and cleans up saved images."""
+    print("🧪 Testing asyncio engine cancellation...")
+    if httpx is None:
+        print("⏭️ httpx is not installed, skipping")
+        return
+
+    server, base_url = start_slow_server()
+    folder = tempfile.mkdtemp()
+    original = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    SlowImageHandler.delay = 0.5
+    try:
+        urls = [f'{base_url}/img/{n}.png' for n in range(40)]
+        scraper = make_async_scraper(urls, max_per_host=4)
+        token = CancellationToken()
+        threading.Timer(0.8, token.cancel).start()
+        started = time.time()
+        try:
+            scraper.scrape_images('q', folder, 'birds', len(urls), cancel_token=token, cleanup_on_cancel=True)
+            assert False, "expected JobCancelled"
+        except JobCancelled:
+            pass
+        elapsed = time.time() - started
+        scraper.close()
+
+        assert elapsed < 3, elapsed
+        class_folder = os.path.join(folder, 'birds')
+        assert not os.path.isdir(class_folder) or os.listdir(class_folder) == []
+        print(f"✅ Cancelled after {elapsed:.2f}s and removed partial results")
+    finally:
+        SlowImageHandler.delay = 0.2
+        Config.UPLOAD_FOLDER = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_engine_selection():
+    """Unknown engines are refused and a missing httpx falls back to threads."""
+    print("🧪 Testing download engine selection...")
+    try:
+        make_scraper([], download_engine='fibers')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    original = async_downloader.httpx
+    async_downloader.httpx = None
+    try:
+        scraper = make_async_scraper([])
+        assert scraper.async_downloader is None
+        scraper.close()
+    finally:
+        async_downloader.httpx = original
+    print("✅ Engine selection works")
+
+def main():
+    """Run all asyncio download engine tests."""
+    print("🚀 Starting async downloader tests...\n")
+
+    tests = [
+        ("Async Concurrency", test_async_engine_downloads_concurrently),
+        ("Async Error Handling", test_async_engine_rejects_and_retries),
+        ("Async Cancellation", test_async_engine_cancellation),
+        ("Engine Selection", test_engine_selection),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-process bulk runner.
+These tests use a fake worker that does not start Chrome.
+"""
+
+import os
+import sys
+import threading
+import time
+
+from bulk_runner import resolve_worker_count, run_bulk_parallel
+from cancellation import CancellationToken
+
+def fake_worker(worker_id, task_queue, event_queue, settings, stop_event):
+    """Stand-in for bulk_runner._worker_main: 'downloads' images_per_class images per entry."""
+    images_per_class = settings['images_per_class']
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        index, entry, destination = task['index'], task['entry'], task['destination']
+        max_images = task.get('max_images', images_per_class)
+        event_queue.put({'type': 'started', 'worker': worker_id, 'index': index})
+        for n in range(max_images):
+            url = f'http://img.test/{index}/{n}.jpg'
+            if url not in task.get('skip_urls', []):
+                event_queue.put({'type': 'url', 'worker': worker_id, 'index': index,
+                                 'url': url, 'status': 'downloaded', 'filename': f'{n}.jpg'})
+        event_queue.put({'type': 'progress', 'worker': worker_id, 'index': index, 'message': 'Downloading image 1/1'})
+        event_queue.put({'type': 'log', 'worker': worker_id, 'level': 'INFO', 'message': f"pid {os.getpid()}"})
+
+        if entry['keyword'] == 'broken':
+            event_queue.put({'type': 'result', 'worker': worker_id, 'index': index, 'status': 'failed',
+                             'downloaded': 0, 'class_folder': None, 'error': 'boom'})
+        else:
+            event_queue.put({'type': 'result', 'worker': worker_id, 'index': index, 'status': 'done',
+                             'downloaded': max_images, 'class_folder': os.path.join(destination, entry['className']),
+                             'error': None})
+    event_queue.put({'type': 'worker_done', 'worker': worker_id})
+
+def crashing_worker(worker_id, task_queue, event_queue, settings, stop_event):
+    """Takes one entry and dies without reporting back."""
+    task_queue.get()
+    os._exit(3)
+
+def slow_worker(worker_id, task_queue, event_queue, settings, stop_event):
+    """Works on each entry until the parent sets stop_event."""
+    while not stop_event.is_set():
+        task = task_queue.get()
+        if task is None:
+            break
+        event_queue.put({'type': 'started', 'worker': worker_id, 'index': task['index']})
+        if stop_event.wait(30):
+            event_queue.put({'type': 'result', 'worker': worker_id, 'index': task['index'], 'status': 'cancelled',
+                             'downloaded': 0, 'class_folder': None, 'error': 'Cancelled by user'})
+    event_queue.put({'type': 'worker_done', 'worker': worker_id})
+
+def test_resolve_worker_count():
+    """Worker count is capped by the number of entries and 0 means one per core."""
+    print("🧪 Testing worker count resolution...")
+    assert resolve_worker_count(4, 10) == 4
+    assert resolve_worker_count(8, 3) == 3
+    assert resolve_worker_count(1, 3) == 1
+    assert resolve_worker_count(0, 1000) == (os.cpu_count() or 1)
+    print("✅ Worker count resolved correctly")
+
+def test_entries_spread_across_workers():
+    """Every entry gets a result, in input order, with progress merged into one stream."""
+    print("🧪 Testing parallel bulk run...")
+    entries = [{'keyword': f'kw{i}', 'className': f'class{i}'} for i in range(6)]
+    entries.append({'keyword': 'broken', 'className': 'broken', 'destinationFolder': '/tmp/elsewhere'})
+
+    progress = []
+    updates = []
+    results = run_bulk_parallel(entries, 5, '/tmp/dest', 3,
+                                progress_callback=progress.append,
+                                entry_callback=lambda result: updates.append(dict(result)),
+                                worker_target=fake_worker)
+
+    assert [r['className'] for r in results] == [e['className'] for e in entries]
+    assert all(r['status'] == 'done' and r['downloaded'] == 5 for r in results[:-1])
+    assert results[-1]['status'] == 'failed' and results[-1]['error'] == 'boom'
+    assert results[-1]['destination'] == '/tmp/elsewhere'
+    assert results[0]['class_folder'] == os.path.join('/tmp/dest', 'class0')
+    assert {r['worker'] for r in results} <= {1, 2, 3}
+    assert progress[-1].startswith('[7/7 done]')
+    assert any(u['status'] == 'running' for u in updates)
+    print(f"✅ {len(results)} entries processed, {len(progress)} progress updates")
+
+def test_entry_options_resume_partial_work():
+    """Finished entries are not dispatched; partial ones get their remaining count and skip list."""
+    print("🧪 Testing resumed bulk run...")
+    entries = [{'keyword': f'kw{i}', 'className': f'class{i}'} for i in range(3)]
+    options = {
+        0: {'done': True, 'downloaded': 4},
+        1: {'downloaded': 1, 'max_images': 3, 'skip_urls': {'http://img.test/1/0.jpg'}},
+    }
+    urls = []
+    results = run_bulk_parallel(entries, 4, '/tmp/dest', 2, entry_options=options,
+                                url_callback=lambda *args: urls.append(args),
+                                worker_target=fake_worker)
+
+    assert [r['status'] for r in results] == ['done', 'done', 'done']
+    assert results[0]['worker'] is None
+    assert [r['downloaded'] for r in results] == [4, 4, 4]
+    assert not any(index == 0 for index, *_ in urls)
+    assert (1, 'http://img.test/1/0.jpg', 'downloaded', '0.jpg') not in urls
+    assert (1, 'http://img.test/1/2.jpg', 'downloaded', '2.jpg') in urls
+    print(f"✅ Resumed run forwarded {len(urls)} URL updates")
+
+def test_crashed_worker_fails_remaining_entries():
+    """Entries left behind by a dead worker are reported as failed instead of hanging."""
+    print("🧪 Testing crashed worker handling...")
+    entries = [{'keyword': 'a', 'className': 'a'}, {'keyword': 'b', 'className': 'b'}]
+    results = run_bulk_parallel(entries, 1, '/tmp/dest', 1, worker_target=crashing_worker)
+
+    assert all(r['status'] == 'failed' for r in results)
+    assert all(r['error'] for r in results)
+    print("✅ Crashed worker did not block the bulk job")
+
+def test_cancel_stops_workers():
+    """Cancelling the token stops the workers promptly and marks unfinished entries cancelled."""
+    print("🧪 Testing bulk cancellation...")
+    entries = [{'keyword': f'kw{i}', 'className': f'class{i}'} for i in range(5)]
+    token = CancellationToken()
+    threading.Timer(0.5, token.cancel).start()
+
+    started = time.time()
+    results = run_bulk_parallel(entries, 1, '/tmp/dest', 2, cancel_token=token, worker_target=slow_worker)
+    elapsed = time.time() - started
+
+    assert elapsed < 10, f"cancellation took {elapsed:.1f}s"
+    assert all(r['status'] == 'cancelled' for r in results)
+    print(f"✅ Workers stopped {elapsed:.1f}s after start")
+
+def main():
+    """Run all bulk runner tests."""
+    print("🚀 Starting bulk runner tests...\n")
+
+    tests = [
+        ("Worker Count", test_resolve_worker_count),
+        ("Parallel Bulk Run", test_entries_spread_across_workers),
+        ("Resumed Bulk Run", test_entry_options_resume_partial_work),
+        ("Crashed Worker", test_crashed_worker_fails_remaining_entries),
+        ("Cancellation", test_cancel_stops_workers),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for cooperative job cancellation and deadlines.
+Images are served by a local HTTP server (one endpoint streams very slowly),
+so these tests need neither Chrome nor internet access.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from cancellation import CancellationToken, JobCancelled
+from config import Config
+from jobs import JobManager
+from rate_limiter import TokenBucket
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+
+class TricklingHandler(ImageHandler):
+    """/fast/* returns an image at once; /slow/* trickles a large body out over ~30 seconds."""
+
+    def do_GET(self):
+        if self.path.startswith('/fast/'):
+            self.send_body(make_png_bytes())
+            return
+
+        # A real image header first, so the download is not rejected on its first bytes
+        head = make_png_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(head) + 300 * 8192))
+        self.end_headers()
+        try:
+            self.wfile.write(head)
+            for _ in range(300):
+                self.wfile.write(b'\0' * 8192)
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def test_token_cancel_and_deadline():
+    """Tokens report cancellation, their reason and deadline expiry."""
+    print("🧪 Testing cancellation tokens...")
+    token = CancellationToken()
+    assert not token.cancelled and token.remaining() is None
+    token.cancel('stop')
+    assert token.cancelled and token.reason == 'stop'
+    try:
+        token.raise_if_cancelled()
+        assert False, "expected JobCancelled"
+    except JobCancelled as e:
+        assert str(e) == 'stop'
+
+    token = CancellationToken.with_timeout(0.2)
+    started = time.time()
+    assert token.wait(5) is True
+    assert time.time() - started < 1
+    assert token.reason == 'Deadline exceeded'
+    assert not CancellationToken.with_timeout(0).cancelled
+    print("✅ Tokens behave as expected")
+
+def test_rate_limiter_wait_is_interruptible():
+    """A job waiting on a throttled host wakes up as soon as it is cancelled."""
+    print("🧪 Testing cancellable rate limiter wait...")
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.acquire()
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    started = time.time()
+    try:
+        bucket.acquire(token)
+        assert False, "expected JobCancelled"
+    except JobCancelled:
+        pass
+    assert time.time() - started < 2
+    print("✅ Rate limiter wait ended on cancellation")
+
+def test_cancel_stops_downloads_and_cleans_up():
+    """Cancelling scrape_images aborts a slow download, removes its partial file and, optionally, saved images."""
+    print("🧪 Testing download cancellation...")
+    server, host = start_server(TricklingHandler)
+    base_url = f'http://{host}'
+    folder = tempfile.mkdtemp()
+    original_upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    try:
+        for cleanup in (False, True):
+            urls = [f'{base_url}/fast/{cleanup}-{n}.png' for n in range(2)] + [f'{base_url}/slow/{cleanup}.png']
+            scraper = make_scraper(urls, download_workers=4)
+            token = CancellationToken()
+            threading.Timer(1.0, token.cancel).start()
+            class_name = f'cleanup_{cleanup}'
+
+            started = time.time()
+            try:
+                scraper.scrape_images('q', folder, class_name, 3, cancel_token=token, cleanup_on_cancel=cleanup)
+                assert False, "expected JobCancelled"
+            except JobCancelled:
+                pass
+            finally:
+                scraper.close()
+            elapsed = time.time() - started
+
+            files = os.listdir(os.path.join(folder, class_name))
+            assert elapsed < 5, f"cancellation took {elapsed:.1f}s"
+            assert len(files) == (0 if cleanup else 2), files
+            print(f"✅ cleanup_on_cancel={cleanup}: stopped after {elapsed:.1f}s, {len(files)} files kept")
+    finally:
+        Config.UPLOAD_FOLDER = original_upload_folder
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_job_deadline_cancels_job():
+    """A job running past its deadline is stopped and marked cancelled."""
+    print("🧪 Testing job deadlines...")
+    manager = JobManager(max_concurrent=1, default_deadline=0.3)
+
+    def runaway(job):
+        while True:
+            job.token.wait(0.05)
+            job.token.raise_if_cancelled()
+
+    job = manager.submit('scrape', 'runaway', runaway)
+    quick = manager.submit('scrape', 'quick', lambda job: None, deadline_seconds=0)
+
+    deadline = time.time() + 5
+    while time.time() < deadline and quick.state != 'done':
+        time.sleep(0.01)
+
+    assert job.state == 'cancelled'
+    assert job.error == 'Deadline exceeded'
+    assert quick.state == 'done' and quick.to_dict()['deadline'] is None
+    print("✅ Runaway job stopped at its deadline")
+
+def main():
+    """Run all cancellation tests."""
+    print("🚀 Starting cancellation tests...\n")
+
+    tests = [
+        ("Cancellation Tokens", test_token_cancel_and_deadline),
+        ("Rate Limiter Wait", test_rate_limiter_wait_is_interruptible),
+        ("Download Cancellation", test_cancel_stops_downloads_and_cleans_up),
+        ("Job Deadline", test_job_deadline_cancels_job),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
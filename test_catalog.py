@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite image catalog behind the dashboard and gallery.
+Images are generated locally and served by a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import catalog as catalog_module
+from catalog import ImageCatalog
+from config import Config
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server, write_image
+
+class FormatHandler(ImageHandler):
+    """Serves a BMP for *.bmp paths and a PNG for anything else."""
+
+    def do_GET(self):
+        image_format = 'BMP' if self.path.endswith('.bmp') else 'PNG'
+        self.send_body(make_png_bytes((64, 48), image_format), f'image/{image_format.lower()}')
+
+class CatalogFixture:
+    """Temporary upload folder with a private catalog installed as the process-wide one."""
+
+    def __enter__(self):
+        self.folder = tempfile.mkdtemp()
+        self.catalog = ImageCatalog(os.path.join(self.folder, 'catalog.sqlite3'))
+        self.root = os.path.join(self.folder, 'images')
+        os.makedirs(self.root)
+        self.original = (catalog_module._image_catalog, Config.UPLOAD_FOLDER, Config.CATALOG_ENABLED)
+        catalog_module._image_catalog = self.catalog
+        Config.UPLOAD_FOLDER = self.root
+        Config.CATALOG_ENABLED = True
+        return self
+
+    def __exit__(self, *exc_info):
+        catalog_module._image_catalog, Config.UPLOAD_FOLDER, Config.CATALOG_ENABLED = self.original
+        self.catalog.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+def test_rebuild_and_scan():
+    """A new root is scanned once; scan_class picks up changes made on disk."""
+    print("🧪 Testing catalog rebuild and scans...")
+    with CatalogFixture() as fx:
+        cats = os.path.join(fx.root, 'cats')
+        for n in range(3):
+            write_image(cats, f'cat_{n}.png')
+        with open(os.path.join(cats, 'notes.txt'), 'w') as f:
+            f.write('not an image')
+        os.makedirs(os.path.join(fx.root, 'empty'))
+
+        classes = {c['name']: c for c in fx.catalog.get_classes(fx.root)}
+        assert classes['cats']['image_count'] == 3 and classes['empty']['image_count'] == 0
+        sizes = sum(os.path.getsize(os.path.join(cats, f'cat_{n}.png')) for n in range(3))
+        assert classes['cats']['total_bytes'] == sizes
+        image = fx.catalog.get_image(cats, 'cat_0.png')
+        assert (image['width'], image['height']) == (64, 48)
+
+        # Changes made outside the app show up after a scan of that folder only
+        os.remove(os.path.join(cats, 'cat_0.png'))
+        write_image(cats, 'cat_9.png')
+        write_image(cats, 'cat_1.png', size=(80, 80))
+        assert fx.catalog.get_class(cats)['image_count'] == 3
+        assert fx.catalog.scan_class(cats) == {'added': 1, 'updated': 1, 'removed': 1}
+        assert fx.catalog.get_image(cats, 'cat_1.png')['width'] == 80
+        assert fx.catalog.scan_class(cats) == {'added': 0, 'updated': 0, 'removed': 0}
+
+        shutil.rmtree(os.path.join(fx.root, 'empty'))
+        counts = fx.catalog.rebuild(fx.root)
+        assert counts['classes'] == 1 and counts['removed'] == 0
+        assert [c['name'] for c in fx.catalog.get_classes(fx.root)] == ['cats']
+    print("✅ Rebuilds and scans keep the catalog in step with the disk")
+
+def test_utils_served_from_catalog():
+    """The dashboard helpers read the catalog and the file helpers keep it current."""
+    print("🧪 Testing catalog-backed utils...")
+    import utils
+
+    with CatalogFixture() as fx:
+        dogs = utils.create_class_folder(None, 'dogs')
+        for n in range(4):
+            write_image(dogs, f'dog_{n}.png')
+        fx.catalog.scan_class(dogs)
+
+        assert [c['name'] for c in utils.get_all_classes(fx.root)] == ['dogs']
+        assert utils.count_images_in_folder(dogs) == 4
+        images = utils.get_images_in_class(fx.root, 'dogs')
+        assert [i['filename'] for i in images] == [f'dog_{n}.png' for n in range(4)]
+        assert images[0]['relative_path'] == 'dogs/dog_0.png' and images[0]['width'] == 64
+
+        info = utils.get_folder_info(fx.root, 'dogs')
+        assert info['image_count'] == 4
+        assert info['size_bytes'] == sum(os.path.getsize(i['path']) for i in images)
+
+        # No directory listing on the request path: a file dropped on disk is not seen until scanned
+        write_image(dogs, 'dropped.png')
+        assert utils.count_images_in_folder(dogs) == 4
+
+        assert utils.delete_image(fx.root, 'dogs', 'dog_0.png')
+        assert utils.count_images_in_folder(dogs) == 3
+        assert utils.get_folder_info(fx.root, 'dogs')['image_count'] == 3
+
+        assert utils.delete_folder(fx.root, 'dogs')
+        assert utils.get_all_classes(fx.root) == []
+        assert fx.catalog.get_image(dogs, 'dog_1.png') is None
+    print("✅ Dashboard helpers are served from the catalog")
+
+def test_scraper_and_routes_update_catalog():
+    """Downloads, moves and deletes through the app are reflected without a rescan."""
+    print("🧪 Testing catalog updates from the scraper and routes...")
+    import app as app_module
+
+    server, host = start_server(FormatHandler)
+
+    with CatalogFixture() as fx:
+        original_app_folder = app_module.app.config['UPLOAD_FOLDER']
+        app_module.app.config['UPLOAD_FOLDER'] = fx.root
+        try:
+            urls = [f'http://{host}/img/{n}.png' for n in range(3)]
+            scraper = make_scraper(urls, catalog=fx.catalog)
+            downloaded, birds = scraper.scrape_images('q', fx.root, 'birds', 3)
+            scraper.close()
+            assert downloaded == 3
+
+            images = fx.catalog.get_images(birds)
+            assert len(images) == 3 and all(len(image['sha256']) == 64 for image in images)
+            assert sorted(image['source_url'] for image in images) == urls
+
+            client = app_module.app.test_client()
+            moved = client.post('/api/move-images', json={
+                'images': [f"birds/{images[0]['filename']}"], 'source_folder': 'birds',
+                'destination_folder': 'parrots', 'create_new': True}).get_json()
+            assert moved['moved_count'] == 1
+            parrot = fx.catalog.get_image(os.path.join(fx.root, 'parrots'), images[0]['filename'])
+            assert parrot['source_url'] == images[0]['source_url']
+
+            deleted = client.post('/api/delete-images', json={
+                'images': [f"birds/{images[1]['filename']}"], 'folder': 'birds'}).get_json()
+            assert deleted['deleted_count'] == 1
+
+            counts = {c['name']: c['image_count'] for c in fx.catalog.get_classes(fx.root)}
+            assert counts == {'birds': 1, 'parrots': 1}, counts
+            rebuilt = client.post('/api/catalog/rebuild').get_json()
+            assert (rebuilt['added'], rebuilt['updated'], rebuilt['removed']) == (0, 0, 0), rebuilt
+        finally:
+            app_module.app.config['UPLOAD_FOLDER'] = original_app_folder
+            server.shutdown()
+    print("✅ The catalog stays current without rescans")
+
+def test_bmp_downloads_survive_scans():
+    """Every type the downloader saves is an image file to the catalog, so a rescan keeps it."""
+    print("🧪 Testing BMP downloads in the catalog...")
+    server, host = start_server(FormatHandler)
+
+    with CatalogFixture() as fx:
+        try:
+            urls = [f'http://{host}/img/{n}.bmp' for n in range(2)]
+            scraper = make_scraper(urls, catalog=fx.catalog)
+            downloaded, lizards = scraper.scrape_images('q', fx.root, 'lizards', 2)
+            scraper.close()
+            assert downloaded == 2
+            filenames = sorted(os.listdir(lizards))
+            assert all(name.endswith('.bmp') for name in filenames), filenames
+
+            assert fx.catalog.scan_class(lizards) == {'added': 0, 'updated': 0, 'removed': 0}
+            assert sorted(image['filename'] for image in fx.catalog.get_images(lizards)) == filenames
+            assert fx.catalog.get_class(lizards)['image_count'] == 2
+
+            # A catalog built from the disk alone, as after a restart, finds them too
+            fx.catalog.remove_class(lizards)
+            assert fx.catalog.scan_class(lizards)['added'] == 2
+            assert fx.catalog.get_class(lizards)['image_count'] == 2
+        finally:
+            server.shutdown()
+    print("✅ BMP downloads stay in the catalog after a rescan")
+
+def main():
+    """Run all image catalog tests."""
+    print("🚀 Starting image catalog tests...\n")
+
+    tests = [
+        ("Rebuild And Scan", test_rebuild_and_scan),
+        ("Catalog-backed Utils", test_utils_served_from_catalog),
+        ("Scraper And Routes", test_scraper_and_routes_update_catalog),
+        ("BMP Downloads", test_bmp_downloads_survive_scans),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk job checkpoints and resume.
+These tests use a temporary SQLite file and a fake scraper, so no Chrome is needed.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import testing_helpers  # noqa: F401 - keeps the app's databases out of instance/
+from checkpoints import CheckpointStore
+
+def make_store():
+    folder = tempfile.mkdtemp()
+    return CheckpointStore(os.path.join(folder, 'state', 'checkpoints.sqlite3'))
+
+def dead_pid():
+    """The pid of a process that has exited."""
+    process = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, text=True)
+    return int(process.stdout)
+
+def set_owner(store, job_id, pid, host=None):
+    store.execute('UPDATE jobs SET owner_pid = ?, owner_host = ? WHERE job_id = ?',
+                  (pid, host or socket.gethostname(), job_id))
+
+def test_store_round_trip():
+    """Jobs, entries and URLs are persisted and survive reopening the file."""
+    print("🧪 Testing checkpoint store...")
+    store = make_store()
+    store.save_job('job1', 'bulk', 'Bulk search (2 entries)', {'images_per_class': 3}, 'running')
+    store.record_entry('job1', 0, 'done', 3, '/tmp/cats')
+    store.record_url('job1', 1, 'http://a/1.jpg', 'discovered')
+    store.record_url('job1', 1, 'http://a/1.jpg', 'downloaded', 'dogs_1.jpg')
+    store.record_url('job1', 1, 'http://a/2.jpg', 'failed')
+    store.record_url('job1', 1, 'http://a/3.jpg', 'discovered')
+    store.close()
+
+    store = CheckpointStore(store.path)
+    job = store.get_job('job1')
+    assert job['params'] == {'images_per_class': 3}
+    assert store.get_entries('job1')[0]['class_folder'] == '/tmp/cats'
+    assert store.downloaded_count('job1', 1) == 1
+    assert store.attempted_urls('job1', 1) == {'http://a/1.jpg', 'http://a/2.jpg'}
+
+    # A new process marks jobs the old one left running as interrupted
+    assert store.mark_interrupted() == 0  # still owned by this process
+    set_owner(store, 'job1', dead_pid())
+    assert store.mark_interrupted() == 1
+    listed = store.list_jobs(['interrupted'])
+    assert [j['job_id'] for j in listed] == ['job1']
+    assert listed[0]['entries_done'] == 1 and listed[0]['urls_downloaded'] == 1
+
+    store.save_job('job1', 'bulk', 'ignored', {'changed': True}, 'running')
+    assert store.get_job('job1')['params'] == {'images_per_class': 3}
+
+    store.delete_job('job1')
+    assert store.get_job('job1') is None
+    print("✅ Checkpoint store round trip works")
+
+class FakeScraper:
+    """Stand-in for GoogleImageScraper that 'downloads' URLs and can fail once per class."""
+
+    calls = []
+    fail_classes = set()
+
+    def __init__(self, *args, **kwargs):
+        self.last_stats = {}
+
+    def scrape_images(self, query, destination_folder, class_name, max_images=20, progress_callback=None,
+                      full_resolution=None, skip_urls=None, url_callback=None, **kwargs):
+        FakeScraper.calls.append((class_name, max_images, set(skip_urls or ())))
+        downloaded = 0
+        for n in range(10):
+            url = f'http://img.test/{class_name}/{n}.jpg'
+            if url in (skip_urls or ()):
+                continue
+            url_callback(url, 'discovered', None)
+            url_callback(url, 'downloaded', f'{class_name}_{n}.jpg')
+            downloaded += 1
+            if class_name in FakeScraper.fail_classes and downloaded == 1:
+                FakeScraper.fail_classes.discard(class_name)
+                raise RuntimeError('process died mid-entry')
+            if downloaded >= max_images:
+                break
+        return downloaded, os.path.join(destination_folder, class_name)
+
+    def close(self):
+        pass
+
+def wait_for_state(job, states, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline and job.state not in states:
+        time.sleep(0.01)
+    return job.state
+
+def test_resume_skips_completed_work():
+    """Resuming a bulk job skips finished entries and URLs fetched before the failure."""
+    print("🧪 Testing bulk job resume...")
+    import app as app_module
+
+    original_store = app_module.checkpoint_store
+    original_scraper = app_module.GoogleImageScraper
+    app_module.checkpoint_store = make_store()
+    app_module.GoogleImageScraper = FakeScraper
+    FakeScraper.calls = []
+    FakeScraper.fail_classes = {'dogs'}
+
+    try:
+        client = app_module.app.test_client()
+        response = client.post('/api/jobs', json={
+            'type': 'bulk',
+            'images_per_class': 3,
+            'worker_processes': 1,
+            'destination_folder': tempfile.mkdtemp(),
+            'search_entries': [{'keyword': 'cats', 'className': 'cats'},
+                               {'keyword': 'dogs', 'className': 'dogs'}]
+        })
+        job_id = response.get_json()['job']['id']
+        job = app_module.job_manager.get(job_id)
+        assert wait_for_state(job, ('done', 'failed')) == 'done'
+        assert [entry['status'] for entry in job.entries] == ['done', 'failed']
+
+        checkpoints = client.get('/api/checkpoints').get_json()['jobs']
+        assert checkpoints[0]['job_id'] == job_id and checkpoints[0]['state'] == 'done'
+
+        FakeScraper.calls = []
+        response = client.post(f'/api/jobs/{job_id}/resume')
+        assert response.status_code == 202
+        job = app_module.job_manager.get(job_id)
+        assert wait_for_state(job, ('done', 'failed')) == 'done'
+
+        # Only 'dogs' ran again, for the 2 missing images, skipping the one already saved
+        assert FakeScraper.calls == [('dogs', 2, {'http://img.test/dogs/0.jpg'})]
+        assert [entry['status'] for entry in job.entries] == ['done', 'done']
+        assert job.result['downloaded'] == 6
+
+        assert client.post('/api/jobs/unknown/resume').status_code == 404
+    finally:
+        app_module.checkpoint_store = original_store
+        app_module.GoogleImageScraper = original_scraper
+    print("✅ Resumed job only redid the missing work")
+
+def test_interrupted_marked_at_startup():
+    """At startup only jobs whose owning process is gone are flagged; importing the app flags nothing."""
+    print("🧪 Testing startup marking of interrupted jobs...")
+    import app as app_module
+    from config import Config
+
+    store = make_store()
+    for job_id in ('live', 'dead', 'legacy', 'remote'):
+        store.save_job(job_id, 'bulk', 'Bulk search (1 entries)', {}, 'running')
+    set_owner(store, 'dead', dead_pid())
+    store.execute("UPDATE jobs SET owner_pid = NULL, owner_host = NULL WHERE job_id = 'legacy'")
+    set_owner(store, 'remote', 1, 'another-node')
+
+    def states():
+        return {job['job_id']: job['state'] for job in store.list_jobs()}
+
+    # Bulk worker processes re-run app.py as __mp_main__ when they are spawned
+    code = "import runpy; runpy.run_path('app.py', run_name='__mp_main__')"
+    env = dict(os.environ, CHECKPOINT_DB=store.path, FLASK_DEBUG='True', FOLDER_WATCH_ENABLED='false')
+    subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True, timeout=60,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert set(states().values()) == {'running'}
+
+    original = (app_module.checkpoint_store, Config.FOLDER_WATCH_ENABLED)
+    app_module.checkpoint_store = store
+    Config.FOLDER_WATCH_ENABLED = False
+    try:
+        assert app_module.create_app() is app_module.app
+        assert states() == {'live': 'running', 'dead': 'interrupted', 'legacy': 'interrupted', 'remote': 'running'}
+    finally:
+        app_module.checkpoint_store, Config.FOLDER_WATCH_ENABLED = original
+    print("✅ Only jobs left behind by a finished process were flagged")
+
+def main():
+    """Run all checkpoint tests."""
+    print("🚀 Starting checkpoint tests...\n")
+
+    tests = [
+        ("Checkpoint Store", test_store_round_trip),
+        ("Bulk Job Resume", test_resume_skips_completed_work),
+        ("Startup Marks Interrupted", test_interrupted_marked_at_startup),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for content-hash deduplication of downloads.
+Images are served by a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+from config import Config
+from image_index import ContentIndex, UrlIndex
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+
+SAME_IMAGE = make_png_bytes()
+
+class SameImageHandler(ImageHandler):
+    """/same/* always returns the same image; any other path a new random one."""
+
+    def do_GET(self):
+        self.send_body(SAME_IMAGE if self.path.startswith('/same/') else make_png_bytes())
+
+def make_indexed_scraper(urls, folder):
+    index_path = os.path.join(folder, '.index.sqlite3')
+    return make_scraper(urls, download_workers=1, url_index=UrlIndex(index_path),
+                        content_index=ContentIndex(index_path))
+
+def test_duplicates_dropped_on_download():
+    """Only the first copy of identical bytes is saved; the report counts the rest."""
+    print("🧪 Testing duplicate downloads...")
+    server, host = start_server(SameImageHandler)
+
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, Config.DEDUP_SCOPE)
+    Config.UPLOAD_FOLDER = folder
+    try:
+        urls = [f'http://{host}/same/{n}.png' for n in range(3)] + [f'http://{host}/other/1.png']
+        scraper = make_indexed_scraper(urls, folder)
+        statuses = []
+        downloaded, class_folder = scraper.scrape_images(
+            'q', folder, 'cats', 4, url_callback=lambda url, status, filename: statuses.append(status))
+        assert downloaded == 2, downloaded
+        assert scraper.last_stats['duplicates'] == 2 and scraper.last_stats['failed'] == 0
+        assert statuses.count('duplicate') == 2
+        files = os.listdir(class_folder)
+        assert len(files) == 2 and not any(f.endswith('.part') for f in files), files
+
+        # Duplicate URLs point at the saved copy, so a repeat run skips them too
+        assert all(scraper.url_index.lookup(url, class_folder) for url in urls)
+
+        report = scraper.content_index.get_report()
+        assert report['classes']['cats']['dropped'] == 2
+        assert report['classes']['cats']['files'] == 2
+        assert report['global']['bytes_saved'] == 2 * len(SAME_IMAGE)
+        scraper.close()
+
+        # Another class may keep its own copy unless the scope is global
+        scraper = make_indexed_scraper(urls[:1], folder)
+        assert scraper.scrape_images('q', folder, 'dogs', 1)[0] == 1
+        assert len(scraper.content_index.get_report()['global']['cross_class']) == 1
+        scraper.close()
+
+        Config.DEDUP_SCOPE = 'global'
+        scraper = make_indexed_scraper(urls[:1], folder)
+        assert scraper.scrape_images('q', folder, 'birds', 1)[0] == 0
+        assert scraper.last_stats['duplicates'] == 1
+        scraper.close()
+        print("✅ Duplicates were dropped before reaching the class folder")
+    finally:
+        Config.UPLOAD_FOLDER, Config.DEDUP_SCOPE = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_index_existing_folder():
+    """index_folder hashes images saved before deduplication and reports their duplicates."""
+    print("🧪 Testing folder backfill...")
+    folder = tempfile.mkdtemp()
+    try:
+        class_folder = os.path.join(folder, 'cats')
+        os.makedirs(class_folder)
+        for name, data in (('a.png', SAME_IMAGE), ('b.png', SAME_IMAGE), ('c.png', make_png_bytes()),
+                           ('notes.txt', b'not an image')):
+            with open(os.path.join(class_folder, name), 'wb') as f:
+                f.write(data)
+
+        index = ContentIndex(os.path.join(folder, 'index.sqlite3'))
+        assert index.index_folder(class_folder, 'cats') == 3
+        assert index.index_folder(class_folder, 'cats') == 0
+        cats = index.get_report()['classes']['cats']
+        assert cats['files'] == 3 and cats['unique'] == 2 and cats['duplicate_files'] == 1
+
+        os.remove(os.path.join(class_folder, 'a.png'))
+        os.remove(os.path.join(class_folder, 'b.png'))
+        assert index.find(hashlib.sha256(SAME_IMAGE).hexdigest(), class_folder) is None
+        print("✅ Existing images were indexed")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    """Run all content deduplication tests."""
+    print("🚀 Starting content deduplication tests...\n")
+
+    tests = [
+        ("Duplicate Downloads", test_duplicates_dropped_on_download),
+        ("Folder Backfill", test_index_existing_folder),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
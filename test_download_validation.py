@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for validating downloads before they are written to disk, and for
+abandoning them early from their headers and first bytes.
+Images are served by a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from image_sniff import ImageHeaderProbe, content_length_problem, sniff_image_type
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+from utils import validate_image_bytes, write_new_file_atomic
+
+BODIES = {
+    '/ok.png': make_png_bytes(),
+    '/huge.png': make_png_bytes((256, 256)),
+    '/broken.png': b'<html>' + b'x' * 4096,
+    '/tiny.png': make_png_bytes((4, 4)),
+}
+
+# Served with a Content-Length header: path -> (content type, body, announced length)
+EARLY_ABORT_BODIES = {
+    '/lying.png': ('image/png', b'<html>' + b'x' * 1024 * 1024, None),
+    '/narrow.png': ('image/png', make_png_bytes((8, 400)), None),
+    '/announced-huge.png': ('image/png', make_png_bytes(), 50 * 1024 * 1024),
+    '/announced-tiny.png': ('image/png', make_png_bytes(), 100),
+    '/photo.bin': ('application/octet-stream', make_png_bytes(), None),
+}
+
+class BodiesHandler(ImageHandler):
+    def do_GET(self):
+        if self.path in EARLY_ABORT_BODIES:
+            content_type, body, length = EARLY_ABORT_BODIES[self.path]
+            self.send_body(body, content_type, length=length)
+            return
+
+        # Without a Content-Length, so only the streamed bytes tell what the body is
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.end_headers()
+        self.wfile.write(BODIES[self.path])
+
+def test_helpers():
+    """Image bytes are validated in memory and concurrent writers never share a file."""
+    print("🧪 Testing validation helpers...")
+    assert validate_image_bytes(BODIES['/ok.png'])
+    assert not validate_image_bytes(BODIES['/broken.png'])
+    assert not validate_image_bytes(BODIES['/ok.png'][:200])
+
+    folder = tempfile.mkdtemp()
+    try:
+        # Concurrent writers of the same name (threads here, bulk worker processes in the app)
+        # each claim a different file, without a shared lock
+        def write_copies(worker):
+            return [write_new_file_atomic(folder, 'b.png', f'{worker}-{n}'.encode()) for n in range(5)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            names = [name for names in executor.map(write_copies, range(8)) for name in names]
+        assert len(set(names)) == 40 and 'b.png' in names
+        contents = set()
+        for name in names:
+            with open(os.path.join(folder, name), 'rb') as f:
+                contents.add(f.read())
+        assert len(contents) == 40
+        assert sorted(os.listdir(folder)) == sorted(names)
+        print("✅ Helpers work")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_rejected_images_never_written():
+    """Only the accepted image is written; broken, tiny and oversized ones stay in memory."""
+    print("🧪 Testing in-memory rejection...")
+    import scraper as scraper_module
+
+    server, host = start_server(BodiesHandler)
+
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, Config.MAX_IMAGE_BYTES, scraper_module.write_new_file_atomic)
+    written = []
+
+    def recording_write(folder_path, filename, data):
+        written.append(original[2](folder_path, filename, data))
+        return written[-1]
+
+    Config.UPLOAD_FOLDER = folder
+    Config.MAX_IMAGE_BYTES = len(BODIES['/ok.png']) + 1024
+    scraper_module.write_new_file_atomic = recording_write
+    try:
+        urls = [f'http://{host}{path}' for path in BODIES]
+        scraper = make_scraper(urls)
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'cats', 4)
+        scraper.close()
+
+        assert downloaded == 1 and scraper.last_stats['failed'] == 3
+        assert len(written) == 1 and os.listdir(class_folder) == written
+        print("✅ Rejected images were never written")
+    finally:
+        Config.UPLOAD_FOLDER, Config.MAX_IMAGE_BYTES, scraper_module.write_new_file_atomic = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_header_probe():
+    """File signatures, header dimensions and Content-Length limits are checked from the first bytes."""
+    print("🧪 Testing header sniffing...")
+    assert sniff_image_type(b'\xff\xd8\xff\xe0' + b'\0' * 8) == '.jpg'
+    assert sniff_image_type(b'RIFF\0\0\0\0WEBPVP8 ') == '.webp'
+    assert sniff_image_type(b'GIF89a' + b'\0' * 6) == '.gif'
+    assert sniff_image_type(b'<!DOCTYPE html>') is None
+
+    png = make_png_bytes((16, 300))
+    probe = ImageHeaderProbe(min_width=32, min_height=32)
+    assert probe.check(png[:5]) is None
+    assert probe.check(png[5:100]) == 'resolution too low (16x300)'
+    assert probe.kind == '.png' and probe.size == (16, 300)
+
+    probe = ImageHeaderProbe(min_width=32, min_height=32)
+    assert probe.check(make_png_bytes()[:100]) is None and probe.size == (64, 64)
+    assert probe.check(b'\0' * 8192) is None
+
+    assert ImageHeaderProbe().finish() is not None
+    assert content_length_problem('100', 1024, 4096) == 'too small (100 bytes)'
+    assert content_length_problem('5000', 1024, 4096) == 'too large (5000 bytes)'
+    assert content_length_problem(None, 1024, 4096) is None
+    assert content_length_problem('2048', 1024, 4096) is None
+    print("✅ Header checks work")
+
+def test_early_abort_reads_little():
+    """Rejected downloads stop after the first chunk (or before the body); sniffed images keep a proper extension."""
+    print("🧪 Testing early aborts...")
+    server, host = start_server(BodiesHandler)
+    folder = tempfile.mkdtemp()
+    original_upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    consumed = {}
+    try:
+        urls = [f'http://{host}{path}' for path in EARLY_ABORT_BODIES]
+        scraper = make_scraper(urls, download_workers=1)
+        session_get = scraper.session.get
+
+        def counting_get(url, **kwargs):
+            response = session_get(url, **kwargs)
+            iter_content = response.iter_content
+            consumed[url.rsplit('/', 1)[1]] = 0
+
+            def counting_iter(*args, **kwargs):
+                for chunk in iter_content(*args, **kwargs):
+                    consumed[url.rsplit('/', 1)[1]] += len(chunk)
+                    yield chunk
+
+            response.iter_content = counting_iter
+            return response
+
+        scraper.session.get = counting_get
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'cats', len(urls))
+        scraper.close()
+
+        assert downloaded == 1
+        assert [os.path.splitext(f)[1] for f in os.listdir(class_folder)] == ['.png']
+        assert consumed['lying.png'] <= 8192, consumed
+        assert consumed['narrow.png'] <= 8192, consumed
+        assert consumed['announced-huge.png'] == 0 and consumed['announced-tiny.png'] == 0, consumed
+        print(f"✅ Rejected downloads read {sum(consumed.values()) - consumed['photo.bin']} bytes in total")
+    finally:
+        Config.UPLOAD_FOLDER = original_upload_folder
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    """Run all download validation tests."""
+    print("🚀 Starting download validation tests...\n")
+
+    tests = [
+        ("Validation Helpers", test_helpers),
+        ("In-Memory Rejection", test_rejected_images_never_written),
+        ("Header Sniffing", test_header_probe),
+        ("Early Aborts", test_early_abort_reads_little),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the ChromeDriver path cache.
+These tests fake Chrome detection and ChromeDriverManager, so they run offline.
+"""
+
+import os
+import sys
+import tempfile
+
+import driver_cache
+from config import Config
+
+class FakeManager:
+    """Stand-in for ChromeDriverManager that counts install() calls."""
+
+    installs = 0
+    fail = False
+    path = None
+
+    def install(self):
+        FakeManager.installs += 1
+        if FakeManager.fail:
+            raise ConnectionError("offline")
+        return FakeManager.path
+
+def setup_fakes(chrome_version):
+    """Point the cache at a temp file and fake Chrome/driver resolution."""
+    tmp_dir = tempfile.mkdtemp()
+    Config.DRIVER_CACHE_FILE = os.path.join(tmp_dir, 'cache.json')
+    Config.CHROME_DRIVER_PATH = None
+
+    FakeManager.installs = 0
+    FakeManager.fail = False
+    FakeManager.path = os.path.join(tmp_dir, 'chromedriver')
+    open(FakeManager.path, 'w').close()
+
+    driver_cache.ChromeDriverManager = FakeManager
+    driver_cache.get_chrome_version = lambda: chrome_version
+    return tmp_dir
+
+def test_cache_hit_skips_manager():
+    """Test that a second resolution for the same Chrome version skips ChromeDriverManager."""
+    print("🧪 Testing cache hit...")
+
+    setup_fakes('120.0.6099')
+    first = driver_cache.resolve_chromedriver_path()
+    second = driver_cache.resolve_chromedriver_path()
+    assert first == second == FakeManager.path
+    assert FakeManager.installs == 1
+    print("✅ Cached path reused")
+
+def test_new_chrome_version_resolves_again():
+    """Test that a Chrome upgrade misses the cache."""
+    print("🧪 Testing Chrome upgrade...")
+
+    setup_fakes('120.0.6099')
+    driver_cache.resolve_chromedriver_path()
+    driver_cache.get_chrome_version = lambda: '121.0.6167'
+    driver_cache.resolve_chromedriver_path()
+    assert FakeManager.installs == 2
+    print("✅ New Chrome version triggers resolution")
+
+def test_offline_fast_paths():
+    """Test fallbacks when Chrome cannot be detected or the manager is offline."""
+    print("🧪 Testing offline fast paths...")
+
+    setup_fakes('120.0.6099')
+    driver_cache.resolve_chromedriver_path()
+
+    # Unknown Chrome version: use the last cached driver
+    driver_cache.get_chrome_version = lambda: None
+    assert driver_cache.resolve_chromedriver_path() == FakeManager.path
+    assert FakeManager.installs == 1
+
+    # Manager fails on a miss: fall back to the last cached driver
+    driver_cache.get_chrome_version = lambda: '122.0.6261'
+    FakeManager.fail = True
+    assert driver_cache.resolve_chromedriver_path() == FakeManager.path
+    print("✅ Offline resolution uses cached driver")
+
+def test_invalidation():
+    """Test explicit cache invalidation and removal of stale paths."""
+    print("🧪 Testing invalidation...")
+
+    setup_fakes('120.0.6099')
+    driver_cache.resolve_chromedriver_path()
+    assert driver_cache.invalidate_driver_cache('120.0.6099') == 1
+    driver_cache.resolve_chromedriver_path()
+    assert FakeManager.installs == 2
+
+    # A cached binary that disappeared from disk is a miss
+    os.remove(FakeManager.path)
+    open(FakeManager.path + '2', 'w').close()
+    FakeManager.path += '2'
+    assert driver_cache.resolve_chromedriver_path() == FakeManager.path
+    assert FakeManager.installs == 3
+
+    assert driver_cache.invalidate_driver_cache() == 1
+    print("✅ Invalidation forces resolution")
+
+def test_configured_path_wins():
+    """Test that CHROME_DRIVER_PATH bypasses the cache entirely."""
+    print("🧪 Testing configured driver path...")
+
+    tmp_dir = setup_fakes('120.0.6099')
+    Config.CHROME_DRIVER_PATH = os.path.join(tmp_dir, 'custom_driver')
+    open(Config.CHROME_DRIVER_PATH, 'w').close()
+    assert driver_cache.resolve_chromedriver_path() == Config.CHROME_DRIVER_PATH
+    assert FakeManager.installs == 0
+    Config.CHROME_DRIVER_PATH = None
+    print("✅ Configured path used")
+
+def main():
+    """Run all driver cache tests."""
+    print("🚀 Starting ChromeDriver cache tests...\n")
+
+    tests = [
+        ("Cache Hit", test_cache_hit_skips_manager),
+        ("Chrome Upgrade", test_new_chrome_version_resolves_again),
+        ("Offline Fast Paths", test_offline_fast_paths),
+        ("Invalidation", test_invalidation),
+        ("Configured Path", test_configured_path_wins),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared WebDriver pool.
+These tests use fake drivers and do not need Chrome or the Flask server.
+"""
+
+import sys
+import threading
+import time
+
+from driver_pool import DriverPool
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium WebDriver."""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.pages = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    return DriverPool(factory, **kwargs), created
+
+def test_checkout_reuses_returned_driver():
+    """Test that a returned driver is handed out again instead of starting a new one."""
+    print("🧪 Testing driver reuse...")
+
+    pool, created = make_pool(size=2)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    assert pool.checkout() is driver
+    assert len(created) == 1
+    assert driver.pages == ["about:blank"]
+    print("✅ Returned driver reused")
+
+def test_unhealthy_driver_is_replaced():
+    """Test that a crashed browser is quit and replaced on checkout."""
+    print("🧪 Testing health checks...")
+
+    pool, created = make_pool(size=1)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    driver.alive = False
+
+    replacement = pool.checkout()
+    assert replacement is not driver
+    assert driver.quit_called
+    assert pool.get_stats()['unhealthy'] == 1
+    print("✅ Unhealthy driver replaced")
+
+def test_max_uses_recycles_driver():
+    """Test that drivers are recycled after max_uses checkouts."""
+    print("🧪 Testing max-uses recycling...")
+
+    pool, created = make_pool(size=1, max_uses=2)
+    first = pool.checkout()
+    pool.checkin(first)
+    assert pool.checkout() is first
+    pool.checkin(first)
+
+    assert first.quit_called
+    assert pool.checkout() is not first
+    assert len(created) == 2
+    print("✅ Driver recycled after max uses")
+
+def test_max_age_recycles_driver():
+    """Test that drivers older than max_age are recycled."""
+    print("🧪 Testing max-age recycling...")
+
+    pool, created = make_pool(size=1, max_age=0.01)
+    driver = pool.checkout()
+    time.sleep(0.02)
+    pool.checkin(driver)
+    assert driver.quit_called
+    assert pool.checkout() is not driver
+    print("✅ Driver recycled after max age")
+
+def test_checkout_waits_for_free_driver():
+    """Test that checkout blocks while the pool is exhausted and times out."""
+    print("🧪 Testing pool exhaustion...")
+
+    pool, created = make_pool(size=1, checkout_timeout=0.05)
+    driver = pool.checkout()
+
+    try:
+        pool.checkout()
+        assert False, "checkout should time out"
+    except Exception as e:
+        assert "No WebDriver available" in str(e)
+
+    threading.Timer(0.02, pool.checkin, args=(driver,)).start()
+    assert pool.checkout(timeout=1) is driver
+    print("✅ Checkout waited for a returned driver")
+
+def test_close_all_quits_idle_drivers():
+    """Test that closing the pool quits idle drivers and refuses checkouts."""
+    print("🧪 Testing pool shutdown...")
+
+    pool, created = make_pool(size=2)
+    pool.warm_up()
+    assert len(created) == 2
+    pool.close_all()
+    assert all(d.quit_called for d in created)
+
+    try:
+        pool.checkout()
+        assert False, "checkout should fail on a closed pool"
+    except Exception as e:
+        assert "closed" in str(e)
+    print("✅ Pool shut down cleanly")
+
+def main():
+    """Run all driver pool tests."""
+    print("🚀 Starting WebDriver pool tests...\n")
+
+    tests = [
+        ("Driver Reuse", test_checkout_reuses_returned_driver),
+        ("Health Checks", test_unhealthy_driver_is_replaced),
+        ("Max Uses", test_max_uses_recycles_driver),
+        ("Max Age", test_max_age_recycles_driver),
+        ("Pool Exhaustion", test_checkout_waits_for_free_driver),
+        ("Pool Shutdown", test_close_all_quits_idle_drivers),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
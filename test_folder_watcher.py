@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test script for the folder watcher that keeps the image catalog current.
+Files are created and removed in a temporary upload folder; the watchdog test is skipped without watchdog.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from catalog import ImageCatalog
+from folder_watcher import FolderWatcher, Observer
+from testing_helpers import write_image
+
+def counts(catalog, root):
+    return {c['name']: c['image_count'] for c in catalog.get_classes(root)}
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+def make_store():
+    folder = tempfile.mkdtemp()
+    root = os.path.join(folder, 'images')
+    os.makedirs(root)
+    return folder, root, ImageCatalog(os.path.join(folder, 'catalog.sqlite3'))
+
+def test_polling_rescans_changed_classes_only():
+    """Polling rescans just the class folders whose modification time changed."""
+    print("🧪 Testing polling watcher...")
+    folder, root, catalog = make_store()
+    try:
+        for name in ('cats', 'dogs', 'fish'):
+            write_image(os.path.join(root, name), f'{name}_0.png')
+        watcher = FolderWatcher(catalog, root, mode='poll')
+        assert watcher.poll_once() == 3
+        assert watcher.poll_once() == 0
+
+        # Folder mtimes have one-second resolution on some filesystems
+        time.sleep(1.1)
+        write_image(os.path.join(root, 'cats'), 'cats_1.png')
+        os.remove(os.path.join(root, 'dogs', 'dogs_0.png'))
+        shutil.rmtree(os.path.join(root, 'fish'))
+        write_image(os.path.join(root, 'birds'), 'birds_0.png')
+
+        assert watcher.poll_once() == 3  # cats, dogs and the new birds folder
+        assert counts(catalog, root) == {'birds': 1, 'cats': 2, 'dogs': 0}
+        info = catalog.get_class(os.path.join(root, 'cats'))
+        assert info['total_bytes'] == sum(os.path.getsize(os.path.join(root, 'cats', f))
+                                          for f in os.listdir(os.path.join(root, 'cats')))
+
+        # The scan state is stored in the catalog, so a restarted watcher does not rescan everything
+        assert FolderWatcher(catalog, root, mode='poll').poll_once() == 0
+        print("✅ Only changed class folders were rescanned")
+    finally:
+        catalog.close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_background_polling():
+    """A started polling watcher picks up changes on its own."""
+    print("🧪 Testing background polling...")
+    folder, root, catalog = make_store()
+    watcher = FolderWatcher(catalog, root, interval=0.1, mode='poll')
+    try:
+        write_image(os.path.join(root, 'cats'), 'cats_0.png')
+        watcher.start()
+        assert wait_for(lambda: counts(catalog, root) == {'cats': 1})
+
+        polls = watcher.get_stats()['polls']
+        write_image(os.path.join(root, 'owls'), 'owls_0.png')
+        assert wait_for(lambda: watcher.get_stats()['polls'] > polls + 1)
+        assert counts(catalog, root) == {'cats': 1, 'owls': 1}
+        stats = watcher.get_stats()
+        assert stats['mode'] == 'poll' and stats['running']
+        print("✅ Background polling works")
+    finally:
+        watcher.stop()
+        assert not watcher.get_stats()['running']
+        catalog.close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_watchdog_events():
+    """With watchdog, each file event updates just that image's record."""
+    print("🧪 Testing watchdog watcher...")
+    if Observer is None:
+        print("⏭️ watchdog is not installed, skipping")
+        return
+
+    folder, root, catalog = make_store()
+    watcher = FolderWatcher(catalog, root, mode='watchdog')
+    try:
+        write_image(os.path.join(root, 'cats'), 'cats_0.png')
+        watcher.start()
+        assert wait_for(lambda: watcher.get_stats()['running'] and counts(catalog, root) == {'cats': 1})
+
+        write_image(os.path.join(root, 'cats'), 'cats_1.png', size=(50, 20))
+        assert wait_for(lambda: counts(catalog, root) == {'cats': 2})
+        assert wait_for(lambda: (catalog.get_image(os.path.join(root, 'cats'), 'cats_1.png') or {}).get('width') == 50)
+
+        os.makedirs(os.path.join(root, 'dogs'))
+        shutil.move(os.path.join(root, 'cats', 'cats_0.png'), os.path.join(root, 'dogs', 'moved.png'))
+        assert wait_for(lambda: counts(catalog, root) == {'cats': 1, 'dogs': 1})
+
+        # A folder moved in with its files is scanned as a whole
+        outside = os.path.join(folder, 'incoming')
+        for n in range(3):
+            write_image(outside, f'bird_{n}.png')
+        shutil.move(outside, os.path.join(root, 'birds'))
+        assert wait_for(lambda: counts(catalog, root).get('birds') == 3)
+
+        shutil.rmtree(os.path.join(root, 'dogs'))
+        assert wait_for(lambda: 'dogs' not in counts(catalog, root))
+        assert watcher.get_stats()['events'] > 0
+        print("✅ Watchdog events keep the catalog current")
+    finally:
+        watcher.stop()
+        catalog.close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def run_python(code, folder):
+    """Run code in a fresh interpreter whose state databases live in folder."""
+    env = dict(os.environ, IMAGE_INDEX_DB=os.path.join(folder, 'catalog.sqlite3'),
+               CHECKPOINT_DB=os.path.join(folder, 'checkpoints.sqlite3'), UPLOAD_FOLDER=os.path.join(folder, 'images'))
+    env.pop('WERKZEUG_RUN_MAIN', None)
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, timeout=60,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+def test_watcher_started_by_entry_point():
+    """Importing the app starts nothing; create_app starts one watcher per server."""
+    print("🧪 Testing folder watcher startup...")
+    import app as app_module
+    import catalog as catalog_module
+    import folder_watcher
+    from checkpoints import CheckpointStore
+    from config import Config
+
+    if not Config.FOLDER_WATCH_ENABLED or not Config.CATALOG_ENABLED:
+        print("⏭️ Folder watching or the catalog is disabled, skipping")
+        return
+
+    folder, root, catalog = make_store()
+    # Bulk worker processes and tests import the app, with or without FLASK_DEBUG
+    for debug in ('', 'True'):
+        code = f"import os; os.environ['FLASK_DEBUG'] = {debug!r}; import app, folder_watcher; " \
+               "print(folder_watcher.get_folder_watcher())"
+        assert run_python(code, folder) == 'None'
+
+    original = (catalog_module._image_catalog, folder_watcher._folder_watcher, folder_watcher._watch_lock_file,
+                app_module.checkpoint_store, app_module.app.config['UPLOAD_FOLDER'])
+    catalog_module._image_catalog = catalog
+    folder_watcher._folder_watcher = folder_watcher._watch_lock_file = None
+    app_module.checkpoint_store = CheckpointStore(os.path.join(folder, 'checkpoints.sqlite3'))
+    app_module.app.config['UPLOAD_FOLDER'] = root
+    try:
+        assert app_module.create_app() is app_module.app
+        watcher = folder_watcher.get_folder_watcher()
+        assert watcher is not None and watcher.root == root
+        assert wait_for(lambda: watcher.get_stats()['running'])
+        assert app_module.create_app() and folder_watcher.get_folder_watcher() is watcher
+
+        # Another process on the same catalog (a second WSGI worker) leaves the watching to this one
+        if folder_watcher.fcntl is not None:
+            code = f"import folder_watcher; from catalog import ImageCatalog; " \
+                   f"print(folder_watcher._claim_watch(ImageCatalog({catalog.path!r})))"
+            assert run_python(code, folder) == 'False'
+    finally:
+        if folder_watcher._folder_watcher is not None:
+            folder_watcher._folder_watcher.stop()
+        if folder_watcher._watch_lock_file is not None:
+            folder_watcher._watch_lock_file.close()
+        (catalog_module._image_catalog, folder_watcher._folder_watcher, folder_watcher._watch_lock_file,
+         app_module.checkpoint_store, app_module.app.config['UPLOAD_FOLDER']) = original
+        catalog.close()
+        shutil.rmtree(folder, ignore_errors=True)
+    print("✅ The watcher is started by the serving entry point only")
+
+def test_watcher_api():
+    """The watcher state is reported through the API."""
+    print("🧪 Testing folder watcher API...")
+    import app as app_module
+    import folder_watcher
+
+    client = app_module.app.test_client()
+    assert client.get('/api/folder_watcher').get_json()['enabled'] is (folder_watcher.get_folder_watcher() is not None)
+
+    try:
+        FolderWatcher(None, tempfile.gettempdir(), mode='fanotify')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Folder watcher API works")
+
+def main():
+    """Run all folder watcher tests."""
+    print("🚀 Starting folder watcher tests...\n")
+
+    tests = [
+        ("Polling Rescans", test_polling_rescans_changed_classes_only),
+        ("Background Polling", test_background_polling),
+        ("Watchdog Events", test_watchdog_events),
+        ("Watcher Started By Entry Point", test_watcher_started_by_entry_point),
+        ("Folder Watcher API", test_watcher_api),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled HTTP session, the optional httpx client and the connection metrics.
+Requests go to a local keep-alive HTTP server, so no internet access is needed.
+"""
+
+import shutil
+import sys
+import tempfile
+
+import requests
+
+from config import Config
+from http_client import DEFAULT_HEADERS, ConnectionMetrics, create_session, connection_metrics, httpx
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+
+class KeepAliveHandler(ImageHandler):
+    """HTTP/1.1 server that keeps connections open; /missing answers 404."""
+
+    protocol_version = 'HTTP/1.1'
+    user_agents = []
+
+    def do_GET(self):
+        KeepAliveHandler.user_agents.append(self.headers.get('User-Agent'))
+        if self.path == '/missing':
+            self.send_body(b'', status=404)
+        else:
+            self.send_body(make_png_bytes())
+
+def check_session_reuses_connections(client):
+    server, host = start_server(KeepAliveHandler)
+    base_url = f'http://{host}'
+    connection_metrics.reset()
+    KeepAliveHandler.user_agents = []
+    session = create_session(client)
+    try:
+        for n in range(10):
+            response = session.get(f'{base_url}/img/{n}.png', timeout=5, stream=True)
+            data = b''.join(response.iter_content(8192))
+            response.close()
+            assert data.startswith(b'\x89PNG')
+
+        stats = connection_metrics.get_stats()
+        assert stats['requests'] == 10 and stats['connections_opened'] == 1, stats
+        assert stats['reuse_ratio'] == 0.9
+        assert KeepAliveHandler.user_agents == [DEFAULT_HEADERS['User-Agent']] * 10
+
+        missing = session.get(f'{base_url}/missing', timeout=5)
+        try:
+            missing.raise_for_status()
+            assert False, "expected HTTPError"
+        except requests.exceptions.HTTPError as e:
+            assert e.response.status_code == 404
+    finally:
+        session.close()
+        server.shutdown()
+
+def test_requests_session_pooling():
+    """The requests session is pooled, sends default headers and counts reused connections."""
+    print("🧪 Testing requests session...")
+    session = create_session('requests')
+    adapter = session.get_adapter('https://example.com')
+    assert adapter._pool_connections == Config.HTTP_POOL_CONNECTIONS
+    assert adapter._pool_maxsize == Config.HTTP_POOL_MAXSIZE
+    session.close()
+
+    check_session_reuses_connections('requests')
+    print("✅ requests session reuses its connection")
+
+def test_httpx_session():
+    """The httpx client behaves like the requests session, including its exceptions."""
+    print("🧪 Testing httpx session...")
+    if httpx is None:
+        print("⏭️ httpx is not installed, skipping")
+        return
+
+    check_session_reuses_connections('httpx')
+    session = create_session('httpx')
+    try:
+        session.get('http://127.0.0.1:9/unreachable', timeout=2)
+        assert False, "expected ConnectionError"
+    except requests.exceptions.ConnectionError:
+        pass
+    finally:
+        session.close()
+    print("✅ httpx session works as a drop-in")
+
+def test_scraper_with_each_client():
+    """Images download the same way whichever client the scraper uses."""
+    print("🧪 Testing downloads with each client...")
+    server, host = start_server(KeepAliveHandler)
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, Config.HTTP_CLIENT)
+    Config.UPLOAD_FOLDER = folder
+    try:
+        for client in ('requests', 'httpx') if httpx is not None else ('requests',):
+            Config.HTTP_CLIENT = client
+            urls = [f'http://{host}/{client}/{n}.png' for n in range(3)]
+            scraper = make_scraper(urls)
+            downloaded, _ = scraper.scrape_images('q', folder, client, 3)
+            scraper.close()
+            assert downloaded == 3, (client, downloaded)
+        print("✅ Downloads work with every client")
+    finally:
+        Config.UPLOAD_FOLDER, Config.HTTP_CLIENT = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_metrics_api():
+    """Connection metrics are reported per host and through the API."""
+    print("🧪 Testing HTTP metrics...")
+    metrics = ConnectionMetrics()
+    assert metrics.get_stats()['reuse_ratio'] is None
+    metrics.record_connection('a.test')
+    for _ in range(4):
+        metrics.record_request('a.test')
+    assert metrics.get_stats()['hosts']['a.test'] == {'requests': 4, 'connections': 1, 'reuse_ratio': 0.75}
+
+    import app as app_module
+    data = app_module.app.test_client().get('/api/http_metrics').get_json()
+    assert data['status'] == 'success' and data['pool_maxsize'] == Config.HTTP_POOL_MAXSIZE
+    assert 'reuse_ratio' in data and 'hosts' in data
+    print("✅ HTTP metrics work")
+
+def main():
+    """Run all HTTP client tests."""
+    print("🚀 Starting HTTP client tests...\n")
+
+    tests = [
+        ("Requests Session", test_requests_session_pooling),
+        ("Httpx Session", test_httpx_session),
+        ("Scraper Clients", test_scraper_with_each_client),
+        ("HTTP Metrics", test_metrics_api),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the Selenium-free HTTP search backend.
+Result pages are served from saved fixtures by a local HTTP stand-in for
+Google, so these tests need neither Chrome nor internet access.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from config import Config
+from http_search import HttpSearchBackend
+from testing_helpers import ImageHandler, make_png_bytes, start_server
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULT_PAGES = {0: 'http_search_page1.html', 20: 'http_search_page2.html'}
+
+class StandInHandler(ImageHandler):
+    """Serves fixture result pages and generated images."""
+
+    requests_seen = []
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        StandInHandler.requests_seen.append(self.path)
+
+        if parsed.path == '/search':
+            start = int(parse_qs(parsed.query).get('start', ['0'])[0])
+            page = RESULT_PAGES.get(start)
+            if page:
+                with open(os.path.join(FIXTURES_DIR, page), 'r', encoding='utf-8') as f:
+                    body = f.read().replace('{{BASE_URL}}', self.server.base_url).encode()
+            else:
+                body = b'<html><body>No more results</body></html>'
+            self.send_body(body, 'text/html; charset=UTF-8')
+        elif parsed.path.startswith('/originals/'):
+            self.send_body(make_png_bytes(format='JPEG'), 'image/jpeg')
+        elif parsed.path.startswith('/thumbs/'):
+            self.send_body(make_png_bytes())
+        else:
+            self.send_body(b'not found', 'text/plain', 404)
+
+def start_stand_in():
+    """Start the local Google stand-in and return (server, base_url)."""
+    StandInHandler.requests_seen = []
+    server, host = start_server(StandInHandler)
+    server.base_url = f"http://{host}"
+    return server, server.base_url
+
+def test_thumbnail_pagination():
+    """Test that thumbnails are collected across pages with offsets and without duplicates."""
+    print("🧪 Testing paginated thumbnail search...")
+
+    server, base_url = start_stand_in()
+    try:
+        backend = HttpSearchBackend(requests.Session(), base_url=f"{base_url}/search", page_size=20, max_pages=5)
+        urls = list(backend.iter_image_urls('cats', 50, time_budget=30))
+
+        assert urls == [
+            f"{base_url}/thumbs/cat-1.png",
+            f"{base_url}/thumbs/cat-2.png",
+            f"{base_url}/thumbs/cat-3.png",
+            f"{base_url}/thumbs/cat-4.png",
+            "https://encrypted-tbn0.gstatic.com/images?q=tbn:cat5",
+        ], urls
+
+        starts = [parse_qs(urlparse(path).query)['start'][0] for path in StandInHandler.requests_seen]
+        assert starts[:3] == ['0', '20', '40'], starts
+        print(f"✅ Collected {len(urls)} thumbnails from {len(starts)} pages")
+    finally:
+        server.shutdown()
+
+def test_full_resolution_pagination():
+    """Test that full-resolution mode returns originals from links and script data."""
+    print("🧪 Testing paginated full-resolution search...")
+
+    server, base_url = start_stand_in()
+    try:
+        backend = HttpSearchBackend(requests.Session(), base_url=f"{base_url}/search", page_size=20, max_pages=5)
+        urls = list(backend.iter_image_urls('cats', 50, time_budget=30, full_resolution=True))
+        assert sorted(urls) == [f"{base_url}/originals/cat-{i}.jpg" for i in range(1, 6)], urls
+        print("✅ Originals collected from both layouts")
+    finally:
+        server.shutdown()
+
+def test_stops_at_target_and_plateau():
+    """Test that paging stops once the target is reached or pages stop yielding."""
+    print("🧪 Testing search termination...")
+
+    server, base_url = start_stand_in()
+    try:
+        backend = HttpSearchBackend(requests.Session(), base_url=f"{base_url}/search", page_size=20, max_pages=50)
+        urls = list(backend.iter_image_urls('cats', 2, time_budget=30))
+        assert len(urls) == 2
+        assert len(StandInHandler.requests_seen) == 1
+
+        StandInHandler.requests_seen = []
+        list(backend.iter_image_urls('cats', 500, time_budget=30))
+        # Two pages with results, then SEARCH_PLATEAU_PASSES empty pages
+        assert len(StandInHandler.requests_seen) == 2 + Config.SEARCH_PLATEAU_PASSES
+        print("✅ Search stopped at target and on plateau")
+    finally:
+        server.shutdown()
+
+def test_unreachable_backend():
+    """Test that a failing results page ends the search without raising."""
+    print("🧪 Testing unreachable backend...")
+
+    backend = HttpSearchBackend(requests.Session(), base_url="http://127.0.0.1:9/search", max_pages=3)
+    assert list(backend.iter_image_urls('cats', 10, time_budget=5)) == []
+    print("✅ Connection errors handled")
+
+def test_scraper_with_http_backend():
+    """Test an end-to-end scrape through GoogleImageScraper without starting a browser."""
+    print("🧪 Testing GoogleImageScraper with the HTTP backend...")
+
+    from scraper import GoogleImageScraper
+
+    server, base_url = start_stand_in()
+    upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = tempfile.mkdtemp()
+    original_url = Config.HTTP_SEARCH_URL
+    Config.HTTP_SEARCH_URL = f"{base_url}/search"
+    scraper = None
+    try:
+        scraper = GoogleImageScraper(backend='http', url_index=False, content_index=False,
+                                     near_dup_index=False, catalog=False)
+        assert scraper.driver is None
+
+        downloaded, class_folder = scraper.scrape_images('cats', None, 'http_cats', 4, full_resolution=True)
+        assert downloaded == 4, downloaded
+        assert len(os.listdir(class_folder)) == 4
+        print(f"✅ Downloaded {downloaded} images without a browser")
+    finally:
+        if scraper:
+            scraper.close()
+        shutil.rmtree(Config.UPLOAD_FOLDER, ignore_errors=True)
+        Config.UPLOAD_FOLDER = upload_folder
+        Config.HTTP_SEARCH_URL = original_url
+        server.shutdown()
+
+def main():
+    """Run all HTTP search backend tests."""
+    print("🚀 Starting HTTP search backend tests...\n")
+
+    tests = [
+        ("Thumbnail Pagination", test_thumbnail_pagination),
+        ("Full-Resolution Pagination", test_full_resolution_pagination),
+        ("Search Termination", test_stops_at_target_and_plateau),
+        ("Unreachable Backend", test_unreachable_backend),
+        ("Scraper With HTTP Backend", test_scraper_with_http_backend),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the scraping job queue.
+These tests use fake job targets and do not need Chrome or a running server.
+"""
+
+import sys
+import threading
+import time
+
+import testing_helpers  # noqa: F401 - keeps the app's databases out of instance/
+from jobs import JobManager
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def blocking_target(release):
+    """Job target that runs until the release event is set."""
+    def target(job):
+        job.set_progress('working')
+        release.wait(5)
+        job.result = {'downloaded': 3}
+    return target
+
+def test_concurrency_limit_queues_extra_jobs():
+    """Jobs beyond max_concurrent wait in FIFO order instead of being refused."""
+    print("🧪 Testing concurrency limit...")
+    manager = JobManager(max_concurrent=2)
+    release = threading.Event()
+
+    jobs = [manager.submit('scrape', f'job {i}', blocking_target(release)) for i in range(3)]
+    assert wait_for(lambda: manager.running_count() == 2)
+    assert [job.state for job in jobs] == ['running', 'running', 'queued']
+    assert manager.queued_count() == 1
+
+    release.set()
+    assert wait_for(lambda: all(job.state == 'done' for job in jobs))
+    assert jobs[2].result == {'downloaded': 3}
+    assert jobs[2].started_at >= jobs[0].started_at
+    print("✅ Third job waited for a free slot and then ran")
+
+def test_failed_job_records_error():
+    """An exception in the target marks the job failed and frees its slot."""
+    print("🧪 Testing failed job...")
+    manager = JobManager(max_concurrent=1)
+
+    def broken(job):
+        raise RuntimeError('browser crashed')
+
+    failed = manager.submit('scrape', 'broken', broken)
+    following = manager.submit('scrape', 'next', lambda job: None)
+
+    assert wait_for(lambda: following.state == 'done')
+    assert failed.state == 'failed'
+    assert failed.error == 'browser crashed'
+    print("✅ Failure recorded and queue kept moving")
+
+def test_cancel_queued_and_running_jobs():
+    """Queued jobs are dropped immediately; running jobs see cancel_requested."""
+    print("🧪 Testing cancellation...")
+    manager = JobManager(max_concurrent=1)
+    stop_seen = threading.Event()
+
+    def cooperative(job):
+        while not job.cancel_requested:
+            time.sleep(0.01)
+        stop_seen.set()
+
+    running = manager.submit('bulk', 'running', cooperative)
+    queued = manager.submit('bulk', 'queued', lambda job: None)
+    assert wait_for(lambda: running.state == 'running')
+
+    assert manager.cancel(queued.id).state == 'cancelled'
+    assert manager.cancel(running.id) is running
+    assert wait_for(stop_seen.is_set)
+    assert wait_for(lambda: running.state == 'cancelled')
+    assert queued.started_at is None
+    assert manager.cancel('missing') is None
+    print("✅ Both jobs cancelled")
+
+def test_history_is_bounded():
+    """Only the newest finished jobs are kept."""
+    print("🧪 Testing job history limit...")
+    manager = JobManager(max_concurrent=1, max_history=3)
+    jobs = []
+    for i in range(6):
+        jobs.append(manager.submit('scrape', f'job {i}', lambda job: None))
+        assert wait_for(lambda: jobs[-1].state == 'done')
+
+    assert len(manager.list_jobs()) <= 4
+    assert manager.get(jobs[-1].id) is jobs[-1]
+    assert manager.get(jobs[0].id) is None
+    print("✅ Old jobs pruned")
+
+def test_job_routes():
+    """Submit, inspect, list and cancel jobs through the API."""
+    print("🧪 Testing job API routes...")
+    import app as app_module
+
+    release = threading.Event()
+    original_target = app_module.run_scrape_job
+    app_module.run_scrape_job = blocking_target(release)
+    try:
+        client = app_module.app.test_client()
+
+        response = client.post('/api/jobs', json={'type': 'scrape', 'keywords': 'cats', 'class_name': 'cats'})
+        assert response.status_code == 202
+        job_id = response.get_json()['job']['id']
+
+        response = client.post('/api/jobs', json={'type': 'scrape', 'keywords': '', 'class_name': 'x'})
+        assert response.status_code == 400
+
+        assert client.get(f'/api/jobs/{job_id}').get_json()['job']['kind'] == 'scrape'
+        assert client.get('/api/jobs/unknown').status_code == 404
+        assert any(job['id'] == job_id for job in client.get('/api/jobs').get_json()['jobs'])
+        assert client.get('/api/jobs?state=bogus').status_code == 400
+
+        status = client.get('/api/scraping_status').get_json()
+        assert status['is_running'] is True
+
+        response = client.post(f'/api/jobs/{job_id}/cancel')
+        assert response.get_json()['job']['cancel_requested'] is True
+    finally:
+        release.set()
+        app_module.run_scrape_job = original_target
+
+    job = app_module.job_manager.get(job_id)
+    assert wait_for(lambda: job.state == 'cancelled')
+    print("✅ Job routes behave as expected")
+
+def main():
+    """Run all job queue tests."""
+    print("🚀 Starting job queue tests...\n")
+
+    tests = [
+        ("Concurrency Limit", test_concurrency_limit_queues_extra_jobs),
+        ("Failed Job", test_failed_job_records_error),
+        ("Cancellation", test_cancel_queued_and_running_jobs),
+        ("History Limit", test_history_is_bounded),
+        ("Job Routes", test_job_routes),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
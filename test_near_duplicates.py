@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for perceptual-hash near-duplicate detection.
+Images are generated locally and served by a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from config import Config
+from near_duplicates import NearDuplicateIndex, dhash, hamming_distances
+from testing_helpers import ImageHandler, make_scraper, start_server
+
+def make_picture(seed, size=(256, 256)):
+    """Smooth random picture: upscaled noise, so it has structure a perceptual hash can see."""
+    rng = np.random.default_rng(seed)
+    small = Image.fromarray(rng.integers(0, 256, (12, 12, 3), dtype=np.uint8))
+    return small.resize(size, Image.BILINEAR)
+
+def encode(image, format='PNG', **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **kwargs)
+    return buffer.getvalue()
+
+PICTURE = make_picture(1)
+VARIANTS = {
+    '/original.png': encode(PICTURE),
+    '/small.jpg': encode(PICTURE.resize((128, 128)), 'JPEG', quality=60),
+    '/other.png': encode(make_picture(2)),
+}
+
+class VariantHandler(ImageHandler):
+    def do_GET(self):
+        self.send_body(VARIANTS[self.path], 'image/jpeg' if self.path.endswith('.jpg') else 'image/png')
+
+def test_hash_and_distances():
+    """Resized copies hash close together and distances match a plain popcount."""
+    print("🧪 Testing perceptual hashes...")
+    original = dhash(PICTURE)
+    resized = dhash(Image.open(io.BytesIO(VARIANTS['/small.jpg'])))
+    other = dhash(make_picture(2))
+    assert bin(original ^ resized).count('1') <= Config.NEAR_DUP_MAX_DISTANCE
+    assert bin(original ^ other).count('1') > 10
+
+    values = np.random.default_rng(0).integers(0, 2 ** 63, 1000, dtype=np.uint64) * np.uint64(2)
+    expected = [bin(int(value) ^ original).count('1') for value in values]
+    assert hamming_distances(values, original).tolist() == expected
+    print("✅ Hashes and distances are correct")
+
+def test_clusters():
+    """Clusters group near-identical images of a class folder."""
+    print("🧪 Testing duplicate clusters...")
+    folder = tempfile.mkdtemp()
+    try:
+        class_folder = os.path.join(folder, 'cats')
+        os.makedirs(class_folder)
+        files = {'a.png': VARIANTS['/original.png'], 'b.jpg': VARIANTS['/small.jpg'],
+                 'c.png': VARIANTS['/other.png'], 'd.png': encode(PICTURE.rotate(180))}
+        for name, data in files.items():
+            with open(os.path.join(class_folder, name), 'wb') as f:
+                f.write(data)
+
+        index = NearDuplicateIndex(os.path.join(folder, 'index.sqlite3'))
+        assert index.index_folder(class_folder) == 4
+        clusters = index.clusters(class_folder, Config.NEAR_DUP_MAX_DISTANCE)
+        assert [sorted(cluster['files']) for cluster in clusters] == [['a.png', 'b.jpg']]
+
+        # Hashes survive a restart and deleted files drop out
+        index = NearDuplicateIndex(index.path)
+        os.remove(os.path.join(class_folder, 'b.jpg'))
+        assert index.index_folder(class_folder) == 0
+        assert index.clusters(class_folder, Config.NEAR_DUP_MAX_DISTANCE) == []
+        print("✅ Near-duplicates were clustered")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_hashes_shared_between_processes():
+    """Hashes saved through another connection (another bulk worker process) are seen by a warm cache."""
+    print("🧪 Testing hashes shared between processes...")
+    folder = tempfile.mkdtemp()
+    try:
+        class_folder = os.path.join(folder, 'cats')
+        os.makedirs(class_folder)
+        for name in ('a.png', 'b.png'):
+            with open(os.path.join(class_folder, name), 'wb') as f:
+                f.write(VARIANTS['/original.png'])
+
+        path = os.path.join(folder, 'index.sqlite3')
+        index, worker = NearDuplicateIndex(path), NearDuplicateIndex(path)
+        original = dhash(PICTURE)
+        assert index.find_similar(class_folder, original, Config.NEAR_DUP_MAX_DISTANCE) == []
+
+        worker.add(class_folder, 'a.png', original)
+        assert index.find_similar(class_folder, original, 0) == [('a.png', 0)]
+
+        # Removing and adding a hash in the same class is noticed too
+        worker.forget(class_folder, 'a.png')
+        worker.add(class_folder, 'b.png', original)
+        assert index.find_similar(class_folder, original, 0) == [('b.png', 0)]
+        index.add(class_folder, 'a.png', original)
+        assert sorted(worker.find_similar(class_folder, original, 0)) == [('a.png', 0), ('b.png', 0)]
+
+        # JPEGs are hashed from a reduced decode, which stays close to the full one
+        small = Image.open(io.BytesIO(VARIANTS['/small.jpg']))
+        small.load()
+        reduced = dhash(Image.open(io.BytesIO(VARIANTS['/small.jpg'])))
+        assert bin(reduced ^ dhash(small)).count('1') <= Config.NEAR_DUP_MAX_DISTANCE
+        print("✅ Hashes from other processes were found")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_near_duplicate_rejected_on_download():
+    """A re-encoded, resized copy of a saved image is not saved again."""
+    print("🧪 Testing near-duplicate downloads...")
+    server, host = start_server(VariantHandler)
+
+    folder = tempfile.mkdtemp()
+    original_upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    try:
+        urls = [f'http://{host}{path}' for path in VARIANTS]
+        scraper = make_scraper(urls, download_workers=1,
+                               near_dup_index=NearDuplicateIndex(os.path.join(folder, '.index.sqlite3')))
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'cats', 3)
+        scraper.close()
+
+        assert downloaded == 2 and scraper.last_stats['duplicates'] == 1
+        assert len(os.listdir(class_folder)) == 2
+
+        import app as app_module
+        original_app_folder = app_module.app.config['UPLOAD_FOLDER']
+        app_module.app.config['UPLOAD_FOLDER'] = folder
+        try:
+            client = app_module.app.test_client()
+            data = client.get('/api/duplicates/cats?max_distance=64').get_json()
+            assert data['status'] == 'success' and data['clusters'][0]['size'] == 2
+            assert client.get('/api/duplicates/missing').status_code == 404
+            assert client.get('/api/duplicates/cats?max_distance=x').status_code == 400
+        finally:
+            app_module.app.config['UPLOAD_FOLDER'] = original_app_folder
+        print("✅ Near-duplicate download was dropped")
+    finally:
+        Config.UPLOAD_FOLDER = original_upload_folder
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    """Run all near-duplicate tests."""
+    print("🚀 Starting near-duplicate tests...\n")
+
+    tests = [
+        ("Hashes And Distances", test_hash_and_distances),
+        ("Duplicate Clusters", test_clusters),
+        ("Shared Between Processes", test_hashes_shared_between_processes),
+        ("Near-Duplicate Download", test_near_duplicate_rejected_on_download),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
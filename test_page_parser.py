@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for full-resolution URL extraction from Google Images result pages.
+These tests run against saved HTML fixtures and do not need Chrome or the network.
+"""
+
+import os
+import sys
+
+from page_parser import extract_full_res_images
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_script_data_originals():
+    """Test extraction of originals and dimensions from AF_initDataCallback data."""
+    print("🧪 Testing embedded script data extraction...")
+
+    images = extract_full_res_images(load_fixture('google_images_results.html'))
+    urls = [image['url'] for image in images]
+
+    assert urls == [
+        'https://upload.wikimedia.org/wikipedia/commons/thumb/3/3a/Cat03.jpg/1200px-Cat03.jpg',
+        'https://cdn.pets.example.com/images/kitten-playing.jpg?w=1920&q=80',
+        'https://icons.example.org/cat-icon.png',
+        'https://blogger.googleusercontent.com/img/b/R29vZ2xl/cat-on-sofa.jpg',
+    ], urls
+
+    wikipedia = images[0]
+    assert (wikipedia['width'], wikipedia['height']) == (1200, 1602)
+    assert wikipedia['thumbnail'] == 'https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcQ1cat&usqp=CAU'
+    print(f"✅ Extracted {len(images)} originals with dimensions")
+
+def test_thumbnails_and_google_assets_skipped():
+    """Test that thumbnails, logos and icons are never returned as originals."""
+    print("🧪 Testing thumbnail filtering...")
+
+    images = extract_full_res_images(load_fixture('google_images_results.html'))
+    for image in images:
+        assert 'encrypted-tbn' not in image['url'], image
+        assert 'gstatic.com' not in image['url'], image
+        assert 'googlelogo' not in image['url'], image
+    print("✅ Google-hosted thumbnails and assets skipped")
+
+def test_minimum_dimensions_and_limit():
+    """Test the min_width/min_height filters and the result limit."""
+    print("🧪 Testing dimension filters...")
+
+    html = load_fixture('google_images_results.html')
+    large = extract_full_res_images(html, min_width=800, min_height=800)
+    assert [image['url'].split('/')[-1] for image in large] == [
+        '1200px-Cat03.jpg', 'kitten-playing.jpg?w=1920&q=80', 'cat-on-sofa.jpg'
+    ], large
+
+    assert len(extract_full_res_images(html, limit=2)) == 2
+    print("✅ Filters applied")
+
+def test_legacy_rg_meta_layout():
+    """Test extraction from the older rg_meta JSON layout, skipping invalid blobs."""
+    print("🧪 Testing legacy rg_meta layout...")
+
+    images = extract_full_res_images(load_fixture('google_images_legacy.html'))
+    assert [(image['url'], image['width'], image['height']) for image in images] == [
+        ('https://images.example.com/dogs/golden-retriever.jpg', 1920, 1080),
+        ('http://puppies.example.net/photos/puppy.png', 1024, 768),
+    ], images
+    print("✅ Legacy layout parsed")
+
+def test_empty_page():
+    """Test that pages without result data produce no URLs."""
+    print("🧪 Testing empty page...")
+
+    assert extract_full_res_images('') == []
+    assert extract_full_res_images('<html><body>No results</body></html>') == []
+    print("✅ Empty page handled")
+
+def test_scraper_full_resolution_mode():
+    """Test that the scraper yields originals from the page source in full-resolution mode."""
+    print("🧪 Testing scraper full-resolution mode...")
+
+    from scraper import GoogleImageScraper
+
+    class FixtureDriver:
+        page_source = load_fixture('google_images_results.html')
+
+        def get(self, url):
+            pass
+
+        def execute_script(self, script, *args):
+            if 'querySelectorAll(arguments[0]).length' in script:
+                return 4
+            return None
+
+    scraper = GoogleImageScraper.__new__(GoogleImageScraper)
+    scraper.driver = FixtureDriver()
+    urls = scraper.search_images('cats', max_images=2, full_resolution=True)
+    assert urls == [
+        'https://upload.wikimedia.org/wikipedia/commons/thumb/3/3a/Cat03.jpg/1200px-Cat03.jpg',
+        'https://cdn.pets.example.com/images/kitten-playing.jpg?w=1920&q=80',
+    ], urls
+    scraper.driver = None
+    print("✅ Scraper returned full-resolution URLs")
+
+def main():
+    """Run all page parser tests."""
+    print("🚀 Starting full-resolution extraction tests...\n")
+
+    tests = [
+        ("Script Data Originals", test_script_data_originals),
+        ("Thumbnail Filtering", test_thumbnails_and_google_assets_skipped),
+        ("Dimension Filters", test_minimum_dimensions_and_limit),
+        ("Legacy Layout", test_legacy_rg_meta_layout),
+        ("Empty Page", test_empty_page),
+        ("Scraper Full-Resolution Mode", test_scraper_full_resolution_mode),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
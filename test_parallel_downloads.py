@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the threaded download engine and its per-host concurrency cap.
+Images come from local HTTP servers, so no Chrome or internet access is needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from config import Config
+from testing_helpers import ImageHandler, make_scraper, start_server
+
+class ActivityCounter:
+    """In-flight and peak request counts for one server, plus the peak across all servers."""
+
+    lock = threading.Lock()
+    total_active = 0
+    total_peak = 0
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with ActivityCounter.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            ActivityCounter.total_active += 1
+            ActivityCounter.total_peak = max(ActivityCounter.total_peak, ActivityCounter.total_active)
+
+    def leave(self):
+        with ActivityCounter.lock:
+            self.active -= 1
+            ActivityCounter.total_active -= 1
+
+class SlowImageHandler(ImageHandler):
+    """Serves a fresh PNG after a short delay, so concurrent downloads overlap."""
+
+    delay = 0.15
+
+    def do_GET(self):
+        counter = self.server.counter
+        counter.enter()
+        try:
+            time.sleep(self.delay)
+            super().do_GET()
+        finally:
+            counter.leave()
+
+def start_counted_server():
+    server, host = start_server(SlowImageHandler)
+    server.counter = ActivityCounter()
+    return server, f'http://{host}'
+
+def test_per_host_cap():
+    """Every image is saved and no host ever sees more than max_per_host downloads at once."""
+    print("🧪 Testing per-host download cap...")
+    servers = [start_counted_server() for _ in range(2)]
+    ActivityCounter.total_active = ActivityCounter.total_peak = 0
+    folder = tempfile.mkdtemp()
+    original_upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    try:
+        # Interleave the two hosts so both are busy at the same time
+        urls = [f'{base}/img/{n}.png' for n in range(8) for _, base in servers]
+        scraper = make_scraper(urls, download_engine='threads', download_workers=8, max_per_host=2)
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'cats', len(urls))
+        scraper.close()
+
+        assert downloaded == len(urls) and scraper.last_stats['failed'] == 0
+        assert len(os.listdir(class_folder)) == len(urls)
+        peaks = [server.counter.peak for server, _ in servers]
+        assert all(1 < peak <= 2 for peak in peaks), peaks
+        # The cap is per host: with two hosts more than two downloads ran at once
+        assert ActivityCounter.total_peak > 2, ActivityCounter.total_peak
+        print(f"✅ {downloaded} images saved, peak per host {peaks}, overall {ActivityCounter.total_peak}")
+    finally:
+        Config.UPLOAD_FOLDER = original_upload_folder
+        for server, _ in servers:
+            server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_default_cap_from_config():
+    """Without max_per_host the DOWNLOAD_MAX_PER_HOST setting caps each host."""
+    print("🧪 Testing default per-host cap...")
+    server, base = start_counted_server()
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, Config.DOWNLOAD_MAX_PER_HOST)
+    Config.UPLOAD_FOLDER = folder
+    Config.DOWNLOAD_MAX_PER_HOST = 3
+    try:
+        urls = [f'{base}/img/{n}.png' for n in range(9)]
+        scraper = make_scraper(urls, download_engine='threads', download_workers=6)
+        assert scraper.max_per_host == 3
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'dogs', len(urls))
+        scraper.close()
+
+        assert downloaded == len(urls) and len(os.listdir(class_folder)) == len(urls)
+        assert 1 < server.counter.peak <= 3, server.counter.peak
+        print(f"✅ Peak of {server.counter.peak} downloads with DOWNLOAD_MAX_PER_HOST=3")
+    finally:
+        Config.UPLOAD_FOLDER, Config.DOWNLOAD_MAX_PER_HOST = original
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    """Run all parallel download tests."""
+    print("🚀 Starting parallel download tests...\n")
+
+    tests = [
+        ("Per-host Cap", test_per_host_cap),
+        ("Default Cap From Config", test_default_cap_from_config),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-host download rate limiter.
+These tests run offline and do not need the Flask server.
+"""
+
+import sys
+import time
+
+from rate_limiter import TokenBucket, HostRateLimiter, parse_host_rates
+
+def test_parse_host_rates():
+    """Test parsing of the HOST_RATE_LIMITS setting."""
+    print("🧪 Testing host rate parsing...")
+
+    rates = parse_host_rates("gstatic.com=8, Wikimedia.org=1.5,broken,bad=x")
+    assert rates == {'gstatic.com': 8.0, 'wikimedia.org': 1.5}, rates
+    assert parse_host_rates('') == {}
+    print("✅ Host rates parsed correctly")
+
+def test_token_bucket_burst_then_wait():
+    """Test that a bucket allows its burst and then spaces out requests."""
+    print("🧪 Testing token bucket burst...")
+
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+
+    # Third and fourth reservations queue up behind each other
+    third = bucket.reserve()
+    fourth = bucket.reserve()
+    assert 0.05 < third <= 0.1, third
+    assert 0.15 < fourth <= 0.2, fourth
+    print("✅ Burst allowed, later requests queued")
+
+def test_zero_rate_disables_limiting():
+    """Test that a rate of 0 never waits."""
+    print("🧪 Testing disabled rate limiting...")
+
+    bucket = TokenBucket(rate=0, capacity=1)
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+    print("✅ Zero rate never waits")
+
+def test_hosts_do_not_wait_on_each_other():
+    """Test that exhausting one host's bucket does not slow down another host."""
+    print("🧪 Testing per-host isolation...")
+
+    limiter = HostRateLimiter(default_rate=1, burst=1)
+    limiter.acquire("https://a.example.com/1.jpg")
+
+    start = time.monotonic()
+    waited = limiter.acquire("https://b.example.com/1.jpg")
+    assert waited == 0.0
+    assert time.monotonic() - start < 0.05
+
+    assert limiter.bucket_for_host("a.example.com").reserve() > 0
+    print("✅ Hosts are rate limited independently")
+
+def test_host_overrides_match_subdomains():
+    """Test that per-host overrides apply to subdomains."""
+    print("🧪 Testing host rate overrides...")
+
+    limiter = HostRateLimiter(default_rate=2, burst=1, host_rates={'gstatic.com': 8})
+    assert limiter.rate_for_host('encrypted-tbn0.gstatic.com') == 8
+    assert limiter.rate_for_host('gstatic.com') == 8
+    assert limiter.rate_for_host('notgstatic.com') == 2
+
+    limiter.set_host_rate('example.org', 0.5)
+    assert limiter.bucket_for_host('example.org').rate == 0.5
+    print("✅ Overrides applied by domain suffix")
+
+def main():
+    """Run all rate limiter tests."""
+    print("🚀 Starting rate limiter tests...\n")
+
+    tests = [
+        ("Host Rate Parsing", test_parse_host_rates),
+        ("Token Bucket Burst", test_token_bucket_burst_then_wait),
+        ("Disabled Limiting", test_zero_rate_disables_limiting),
+        ("Per-Host Isolation", test_hosts_do_not_wait_on_each_other),
+        ("Host Overrides", test_host_overrides_match_subdomains),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
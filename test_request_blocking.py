@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for browser request blocking. A fake driver records the DevTools
+commands, so no Chrome is needed.
+"""
+
+import sys
+from fnmatch import fnmatchcase
+
+from selenium.common.exceptions import WebDriverException
+
+from request_blocking import RESOURCE_TYPE_PATTERNS, apply_request_blocking, build_block_patterns
+
+SEARCH_URL = 'https://www.google.com/search?q=logo.png&tbm=isch&hl=en'
+
+class RecordingDriver:
+    """Records execute_cdp_cmd calls; with legacy=True it rejects urlPatterns like older Chrome."""
+
+    def __init__(self, legacy=False):
+        self.legacy = legacy
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        if self.legacy and 'urlPatterns' in params:
+            raise WebDriverException("Invalid parameters")
+        self.commands.append((command, params))
+        return {}
+
+    def blocked_urls_payload(self):
+        payloads = [params for command, params in self.commands if command == 'Network.setBlockedURLs']
+        assert len(payloads) == 1, self.commands
+        return payloads[0]
+
+def first_match(url_patterns, url):
+    """The urlPatterns entry Chrome applies to url: the first one whose pattern matches."""
+    return next((entry for entry in url_patterns if fnmatchcase(url, entry['urlPattern'])), None)
+
+def test_build_block_patterns():
+    """Resource types expand to their patterns; unknown types are skipped and duplicates dropped."""
+    print("🧪 Testing block pattern building...")
+    patterns = build_block_patterns(['Image', ' font', 'video'], ['*://ads.example.com/*', '*://*/*.png*'])
+    expected = RESOURCE_TYPE_PATTERNS['image'] + RESOURCE_TYPE_PATTERNS['font'] + ['*://ads.example.com/*']
+    assert patterns == expected, patterns
+    assert build_block_patterns([]) == []
+    print(f"✅ {len(patterns)} patterns built")
+
+def test_search_page_never_blocked():
+    """A search whose query looks like an image file name still loads its results page."""
+    print("🧪 Testing search page exemption...")
+    driver = RecordingDriver()
+    patterns = build_block_patterns(['image', 'font', 'media', 'tracking'])
+    assert apply_request_blocking(driver, patterns, ['*://cdn.example.com/*'])
+
+    payload = driver.blocked_urls_payload()
+    assert payload['urls'] == patterns
+    # The image patterns alone would block this results page
+    assert any(fnmatchcase(SEARCH_URL, pattern) for pattern in payload['urls'])
+    assert first_match(payload['urlPatterns'], SEARCH_URL)['block'] is False
+    # Configured allow patterns still apply, and images elsewhere stay blocked
+    assert first_match(payload['urlPatterns'], 'https://cdn.example.com/a.png')['block'] is False
+    assert first_match(payload['urlPatterns'], 'https://images.example.com/a.png?w=200')['block'] is True
+    print("✅ Results page allowed ahead of the block patterns")
+
+def test_legacy_chrome_and_clearing():
+    """Older Chrome gets the plain block list; no patterns clears blocking."""
+    print("🧪 Testing legacy fallback and clearing...")
+    driver = RecordingDriver(legacy=True)
+    assert apply_request_blocking(driver, ['*://*/*.png*'])
+    assert driver.blocked_urls_payload() == {'urls': ['*://*/*.png*']}
+
+    driver = RecordingDriver()
+    assert apply_request_blocking(driver, [])
+    assert driver.blocked_urls_payload() == {'urls': [], 'urlPatterns': []}
+    print("✅ Fallback and clearing payloads are correct")
+
+def main():
+    """Run all request blocking tests."""
+    print("🚀 Starting request blocking tests...\n")
+
+    tests = [
+        ("Build Block Patterns", test_build_block_patterns),
+        ("Search Page Never Blocked", test_search_page_never_blocked),
+        ("Legacy Chrome And Clearing", test_legacy_chrome_and_clearing),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for download retries and per-host circuit breakers.
+Hosts are simulated by local HTTP servers, so no Chrome or internet access is needed.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from email.utils import formatdate
+
+from circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from config import Config
+from retry import RetryPolicy, parse_retry_after
+from testing_helpers import ImageHandler, make_png_bytes, make_scraper, start_server
+
+class FlakyHandler(ImageHandler):
+    """/flaky/* fails with 503 twice, /throttled/* answers 429 once, /dead/* always fails."""
+
+    hits = Counter()
+
+    def do_GET(self):
+        FlakyHandler.hits[self.path] += 1
+        count = FlakyHandler.hits[self.path]
+        if self.path.startswith('/dead/') or (self.path.startswith('/flaky/') and count <= 2):
+            self.send_body(b'', 'text/plain', 503)
+        elif self.path.startswith('/throttled/') and count == 1:
+            self.send_body(b'', 'text/plain', 429, headers={'Retry-After': '0'})
+        else:
+            self.send_body(make_png_bytes())
+
+def test_retry_policy():
+    """Backoff is jittered and capped, and Retry-After is honoured within limits."""
+    print("🧪 Testing retry policy...")
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None and parse_retry_after('soon') is None
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=5)
+    assert all(0 <= policy.delay(1) <= 2 for _ in range(100))
+    assert all(policy.backoff(10) <= 5 for _ in range(100))
+    assert policy.delay(2) is None
+    assert policy.delay(0, '4') == 4.0
+    assert policy.delay(0, '60') is None
+    print("✅ Retry policy works")
+
+def test_circuit_breaker_states():
+    """The circuit opens after repeated failures and lets one trial through after the cool-down."""
+    print("🧪 Testing circuit breaker...")
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.1)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow() and not breaker.allow()  # one trial only
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+    breaker.trip(0.3)
+    assert breaker.to_dict()['state'] == 'open' and breaker.to_dict()['retry_in'] > 0.1
+    print("✅ Circuit breaker transitions work")
+
+def test_downloads_retry_and_skip_dead_hosts():
+    """Transient errors are retried; a dead host is skipped once its circuit opens."""
+    print("🧪 Testing download retries...")
+    import scraper as scraper_module
+
+    flaky_server, flaky_host = start_server(FlakyHandler)
+    dead_server, dead_host = start_server(FlakyHandler)
+    folder = tempfile.mkdtemp()
+    original = (Config.UPLOAD_FOLDER, scraper_module.download_retry_policy, scraper_module.host_circuit_breakers)
+    Config.UPLOAD_FOLDER = folder
+    scraper_module.download_retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+    scraper_module.host_circuit_breakers = CircuitBreakerRegistry(failure_threshold=3, cooldown=60)
+    FlakyHandler.hits = Counter()
+    try:
+        urls = ([f'http://{flaky_host}/flaky/1.png', f'http://{flaky_host}/throttled/1.png']
+                + [f'http://{dead_host}/dead/{n}.png' for n in range(4)])
+        scraper = make_scraper(urls, download_workers=1)
+        downloaded, _ = scraper.scrape_images('q', folder, 'cats', len(urls))
+        scraper.close()
+
+        assert downloaded == 2
+        assert FlakyHandler.hits['/flaky/1.png'] == 3 and FlakyHandler.hits['/throttled/1.png'] == 2
+        dead_hits = sum(n for path, n in FlakyHandler.hits.items() if path.startswith('/dead/'))
+        assert dead_hits == 3, FlakyHandler.hits
+
+        stats = scraper_module.host_circuit_breakers.get_stats()
+        assert stats[dead_host]['state'] == 'open' and stats[dead_host]['rejected_requests'] == 3
+        assert stats[flaky_host]['state'] == 'closed'
+        print("✅ Retries recovered transient errors and the dead host was skipped")
+    finally:
+        Config.UPLOAD_FOLDER, scraper_module.download_retry_policy, scraper_module.host_circuit_breakers = original
+        flaky_server.shutdown()
+        dead_server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_circuit_breaker_api():
+    """Breaker state is listed and can be reset through the API."""
+    print("🧪 Testing circuit breaker API...")
+    import app as app_module
+
+    registry = app_module.host_circuit_breakers
+    registry.breaker_for_host('broken.test').trip(30)
+    client = app_module.app.test_client()
+    hosts = client.get('/api/circuit_breakers').get_json()['hosts']
+    assert hosts['broken.test']['state'] == 'open'
+
+    response = client.post('/api/circuit_breakers/reset', json={'host': 'broken.test'})
+    assert response.get_json()['reset'] == 1
+    assert 'broken.test' not in client.get('/api/circuit_breakers').get_json()['hosts']
+    print("✅ Circuit breaker API works")
+
+def main():
+    """Run all retry and circuit breaker tests."""
+    print("🚀 Starting retry tests...\n")
+
+    tests = [
+        ("Retry Policy", test_retry_policy),
+        ("Circuit Breaker", test_circuit_breaker_states),
+        ("Download Retries", test_downloads_retry_and_skip_dead_hosts),
+        ("Circuit Breaker API", test_circuit_breaker_api),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
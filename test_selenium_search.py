@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test script for the Selenium search loop: when scrolling stops and how the
+page is queried. A fake driver stands in for Chrome, so no browser is needed.
+"""
+
+import json
+import sys
+import time
+
+from config import Config
+from scraper import (CLICK_SHOW_MORE_SCRIPT, COUNT_RESULTS_SCRIPT, FIND_CONSENT_BUTTON_SCRIPT,
+                     IMAGE_EXTRACTION_SCRIPT, GoogleImageScraper)
+
+class FakeResultsDriver:
+    """
+    A Google Images results page driven by scripted answers.
+
+    urls_for_pass(n) gives the candidate URLs the extraction script finds on
+    pass n (counting from 1). The first thumbnails appear load_delay seconds
+    after get(), and each scroll adds more after the same delay. Every execute_script call is logged in self.calls.
+    """
+
+    def __init__(self, urls_for_pass, load_delay=0.05, thumbnails=20):
+        self.urls_for_pass = urls_for_pass
+        self.load_delay = load_delay
+        self.thumbnails = thumbnails
+        self.loaded_at = 0
+        self.extractions = 0
+        self.calls = []
+
+    def get(self, url):
+        now = time.monotonic()
+        self.calls.append(('get', now))
+        self.loaded_at = now + self.load_delay
+
+    def quit(self):
+        pass
+
+    def find_elements(self, by, value):
+        self.calls.append(('find_elements', time.monotonic()))
+        return []
+
+    def count_calls(self, name):
+        return sum(1 for call, _ in self.calls if call == name)
+
+    def execute_script(self, script, *args):
+        now = time.monotonic()
+        if script == IMAGE_EXTRACTION_SCRIPT:
+            self.calls.append(('extract', now))
+            self.extractions += 1
+            return json.dumps([{'url': url, 'selector': 'img[src]', 'width': 64, 'height': 64}
+                               for url in self.urls_for_pass(self.extractions)])
+        if script == COUNT_RESULTS_SCRIPT:
+            self.calls.append(('count', now))
+            return self.thumbnails if now >= self.loaded_at else max(self.thumbnails - 20, 0)
+        if script.startswith('window.scrollTo'):
+            self.calls.append(('scroll', now))
+            self.thumbnails += 20
+            self.loaded_at = now + self.load_delay
+            return None
+        if script == FIND_CONSENT_BUTTON_SCRIPT:
+            return None
+        if script == CLICK_SHOW_MORE_SCRIPT:
+            self.calls.append(('show_more', now))
+            return False
+        raise AssertionError(f"Unexpected script: {script[:60]}")
+
+def fresh_urls(per_pass):
+    """Every pass finds per_pass URLs no earlier pass found."""
+    return lambda n: [f'https://images.example.com/{n}-{i}.jpg' for i in range(per_pass)]
+
+def run_search(driver, max_images, time_budget=30, **settings):
+    """Run the search loop against driver with Config settings overridden. Returns (urls, seconds)."""
+    scraper = GoogleImageScraper.__new__(GoogleImageScraper)
+    scraper.driver = driver
+    original = {name: getattr(Config, name) for name in settings}
+    for name, value in settings.items():
+        setattr(Config, name, value)
+    try:
+        started = time.monotonic()
+        urls = list(scraper._iter_image_urls('cats', max_images, time_budget))
+        return urls, time.monotonic() - started
+    finally:
+        for name, value in original.items():
+            setattr(Config, name, value)
+
+def test_stops_at_target():
+    """The search stops on the pass that reaches max_images."""
+    print("🧪 Testing stop at target...")
+    driver = FakeResultsDriver(fresh_urls(5))
+    urls, _ = run_search(driver, 12)
+    assert len(urls) == 12 and len(set(urls)) == 12, urls
+    assert driver.extractions == 3, driver.extractions
+    assert driver.count_calls('scroll') == 2, driver.calls
+    print(f"✅ {len(urls)} URLs after {driver.extractions} passes")
+
+def test_stops_on_plateau():
+    """SEARCH_PLATEAU_PASSES passes in a row without new URLs end the search."""
+    print("🧪 Testing plateau stop...")
+    driver = FakeResultsDriver(lambda n: fresh_urls(5)(1))
+    urls, _ = run_search(driver, 50, SEARCH_PLATEAU_PASSES=3)
+    assert len(urls) == 5, urls
+    # One productive pass, then exactly three stale ones
+    assert driver.extractions == 4, driver.extractions
+
+    # A pass with new URLs resets the count of stale passes
+    driver = FakeResultsDriver(lambda n: fresh_urls(5)(1 if n < 3 else 3))
+    urls, _ = run_search(driver, 50, SEARCH_PLATEAU_PASSES=3)
+    assert len(urls) == 10, urls
+    assert driver.extractions == 6, driver.extractions
+    print("✅ Search stopped after 3 passes without new URLs")
+
+def test_stops_on_time_budget():
+    """The time budget ends a search that keeps finding URLs, waits included."""
+    print("🧪 Testing time budget...")
+    driver = FakeResultsDriver(fresh_urls(2), load_delay=0.1)
+    urls, elapsed = run_search(driver, 1000, time_budget=0.5, SCROLL_WAIT_TIMEOUT=5)
+    assert 2 <= len(urls) < 1000, len(urls)
+    assert 0.5 <= elapsed < 1.0, elapsed
+    print(f"✅ Stopped after {elapsed:.2f}s with {len(urls)} URLs")
+
+def test_stops_at_max_scroll_passes():
+    """SEARCH_MAX_SCROLL_PASSES caps the passes, each counted once."""
+    print("🧪 Testing scroll pass cap...")
+    driver = FakeResultsDriver(fresh_urls(2), load_delay=0)
+    urls, _ = run_search(driver, 1000, SEARCH_MAX_SCROLL_PASSES=4)
+    assert driver.extractions == 4, driver.extractions
+    assert driver.count_calls('scroll') == 4, driver.calls
+    assert len(urls) == 8, urls
+    print(f"✅ Stopped after {driver.extractions} passes")
+
+def test_urls_stream_per_pass():
+    """With stream=True each pass's URLs are yielded before the next scroll starts."""
+    print("🧪 Testing per-pass streaming...")
+    scraper = GoogleImageScraper.__new__(GoogleImageScraper)
+    scraper.driver = driver = FakeResultsDriver(fresh_urls(3))
+    stream = scraper.search_images('cats', max_images=9, stream=True)
+    assert driver.extractions == 0, "search started before the stream was consumed"
+
+    first_pass = [next(stream) for _ in range(3)]
+    assert driver.extractions == 1 and driver.count_calls('scroll') == 0, driver.calls
+    assert next(stream) not in first_pass
+    assert driver.extractions == 2 and driver.count_calls('scroll') == 1, driver.calls
+    assert len(list(stream)) == 5 and driver.extractions == 3
+    print("✅ URLs arrived pass by pass while the page was still scrolling")
+
+def test_one_extraction_call_per_pass():
+    """Each pass collects its candidates with a single execute_script call and no element lookups."""
+    print("🧪 Testing one extraction call per pass...")
+    driver = FakeResultsDriver(fresh_urls(4))
+    urls, _ = run_search(driver, 20)
+    assert len(urls) == 20 and driver.extractions == 5, driver.extractions
+
+    # Split the call log at each scroll: every pass holds exactly one extraction
+    passes = [[]]
+    for call, _ in driver.calls:
+        if call == 'scroll':
+            passes.append([])
+        else:
+            passes[-1].append(call)
+    assert [calls.count('extract') for calls in passes] == [1] * 5, passes
+    assert driver.count_calls('find_elements') == 0
+    print(f"✅ {driver.extractions} passes, one extraction call each")
+
+def test_waits_end_on_dom_change():
+    """Page load and scroll waits return once thumbnails appear, long before their timeouts."""
+    print("🧪 Testing DOM condition waits...")
+    driver = FakeResultsDriver(fresh_urls(4), load_delay=0.2)
+    urls, elapsed = run_search(driver, 12, PAGE_LOAD_WAIT_TIMEOUT=10, SCROLL_WAIT_TIMEOUT=10)
+    assert len(urls) == 12, urls
+
+    # Each wait (page load, then two scrolls) lasts about load_delay, not a fixed sleep
+    starts = [at for call, at in driver.calls if call in ('get', 'scroll')]
+    extractions = [at for call, at in driver.calls if call == 'extract']
+    assert len(starts) == len(extractions) == 3, driver.calls
+    waits = [extracted - started for started, extracted in zip(starts, extractions)]
+    assert all(0.2 <= wait < 0.6 for wait in waits), waits
+    assert elapsed < 1.5, elapsed
+    assert driver.count_calls('show_more') == 0
+
+    # Without new thumbnails the wait gives up at its timeout
+    scraper = GoogleImageScraper.__new__(GoogleImageScraper)
+    scraper.driver = driver
+    started = time.monotonic()
+    assert not scraper._wait_for_new_results(driver.thumbnails, timeout=0.3)
+    assert 0.3 <= time.monotonic() - started < 0.8
+    print(f"✅ Waits took {', '.join(f'{wait:.2f}s' for wait in waits)}")
+
+def main():
+    """Run all Selenium search loop tests."""
+    print("🚀 Starting Selenium search loop tests...\n")
+
+    tests = [
+        ("Stop At Target", test_stops_at_target),
+        ("Stop On Plateau", test_stops_on_plateau),
+        ("Stop On Time Budget", test_stops_on_time_budget),
+        ("Stop At Max Scroll Passes", test_stops_at_max_scroll_passes),
+        ("URLs Stream Per Pass", test_urls_stream_per_pass),
+        ("One Extraction Call Per Pass", test_one_extraction_call_per_pass),
+        ("Waits End On DOM Change", test_waits_end_on_dom_change),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
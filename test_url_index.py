@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-session URL index.
+Images are served by a local HTTP server, so no Chrome or internet access is needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+from config import Config
+from image_index import UrlIndex
+from testing_helpers import ImageHandler, make_scraper, start_server
+
+class CountingImageHandler(ImageHandler):
+    """Serves a generated PNG for any path and counts the requests."""
+
+    hits = []
+
+    def do_GET(self):
+        CountingImageHandler.hits.append(self.path)
+        super().do_GET()
+
+def test_index_lookup_and_stale_records():
+    """Lookups are per class folder and drop records whose file is gone."""
+    print("🧪 Testing URL index records...")
+    folder = tempfile.mkdtemp()
+    try:
+        index = UrlIndex(os.path.join(folder, 'index.sqlite3'))
+        cats = os.path.join(folder, 'cats')
+        os.makedirs(cats)
+        with open(os.path.join(cats, 'cats_1.jpg'), 'wb') as f:
+            f.write(b'x' * 2048)
+
+        index.record('http://a/1.jpg', cats, 'cats_1.jpg', 'cats')
+        record = index.lookup('http://a/1.jpg', cats)
+        assert record['filename'] == 'cats_1.jpg' and record['size'] == 2048
+        assert index.lookup('http://a/1.jpg', os.path.join(folder, 'dogs')) is None
+        assert index.get_stats() == {'urls': 1, 'bytes': 2048, 'classes': {'cats': {'urls': 1, 'bytes': 2048}}}
+
+        os.remove(os.path.join(cats, 'cats_1.jpg'))
+        assert index.lookup('http://a/1.jpg', cats) is None
+        assert index.get_stats()['urls'] == 0
+        print("✅ Index keeps only records backed by files")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_repeat_run_only_fetches_delta():
+    """Scraping the same query again makes no requests for known URLs."""
+    print("🧪 Testing repeat scraping run...")
+    server, host = start_server(CountingImageHandler)
+
+    folder = tempfile.mkdtemp()
+    original_upload_folder = Config.UPLOAD_FOLDER
+    Config.UPLOAD_FOLDER = folder
+    try:
+        index = UrlIndex(os.path.join(folder, '.index.sqlite3'))
+        urls = [f'http://{host}/img/{n}.png' for n in range(5)]
+
+        scraper = make_scraper(urls, url_index=index)
+        downloaded, class_folder = scraper.scrape_images('q', folder, 'birds', 3)
+        scraper.close()
+        assert downloaded == 3 and len(CountingImageHandler.hits) == 3
+
+        # Same target again: everything is already there
+        CountingImageHandler.hits = []
+        scraper = make_scraper(urls, url_index=index)
+        downloaded, _ = scraper.scrape_images('q', folder, 'birds', 3)
+        assert downloaded == 0 and CountingImageHandler.hits == []
+        assert scraper.last_stats['skipped_known'] == 3
+        scraper.close()
+
+        # Larger target: only the two new URLs are fetched
+        scraper = make_scraper(urls, url_index=index)
+        downloaded, _ = scraper.scrape_images('q', folder, 'birds', 5)
+        scraper.close()
+        assert downloaded == 2 and sorted(CountingImageHandler.hits) == ['/img/3.png', '/img/4.png']
+        assert len(os.listdir(class_folder)) == 5
+        print("✅ Repeat runs only download the delta")
+    finally:
+        Config.UPLOAD_FOLDER = original_upload_folder
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    """Run all URL index tests."""
+    print("🚀 Starting URL index tests...\n")
+
+    tests = [
+        ("Index Records", test_index_lookup_and_stale_records),
+        ("Repeat Run", test_repeat_run_only_fetches_delta),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {test_name} passed!\n")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test_name} failed! {e}\n")
+
+    print(f"Results: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Shared scaffolding for the test scripts: generated images, a local HTTP
+server standing in for image hosts, and scrapers that need no browser.
+
+Importing this module moves the index and checkpoint databases into a
+temporary folder, so test runs never touch the ones under instance/.
+"""
+
+import atexit
+import io
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from config import Config
+from rate_limiter import host_rate_limiter
+
+
+def use_temporary_state():
+    """
+    Point IMAGE_INDEX_DB and CHECKPOINT_DB at a temporary folder removed at exit.
+
+    Also sets the environment variables, so processes started by the tests
+    (bulk workers, subprocess checks) pick up the same files.
+    """
+    folder = tempfile.mkdtemp(prefix='scraper-test-state-')
+    atexit.register(shutil.rmtree, folder, ignore_errors=True)
+    for name, filename in (('IMAGE_INDEX_DB', 'image_index.sqlite3'), ('CHECKPOINT_DB', 'checkpoints.sqlite3')):
+        path = os.path.join(folder, filename)
+        setattr(Config, name, path)
+        os.environ[name] = path
+    return folder
+
+
+use_temporary_state()
+
+
+def make_png_bytes(size=(64, 64), format='PNG'):
+    """A noisy image (PNG unless format says otherwise) that passes the scraper's size and validity checks."""
+    image = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def write_image(folder, filename, size=(64, 48)):
+    """Save a generated PNG as folder/filename, creating the folder if needed."""
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, filename), 'wb') as f:
+        f.write(make_png_bytes(size))
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Serves a fresh generated PNG for any path; subclasses override do_GET to script other answers."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, body, content_type='image/png', status=200, length=None, headers=None):
+        """Send a complete response; length announces a different Content-Length than the body has."""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body) if length is None else length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up on the body, as the scraper does with rejected downloads
+
+    def do_GET(self):
+        self.send_body(make_png_bytes())
+
+
+def start_server(handler=ImageHandler):
+    """Serve handler on a free local port without rate limiting. Returns (server, 'host:port')."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'127.0.0.1:{server.server_address[1]}'
+    host_rate_limiter.set_host_rate(host, 0)
+    return server, host
+
+
+def make_scraper(urls, **kwargs):
+    """
+    HTTP-backend scraper whose search yields the given URLs, so no browser is needed.
+
+    The shared indexes and the catalog are off unless passed in kwargs.
+    """
+    from scraper import GoogleImageScraper
+
+    options = dict(backend='http', url_index=False, content_index=False, near_dup_index=False, catalog=False)
+    options.update(kwargs)
+    scraper = GoogleImageScraper(**options)
+    scraper.search_images = lambda query, max_images=20, **search_kwargs: iter(urls[:max_images])
+    return scraper
@@ -1,9 +1,12 @@
+import io
 import os
 import shutil
 import json
+import tempfile
 from PIL import Image
 import hashlib
 from config import Config
+from catalog import get_image_catalog
 
 def create_class_folder(base_path, class_name):
     """Create a folder for the specified class within the scraped_images directory.
@@ -23,14 +26,26 @@ def create_class_folder(base_path, class_name):
     class_path = os.path.join(scraped_images_dir, class_name)
     if not os.path.exists(class_path):
         os.makedirs(class_path)
+
+    catalog = get_image_catalog()
+    if catalog:
+        catalog.add_class(class_path)
     return class_path
 
 def get_all_classes(base_path):
-    """Get all class folders and their image counts."""
+    """Get all class folders and their image counts (from the image catalog when enabled)."""
     classes = []
     if not os.path.exists(base_path):
         return classes
 
+    catalog = get_image_catalog()
+    if catalog:
+        return [{
+            'name': row['name'],
+            'path': os.path.join(base_path, row['name']),
+            'image_count': row['image_count']
+        } for row in catalog.get_classes(base_path)]
+
     for item in os.listdir(base_path):
         item_path = os.path.join(base_path, item)
         if os.path.isdir(item_path):
@@ -218,9 +233,14 @@ def count_images_in_folder(folder_path):
     if not os.path.exists(folder_path):
         return 0
 
+    catalog = get_image_catalog()
+    if catalog:
+        info = catalog.get_class(folder_path)
+        return info['image_count'] if info else 0
+
     count = 0
     for file in os.listdir(folder_path):
-        if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+        if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp')):
             count += 1
     return count
 
@@ -232,8 +252,19 @@ def get_images_in_class(base_path, class_name):
     if not os.path.exists(class_path):
         return images
 
+    catalog = get_image_catalog()
+    if catalog:
+        return [{
+            'filename': row['filename'],
+            'path': os.path.join(class_path, row['filename']),
+            'relative_path': os.path.join(class_name, row['filename']).replace('\\', '/'),
+            'size': row['size'],
+            'width': row['width'],
+            'height': row['height']
+        } for row in catalog.get_images(class_path)]
+
     for file in os.listdir(class_path):
-        if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+        if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp')):
             images.append({
                 'filename': file,
                 'path': os.path.join(class_path, file),
@@ -246,6 +277,9 @@ def delete_image(base_path, class_name, filename):
     file_path = os.path.join(base_path, class_name, filename)
     if os.path.exists(file_path):
         os.remove(file_path)
+        catalog = get_image_catalog()
+        if catalog:
+            catalog.remove_image(os.path.join(base_path, class_name), filename)
         return True
     return False
 
@@ -256,6 +290,10 @@ def delete_folder(base_path, folder_name):
         try:
             shutil.rmtree(folder_path)
 
+            catalog = get_image_catalog()
+            if catalog:
+                catalog.remove_class(folder_path)
+
             # Also remove any manual tab assignments for this folder
             assignments = get_manual_tab_assignments()
             if folder_name in assignments:
@@ -274,18 +312,24 @@ def get_folder_info(base_path, folder_name):
     if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
         return None
 
-    image_count = count_images_in_folder(folder_path)
+    catalog = get_image_catalog()
+    if catalog:
+        # Served from the catalog, which counts the bytes of image files only
+        info = catalog.get_class(folder_path)
+        image_count, total_size = (info['image_count'], info['total_bytes']) if info else (0, 0)
+    else:
+        image_count = count_images_in_folder(folder_path)
 
-    # Calculate folder size
-    total_size = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(folder_path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
-    except OSError:
+        # Calculate folder size
         total_size = 0
+        try:
+            for dirpath, dirnames, filenames in os.walk(folder_path):
+                for filename in filenames:
+                    filepath = os.path.join(dirpath, filename)
+                    if os.path.exists(filepath):
+                        total_size += os.path.getsize(filepath)
+        except OSError:
+            total_size = 0
 
     # Format size in human readable format
     def format_size(size_bytes):
@@ -315,6 +359,49 @@ def validate_image(file_path):
     except:
         return False
 
+def validate_image_bytes(data):
+    """Validate if in-memory data is a valid image."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+        return True
+    except Exception:
+        return False
+
+def write_new_file_atomic(folder_path, filename, data):
+    """
+    Write data as a new file in folder_path and return the name it was saved under.
+
+    The data goes to a temp file that is then hard-linked to its final name.
+    Linking fails if the name exists, so writers in other threads or processes
+    never overwrite each other; the next free name (name_1.ext, ...) is tried.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix='.part', dir=folder_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        while True:
+            new_filename = generate_unique_filename(filename, folder_path)
+            try:
+                _claim_path(temp_path, os.path.join(folder_path, new_filename))
+                return new_filename
+            except FileExistsError:
+                continue  # taken by another writer since the check
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _claim_path(temp_path, file_path):
+    """Give temp_path's contents the name file_path, raising FileExistsError if it is taken."""
+    try:
+        os.link(temp_path, file_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links on this filesystem: reserve the name exclusively, then move the data over it
+        os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        os.replace(temp_path, file_path)
+
 def generate_unique_filename(original_filename, folder_path):
     """Generate a unique filename to avoid conflicts."""
     name, ext = os.path.splitext(original_filename)